@@ -15,7 +15,14 @@ from app.models.user import User, UserCreateIn, UserUpdateIn
 from app.models.admin_security import AdminSecurity, DeviceBlock, PendingVerification, LoginAttempt
 from app.core.security import SecurityUtils, get_current_user
 from app.core.utils import ResponseFormatter
+from app.core.idempotency import idempotency_store
 from app.admin.registry import admin_registry
+from app.admin.listing import fetch_list_rows, ordering_keys, paginate, search_filter
+from app.admin.actions import BulkActionIn, available_actions, run_action
+from app.core.cursor import CursorError
+from app.services.user_stats import get_dashboard_stats
+from app.services.activity_charts import activity_charts
+from app.core.compression import PrecompressedStaticFiles
 
 
 # Templates
@@ -150,7 +157,7 @@ async def admin_login(
         # 2FA yo'q yoki xatolik bo'lgan holda oddiy login
         request.session["user_id"] = user.id
         user.last_login = datetime.now()
-        await user.save()
+        await user.save(update_fields=["last_login", "updated_at"])
         return RedirectResponse(url="/admin/dashboard", status_code=302)
         
     except Exception as e:
@@ -198,7 +205,7 @@ async def verify_2fa(
             # Last login yangilash
             user = await User.get(id=verification.user.id)
             user.last_login = datetime.now()
-            await user.save()
+            await user.save(update_fields=["last_login", "updated_at"])
             
             return RedirectResponse(url="/admin/dashboard", status_code=302)
             
@@ -245,22 +252,8 @@ async def admin_logout(request: Request):
 async def admin_dashboard(request: Request, admin_user = Depends(get_current_admin_user)):
     """Admin dashboard."""
     try:
-        # Statistikalar
-        total_users = await User.all().count()
-        active_users = await User.filter(is_active=True).count()
-        superusers = await User.filter(is_superuser=True).count()
-        
-        # Yangi foydalanuvchilar (oxirgi 7 kun)
-        from datetime import timedelta
-        week_ago = datetime.now() - timedelta(days=7)
-        new_users_week = await User.filter(created_at__gte=week_ago).count()
-        
-        stats = {
-            "total_users": total_users,
-            "active_users": active_users,
-            "superusers": superusers,
-            "new_users_week": new_users_week
-        }
+        # Statistikalar - user_stats hisoblagichlaridan (bitta kichik SELECT)
+        stats = await get_dashboard_stats()
         
         # Ro'yxatdan o'tgan model'lar
         registered_models = admin_registry.get_registered_models()
@@ -279,43 +272,77 @@ async def admin_dashboard(request: Request, admin_user = Depends(get_current_adm
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Dashboard grafiklari (sahifa chizilgandan keyin JS orqali yuklanadi)
+@admin_router.get("/dashboard/charts")
+async def admin_dashboard_charts(
+    granularity: str = Query("day", pattern="^(day|hour)$"),
+    admin_user = Depends(get_current_admin_user)
+):
+    """Ro'yxatdan o'tishlar va login urinishlari - soatlik yoki kunlik bucket'lar."""
+    data = await activity_charts.chart(granularity)
+    # Joriy bucket o'zgaradi - brauzer qisqa muddat keshlashi mumkin
+    return JSONResponse(content=data, headers={"Cache-Control": "private, max-age=60"})
+
+# Global qidiruv (barcha model'lar bo'yicha inverted indeks)
+@admin_router.get("/search", response_class=HTMLResponse)
+async def admin_search(
+    request: Request,
+    q: str = Query("", max_length=200, description="Qidiruv"),
+    admin_user = Depends(get_current_admin_user)
+):
+    """Global qidiruv natijalari - model bo'yicha guruhlangan."""
+    # admin_search app.admin.registry orqali shu paketni import qiladi - aylanma import
+    from app.services.admin_search import admin_search_index
+
+    groups = await admin_search_index.search(q) if q else []
+    return templates.TemplateResponse(
+        "search.html",
+        {
+            "request": request,
+            "admin_user": admin_user,
+            "query": q,
+            "groups": groups,
+        }
+    )
+
 # Users list
+USERS_LIST_FIELDS = ("id", "username", "email", "first_name", "last_name", "is_active", "is_superuser", "created_at")
+
+
+def _users_query(search: Optional[str]):
+    # Bulk "barcha mos qatorlar" bilan bir xil shart (username, email, ism)
+    config = admin_registry.get_config("user")
+    if not search:
+        return User.all()
+    if config and config.search_fields:
+        return User.filter(search_filter(config, search))
+    return User.filter(username__icontains=search)
+
+
 @admin_router.get("/users", response_class=HTMLResponse)
 async def admin_users_list(
     request: Request, 
     admin_user = Depends(get_current_admin_user),
-    page: int = 1,
-    per_page: int = 20,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    per_page: int = Query(20, ge=1, le=200),
     search: Optional[str] = None
 ):
-    """Foydalanuvchilar ro'yxati."""
+    """Foydalanuvchilar ro'yxati (keyset sahifalash, eng yangilari birinchi)."""
     try:
-        offset = (page - 1) * per_page
-        
-        # Search
-        if search:
-            users = await User.filter(
-                username__icontains=search
-            ).offset(offset).limit(per_page)
-            total = await User.filter(username__icontains=search).count()
-        else:
-            users = await User.all().offset(offset).limit(per_page)
-            total = await User.all().count()
-        
-        # Pagination
-        total_pages = (total + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
+        page = await paginate(
+            _users_query(search), [("id", True)], per_page,
+            fetch=lambda q: q.values(*USERS_LIST_FIELDS),
+            after=after, before=before,
+        )
         
+        user_config = admin_registry.get_config("user")
         pagination = {
-            "page": page,
             "per_page": per_page,
-            "total": total,
-            "total_pages": total_pages,
-            "has_prev": has_prev,
-            "has_next": has_next,
-            "prev_page": page - 1 if has_prev else None,
-            "next_page": page + 1 if has_next else None
+            "has_prev": page.has_prev,
+            "has_next": page.has_next,
+            "prev_cursor": page.prev_cursor,
+            "next_cursor": page.next_cursor
         }
         
         return templates.TemplateResponse(
@@ -323,16 +350,26 @@ async def admin_users_list(
             {
                 "request": request,
                 "admin_user": admin_user,
-                "users": users,
+                "users": page.rows,
                 "pagination": pagination,
+                "auto_count": getattr(user_config, "show_full_result_count", True),
+                "actions": available_actions(user_config) if user_config else {},
                 "search": search or ""
             }
         )
         
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@admin_router.get("/users/count")
+async def admin_users_count(admin_user = Depends(get_current_admin_user), search: Optional[str] = None):
+    """Foydalanuvchilar soni - ro'yxat sahifasi chizilgandan keyin yuklanadi."""
+    return {"total": await _users_query(search).count()}
+
+
 # User qo'shish sahifasi
 @admin_router.get("/users/add", response_class=HTMLResponse)
 async def admin_add_user_page(request: Request, admin_user = Depends(get_current_admin_user)):
@@ -364,12 +401,12 @@ async def admin_add_user_submit(
     
     try:
         # Username mavjudligini tekshirish
-        existing_user = await User.filter(username=username).first()
+        existing_user = await User.with_deleted().filter(username=username).first()
         if existing_user:
             errors.append("Bu username allaqachon mavjud")
         
         # Email mavjudligini tekshirish
-        existing_email = await User.filter(email=email).first()
+        existing_email = await User.with_deleted().filter(email=email).first()
         if existing_email:
             errors.append("Bu email allaqachon mavjud")
         
@@ -480,7 +517,8 @@ async def admin_delete_user(
                 content={"success": False, "message": "O'zingizni o'chira olmaysiz"}
             )
         
-        await user.delete()
+        # Soft-delete: /users/changes tombstone oladi, purge job saqlash muddatidan keyin o'chiradi
+        await user.soft_delete()
         
         return JSONResponse(
             content={"success": True, "message": "Foydalanuvchi o'chirildi"}
@@ -546,10 +584,28 @@ async def admin_create_user(
     is_superuser: bool = Form(False),
     admin_user = Depends(get_current_admin_user)
 ):
-    """Admin orqali yangi foydalanuvchi yaratish."""
+    """Admin orqali yangi foydalanuvchi yaratish (`Idempotency-Key` qo'llab-quvvatlanadi)."""
+    return await idempotency_store.run(
+        request,
+        f"admin:{admin_user.id}",
+        lambda: _admin_create_user(
+            username, email, password, first_name, last_name, is_active, is_superuser
+        )
+    )
+
+
+async def _admin_create_user(
+    username: str,
+    email: str,
+    password: str,
+    first_name: Optional[str],
+    last_name: Optional[str],
+    is_active: bool,
+    is_superuser: bool
+):
     try:
         # Username mavjudligini tekshirish
-        existing_user = await User.filter(username=username).first()
+        existing_user = await User.with_deleted().filter(username=username).first()
         if existing_user:
             return JSONResponse(
                 status_code=400,
@@ -557,7 +613,7 @@ async def admin_create_user(
             )
         
         # Email mavjudligini tekshirish
-        existing_email = await User.filter(email=email).first()
+        existing_email = await User.with_deleted().filter(email=email).first()
         if existing_email:
             return JSONResponse(
                 status_code=400,
@@ -605,12 +661,64 @@ async def admin_create_user(
         )
 
 
+# Ommaviy amallar (model_list va users ro'yxatidagi tanlangan qatorlar)
+@admin_router.post("/{model_name}/actions")
+async def model_bulk_action(
+    model_name: str,
+    action_in: BulkActionIn,
+    admin_user = Depends(get_current_admin_user)
+):
+    """Tanlangan qatorlarga amalni bitta so'rov va bitta tranzaksiyada qo'llash."""
+    config = admin_registry.get_config(model_name)
+    if not config:
+        return JSONResponse(status_code=404, content={"success": False, "message": "Model topilmadi"})
+    
+    actions = available_actions(config)
+    if action_in.action not in actions:
+        return JSONResponse(status_code=400, content={"success": False, "message": "Noma'lum amal"})
+    
+    model_class = config.model
+    query = model_class.all()
+    if action_in.select_all:
+        if action_in.search and config.search_fields:
+            query = query.filter(search_filter(config, action_in.search))
+    elif action_in.ids:
+        pk = model_class._meta.pk_attr
+        pk_field = model_class._meta.fields_map[pk]
+        try:
+            ids = [pk_field.to_python_value(object_id) for object_id in action_in.ids]
+        except (TypeError, ValueError):
+            return JSONResponse(status_code=400, content={"success": False, "message": "Noto'g'ri id"})
+        query = query.filter(**{f"{pk}__in": ids})
+    else:
+        return JSONResponse(status_code=400, content={"success": False, "message": "Hech narsa tanlanmagan"})
+    
+    # O'zini deaktiv qilish / o'chirishga ruxsat bermaslik
+    if model_class is User:
+        query = query.exclude(id=admin_user.id)
+    
+    try:
+        affected = await run_action(model_name, config, action_in.action, query)
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"success": False, "message": str(e)})
+    
+    return JSONResponse(
+        content={
+            "success": True,
+            "message": f"{actions[action_in.action]}: {affected} ta",
+            "action": action_in.action,
+            "affected": affected
+        }
+    )
+
+
 # Model CRUD endpointlari
 @admin_router.get("/{model_name}", response_class=HTMLResponse)
 async def model_list(
     request: Request,
     model_name: str,
-    page: int = Query(1, ge=1),
+    after: Optional[str] = Query(None, description="Keyingi sahifa cursor'i"),
+    before: Optional[str] = Query(None, description="Oldingi sahifa cursor'i"),
     search: str = Query("", description="Qidiruv"),
     current_user=Depends(get_current_admin_user)
 ):
@@ -623,63 +731,23 @@ async def model_list(
         
         # Model class
         model_class = config.model
-        
-        # Qidiruv va pagination
         per_page = config.list_per_page
-        offset = (page - 1) * per_page
         
         # Base query
         query = model_class.all()
         
         # Search filter
         if search and config.search_fields:
-            search_conditions = []
-            for field in config.search_fields:
-                search_conditions.append({f"{field}__icontains": search})
-            
-            # Apply search filters
-            for i, condition in enumerate(search_conditions):
-                if i == 0:
-                    query = query.filter(**condition)
-                else:
-                    query = query.union(model_class.filter(**condition))
-        
-        # Get total count
-        total = await query.count()
-        
-        # Get objects with pagination
-        objects = await query.offset(offset).limit(per_page)
-        
-        # Convert objects to dicts with proper field access
-        processed_objects = []
-        for obj in objects:
-            obj_dict = {}
-            for field in config.list_display:
-                try:
-                    if hasattr(obj, field):
-                        value = getattr(obj, field)
-                        # Handle datetime fields
-                        if hasattr(value, 'strftime'):
-                            obj_dict[field] = value
-                        else:
-                            obj_dict[field] = value
-                    else:
-                        obj_dict[field] = None
-                except:
-                    obj_dict[field] = None
-            
-            # Add special properties if they exist
-            if hasattr(obj, 'full_name'):
-                obj_dict['full_name'] = obj.full_name
-            if hasattr(obj, 'age'):
-                obj_dict['age'] = obj.age
-                
-            # Store original object for access
-            obj_dict['_original'] = obj
-            processed_objects.append(obj_dict)
+            query = query.filter(search_filter(config, search))
         
-        # Calculate pagination
-        total_pages = (total + per_page - 1) // per_page
+        # Keyset sahifa: faqat list_display ustunlari + pk, OFFSET va COUNT(*) siz
+        keys = ordering_keys(model_class, config.ordering or ["-pk"])
+        key_fields = [field for field, _ in keys]
+        page = await paginate(
+            query, keys, per_page,
+            fetch=lambda q: fetch_list_rows(q, config, extra=key_fields),
+            after=after, before=before,
+        )
         
         return templates.TemplateResponse(
             "model_list.html",
@@ -687,10 +755,9 @@ async def model_list(
                 "request": request,
                 "config": config,
                 "model_name": model_name,
-                "objects": processed_objects,
+                "objects": page.rows,
                 "page": page,
-                "total_pages": total_pages,
-                "total": total,
+                "actions": available_actions(config),
                 "search": search,
                 "per_page": per_page
             }
@@ -702,6 +769,23 @@ async def model_list(
         )
 
 
+@admin_router.get("/{model_name}/count")
+async def model_count(
+    model_name: str,
+    search: str = Query("", description="Qidiruv"),
+    current_user=Depends(get_current_admin_user)
+):
+    """Ro'yxatdagi jami son - sahifa chizilgandan keyin alohida yuklanadi."""
+    config = admin_registry.get_config(model_name)
+    if not config:
+        raise HTTPException(status_code=404, detail="Model topilmadi")
+    
+    query = config.model.all()
+    if search and config.search_fields:
+        query = query.filter(search_filter(config, search))
+    return {"total": await query.count()}
+
+
 @admin_router.get("/{model_name}/add", response_class=HTMLResponse)
 async def model_add_form(
     request: Request,
@@ -882,7 +966,10 @@ async def model_delete(
         # Object o'chirish
         model_class = config.model
         obj = await model_class.get(id=object_id)
-        await obj.delete()
+        if model_class is User:
+            await obj.soft_delete()
+        else:
+            await obj.delete()
         
         return {"success": True, "message": "Muvaffaqiyatli o'chirildi"}
     except Exception as e:
@@ -900,6 +987,10 @@ def setup_admin_panel(app):
     # Auto-discovery: barcha model'larni avtomatik ro'yxatdan o'tkazish
     from app.admin.autodiscovery import auto_register_models
     auto_register_models()
+
+    # Global qidiruv indeksini model signallariga ulash
+    from app.services.admin_search import admin_search_index
+    admin_search_index.connect()
     
     # Static files uchun papka yaratish
     static_dir = "app/admin/static"
@@ -908,8 +999,10 @@ def setup_admin_panel(app):
     os.makedirs(static_dir, exist_ok=True)
     os.makedirs(templates_dir, exist_ok=True)
     
-    # Static files mount
-    app.mount("/admin/static", StaticFiles(directory=static_dir), name="admin_static")
+    # Static files mount - oldindan siqilgan variantlar bilan
+    # (variantlar deploy paytida yaratiladi: python -m app.management.commands.compress_static;
+    # ular bo'lmasa fayllar CompressionMiddleware orqali siqiladi)
+    app.mount("/admin/static", PrecompressedStaticFiles(directory=static_dir), name="admin_static")
     
     # Router ulash
     app.include_router(admin_router)
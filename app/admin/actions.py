@@ -0,0 +1,99 @@
+"""
+Admin ro'yxatlaridagi ommaviy amallar (bulk actions).
+
+- Tayyor amallar: faollashtirish, faolsizlantirish (`is_active` maydoni bo'lsa), o'chirish
+- `AdminConfig.custom_actions` - `{nom: callable}`; callable tanlangan qatorlar QuerySet'ini
+  (tranzaksiya ichida) oladi va o'zgargan qatorlar sonini qaytaradi (sync yoki async).
+  Sarlavha - `callable.short_description` (bo'lmasa nomidan)
+- Har bir amal - bitta `UPDATE/DELETE ... WHERE` so'rovi, bitta tranzaksiyada; User uchun
+  signallar bajaradigan ishlar app/services/user_bulk.py da qo'lda qilinadi
+- `delete()` ni qayta aniqlagan model'lar (masalan, append-only LedgerEntry) ommaviy
+  o'chirilmaydi - `DELETE ... WHERE` model tekshiruvlarini chetlab o'tadi
+"""
+
+import inspect
+from typing import Dict, List, Union
+
+from pydantic import BaseModel, Field
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.admin.registry import AdminConfig
+from app.models.user import User
+from app.services.user_bulk import set_users_active, soft_delete_users
+
+
+MAX_SELECTED = 1000
+
+ACTIVATE = "activate"
+DEACTIVATE = "deactivate"
+DELETE = "delete"
+
+
+class BulkActionIn(BaseModel):
+    action: str
+    ids: List[Union[int, str]] = Field(default_factory=list, max_length=MAX_SELECTED)
+    # True - `ids` o'rniga joriy qidiruvga mos barcha qatorlar
+    select_all: bool = False
+    search: str = ""
+
+
+def bulk_delete_allowed(model: type) -> bool:
+    """Model'ni bitta `DELETE ... WHERE` bilan o'chirish mumkinmi (User - soft-delete)."""
+    return model is User or model.delete is Model.delete
+
+
+def available_actions(config: AdminConfig) -> Dict[str, str]:
+    """Model uchun amallar: `{nom: sarlavha}`."""
+    actions: Dict[str, str] = {}
+    if config.can_edit and "is_active" in config.model._meta.db_fields:
+        actions[ACTIVATE] = "Faollashtirish"
+        actions[DEACTIVATE] = "Faolsizlantirish"
+    if config.can_delete and bulk_delete_allowed(config.model):
+        actions[DELETE] = "O'chirish"
+    for name, action in config.custom_actions.items():
+        actions[name] = getattr(action, "short_description", name.replace("_", " ").capitalize())
+    return actions
+
+
+async def run_action(model_name: str, config: AdminConfig, action: str, query: QuerySet) -> int:
+    """Amalni tanlangan qatorlarga qo'llash. Qaytaradi: o'zgargan qatorlar soni."""
+    model = config.model
+
+    if action in config.custom_actions:
+        async with in_transaction(model._meta.default_connection) as connection:
+            result = config.custom_actions[action](query.using_db(connection))
+            if inspect.isawaitable(result):
+                result = await result
+        return int(result or 0)
+
+    if action in (ACTIVATE, DEACTIVATE, DELETE) and action not in available_actions(config):
+        raise ValueError(f"Amalga ruxsat yo'q: {action}")
+
+    if model is User:
+        if action == ACTIVATE:
+            return await set_users_active(query, True)
+        if action == DEACTIVATE:
+            return await set_users_active(query, False)
+        if action == DELETE:
+            return await soft_delete_users(query)
+
+    if action in (ACTIVATE, DEACTIVATE):
+        is_active = action == ACTIVATE
+        return await query.filter(is_active=not is_active).update(is_active=is_active)
+
+    if action == DELETE:
+        # admin_search app.admin.registry orqali app.admin'ni import qiladi - aylanma import
+        from app.services.admin_search import admin_search_index
+
+        pk = model._meta.pk_attr
+        async with in_transaction(model._meta.default_connection) as connection:
+            object_ids = await query.using_db(connection).values_list(pk, flat=True)
+            if not object_ids:
+                return 0
+            deleted = await model.filter(**{f"{pk}__in": object_ids}).using_db(connection).delete()
+            await admin_search_index.remove(model_name, object_ids, using_db=connection)
+        return deleted
+
+    raise ValueError(f"Noma'lum amal: {action}")
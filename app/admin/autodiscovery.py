@@ -92,6 +92,15 @@ def create_smart_config(model: Type[Model]) -> AdminConfig:
     
     icon = icon_map.get(model_name.lower(), 'fas fa-table')
     
+    # Tez o'sadigan jadvallar: jami son (COUNT(*)) faqat so'ralganda hisoblanadi
+    count_on_demand = model_name.lower() in {'loginattempt', 'ledgerentry', 'webhookoutbox'}
+
+    # Ichki jadvallar (append-only ledger, outbox, hisoblagichlar, qidiruv indeksi) - faqat ko'rish:
+    # qo'lda o'zgartirish hisoblagich/indekslarni buzadi
+    read_only = model_name.lower() in {
+        'ledgerentry', 'webhookoutbox', 'webhookdeadletter', 'userstat', 'adminsearchterm',
+    }
+    
     # Field'larni tahlil qilish
     fields = []
     search_fields = []
@@ -131,10 +140,12 @@ def create_smart_config(model: Type[Model]) -> AdminConfig:
         list_display=list_display[:6],  # Ko'pi bilan 6 ta field
         search_fields=search_fields[:3],  # Ko'pi bilan 3 ta search field
         fields=fields,
-        can_add=True,
-        can_edit=True,
-        can_delete=True,
-        can_view=True
+        can_add=not read_only,
+        can_edit=not read_only,
+        can_delete=not read_only,
+        can_view=True,
+        show_full_result_count=not count_on_demand,
+        global_search=not count_on_demand
     )
 
 
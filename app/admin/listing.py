@@ -0,0 +1,189 @@
+"""
+Admin ro'yxat sahifalari uchun yordamchilar.
+
+- `model_list` to'liq model obyektlarini yuklamaydi: faqat `list_display` ustunlari va
+  primary key `.values()` bilan tanlanadi (katta `TextField`lar - bio, user_agent - o'qilmaydi)
+- Sahifalash - keyset (cursor): `OFFSET` yo'q, `per_page + 1` qator olinib keyingi sahifa
+  borligi aniqlanadi; `COUNT(*)` sahifa bilan birga bajarilmaydi (alohida endpoint)
+- NULL bo'lishi mumkin bo'lgan tartib maydonlarida NULL'lar har ikki yo'nalishda oxirida
+  (`"maydon" IS NULL` kaliti) - cursor sharti ham shunga mos quriladi
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional, Sequence, Tuple, Type
+
+from tortoise.expressions import Q, RawSQL
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+from app.admin.registry import AdminConfig
+from app.core.cursor import CursorError, decode_cursor, encode_cursor
+
+
+# (maydon, kamayish tartibidami)
+OrderKey = Tuple[str, bool]
+
+
+@dataclass
+class Page:
+    """Bitta keyset sahifa."""
+    rows: List[Dict[str, Any]]
+    has_prev: bool
+    has_next: bool
+    prev_cursor: Optional[str]
+    next_cursor: Optional[str]
+
+
+def list_columns(config: AdminConfig, extra: Sequence[str] = ()) -> Optional[Dict[str, str]]:
+    """`list_display` (+ `extra`) -> SELECT ustunlari (`{kalit: ustun}`).
+
+    Maydon bazada bo'lmasa (property, metod) - `None`: bunday sahifa to'liq obyektlar bilan quriladi.
+    Model'da umuman yo'q nomlar tashlab ketiladi (qiymati `None`).
+    """
+    meta = config.model._meta
+    columns = {"pk": meta.pk_attr}
+    for field in [*config.list_display, *extra]:
+        if field in meta.db_fields:
+            columns[field] = field
+        elif field in meta.fk_fields or field in meta.o2o_fields:
+            columns[field] = f"{field}_id"
+        elif hasattr(config.model, field):
+            return None
+    return columns
+
+
+def search_filter(config: AdminConfig, search: str) -> Q:
+    """`search_fields` bo'yicha OR qidiruv (bitta WHERE)."""
+    return Q(*[Q(**{f"{field}__icontains": search}) for field in config.search_fields], join_type="OR")
+
+
+async def fetch_list_rows(query: QuerySet, config: AdminConfig, extra: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """Sahifa qatorlari - `list_display` kalitlari va `pk` bilan yengil dict'lar."""
+    columns = list_columns(config, extra)
+    if columns is not None:
+        rows = await query.values(**columns)
+        for row in rows:
+            for field in config.list_display:
+                row.setdefault(field, None)
+        return rows
+
+    # Hisoblanadigan maydonlar (property) - obyektlar kerak, lekin shablonga faqat qiymatlar beriladi
+    return [
+        {"pk": obj.pk, **{field: getattr(obj, field, None) for field in [*config.list_display, *extra]}}
+        for obj in await query
+    ]
+
+
+def ordering_keys(model: Type[Model], ordering: Sequence[str]) -> List[OrderKey]:
+    """Keyset tartibi: bazadagi maydonlar va oxirida primary key.
+
+    Bazada bo'lmagan (property) maydonlar SQL'da tartiblanmaydi - tashlab ketiladi.
+    NULL bo'lishi mumkin bo'lgan maydonlar NULL'lar oxirida bo'lib tartiblanadi (`nullable_keys`).
+    """
+    meta = model._meta
+    keys: List[OrderKey] = []
+    for item in ordering:
+        field = item.lstrip("-")
+        if field == "pk":
+            field = meta.pk_attr
+        if field == meta.pk_attr:
+            keys.append((field, item.startswith("-")))
+            return keys
+        if field in meta.db_fields and field in meta.fields_map:
+            keys.append((field, item.startswith("-")))
+    # Primary key - yagona tartib uchun (ordering'da bo'lmasa, oxirgi yo'nalish bo'yicha)
+    keys.append((meta.pk_attr, keys[-1][1] if keys else True))
+    return keys
+
+
+def nullable_keys(model: Type[Model], keys: Sequence[OrderKey]) -> List[str]:
+    """Tartib kalitlaridan NULL bo'lishi mumkin bo'lganlari."""
+    return [field for field, _ in keys if model._meta.fields_map[field].null]
+
+
+def keyset_condition(
+    keys: Sequence[OrderKey],
+    values: Sequence[Any],
+    forward: bool = True,
+    nullable: Collection[str] = (),
+) -> Q:
+    """Cursor qatoridan keyingi (`forward`) yoki oldingi qatorlar sharti.
+
+    `(a, b) > (x, y)` -> `a > x OR (a = x AND b > y)`.
+    `nullable` maydonlarda NULL'lar oxirida: `a` NULL bo'lmasa keyingi qatorlarga
+    `a IS NULL` ham kiradi, NULL bo'lsa - faqat `a IS NULL AND b > y`.
+    """
+    conditions = []
+    equal: Dict[str, Any] = {}
+    for (field, descending), value in zip(keys, values):
+        if field in nullable:
+            if value is None:
+                if not forward:
+                    conditions.append(Q(**equal, **{f"{field}__isnull": False}))
+                equal[f"{field}__isnull"] = True
+                continue
+            if forward:
+                conditions.append(Q(**equal, **{f"{field}__isnull": True}))
+        operator = "gt" if descending != forward else "lt"
+        conditions.append(Q(**equal, **{f"{field}__{operator}": value}))
+        equal[field] = value
+    return Q(*conditions, join_type="OR")
+
+
+def decode_keys(model: Type[Model], keys: Sequence[OrderKey], cursor: str) -> List[Any]:
+    """Cursor qiymatlarini maydon turlariga o'tkazish. Xato bo'lsa - `CursorError`."""
+    values = decode_cursor(cursor, len(keys))
+    try:
+        return [model._meta.fields_map[field].to_python_value(value) for (field, _), value in zip(keys, values)]
+    except (TypeError, ValueError):
+        raise CursorError("Noto'g'ri cursor")
+
+
+async def paginate(
+    query: QuerySet,
+    keys: Sequence[OrderKey],
+    per_page: int,
+    fetch: Callable[[QuerySet], Awaitable[List[Dict[str, Any]]]],
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Page:
+    """Keyset sahifa: `per_page + 1` qator, `OFFSET` va `COUNT(*)` siz.
+
+    `fetch` qatorlarni dict ko'rinishida qaytaradi (tartib kalitlari bilan).
+    """
+    model = query.model
+    forward = before is None
+    cursor = after if forward else before
+    nullable = nullable_keys(model, keys)
+    if cursor:
+        query = query.filter(keyset_condition(keys, decode_keys(model, keys, cursor), forward, nullable))
+
+    order = []
+    for field, descending in keys:
+        if field in nullable:
+            # NULL'lar oxirida (teskari yo'nalishda - boshida, keyin sahifa qayta aylantiriladi)
+            column = model._meta.fields_db_projection[field]
+            alias = f"_{field}_isnull"
+            query = query.annotate(**{alias: RawSQL(f'"{column}" IS NULL')})
+            order.append(("" if forward else "-") + alias)
+        order.append(("-" if descending == forward else "") + field)
+    rows = await fetch(query.order_by(*order).limit(per_page + 1))
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if forward:
+        has_prev, has_next = bool(after), has_more
+    else:
+        rows.reverse()
+        has_prev, has_next = has_more, True
+
+    def cursor_of(row: Dict[str, Any]) -> str:
+        return encode_cursor(*(row[field] for field, _ in keys))
+
+    return Page(
+        rows=rows,
+        has_prev=has_prev and bool(rows),
+        has_next=has_next and bool(rows),
+        prev_cursor=cursor_of(rows[0]) if has_prev and rows else None,
+        next_cursor=cursor_of(rows[-1]) if has_next and rows else None,
+    )
@@ -53,6 +53,12 @@ class AdminConfig:
     
     # Pagination
     list_per_page: int = 20
+    # Jami sonni (COUNT(*)) sahifa ochilgach avtomatik yuklash; juda katta jadvallar uchun
+    # False - son faqat so'ralganda hisoblanadi
+    show_full_result_count: bool = True
+    # Global qidiruv indeksiga kiritish (har bir saqlashda so'zlar yoziladi);
+    # tez o'sadigan jadvallar uchun False
+    global_search: bool = True
     
     # Custom methods
     custom_actions: Dict[str, Callable] = None
@@ -9,13 +9,14 @@ from tortoise.contrib.pydantic import pydantic_model_creator
 from datetime import datetime, timedelta
 from typing import Optional
 
-from app.models.user import User, UserCreateIn, UserLoginIn
+from app.models.user import User, UserCreateIn, UserLoginIn, USER_PRIVATE_FIELDS
 from app.core.utils import SecurityUtils, RateLimiter, ResponseFormatter
 from app.core.security import get_current_user, validate_input_security, rate_limit
+from app.core.idempotency import idempotency_store
 
 
 # Tortoise Pydantic modeli
-User_Pydantic = pydantic_model_creator(User, name="User", exclude=("password_hash",))
+User_Pydantic = pydantic_model_creator(User, name="User", exclude=USER_PRIVATE_FIELDS)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
@@ -24,8 +25,14 @@ security = HTTPBearer()
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
 @rate_limit(3, 60)  # 3 marta 1 daqiqada
 async def register(request: Request, user_data: UserCreateIn):
-    """Yangi foydalanuvchi ro'yxatdan o'tkazish."""
+    """Yangi foydalanuvchi ro'yxatdan o'tkazish.
     
+    `Idempotency-Key` header'i bilan qayta yuborilgan so'rov birinchi javobni oladi.
+    """
+    return await idempotency_store.run(request, "anonymous", lambda: _register(request, user_data))
+
+
+async def _register(request: Request, user_data: UserCreateIn):
     # Rate limiting
     if RateLimiter.is_rate_limited(request):
         raise HTTPException(
@@ -97,7 +104,8 @@ async def register(request: Request, user_data: UserCreateIn):
                 "token_type": "bearer",
                 "message": "Ro'yxatdan o'tish muvaffaqiyatli yakunlandi"
             },
-            message="Muvaffaqiyatli ro'yxatdan o'tdingiz"
+            message="Muvaffaqiyatli ro'yxatdan o'tdingiz",
+            status_code=status.HTTP_201_CREATED
         )
         
     except IntegrityError as e:
@@ -145,7 +153,7 @@ async def login(request: Request, login_data: UserLoginIn):
         
         # Last login yangilash
         user.last_login = datetime.utcnow()
-        await user.save()
+        await user.save(update_fields=["last_login", "updated_at"])
         
         # Token yaratish
         access_token = SecurityUtils.create_access_token(
@@ -0,0 +1,265 @@
+"""
+Batch API - bir nechta API operatsiyasini bitta HTTP so'rovda bajarish.
+
+- Ichki so'rovlar mavjud routerlar orqali (middleware'siz) bajariladi
+- Token bir marta tekshiriladi va barcha operatsiyalarga uzatiladi
+- Ketma-ket kelgan o'qish (GET/HEAD) operatsiyalari parallel, bitta DB ulanishida bajariladi
+- Yozish operatsiyalari tartib bo'yicha, bittadan bajariladi
+"""
+
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import orjson
+from decouple import config
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, Field
+from tortoise.transactions import in_transaction
+
+from app.core.cache import coalescing_enabled
+from app.core.security import AUTH_SCOPE_KEY, authenticate_token
+from app.core.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, current_media_type, dumps, loads
+from app.core.utils import ResponseFormatter, global_exception_handler
+
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+optional_security = HTTPBearer(auto_error=False)
+
+# Bitta batch'dagi maksimal operatsiyalar soni
+MAX_BATCH_OPERATIONS = config('MAX_BATCH_OPERATIONS', default=20, cast=int)
+
+# Faqat shu prefiksdagi yo'llarga ruxsat
+BATCH_PATH_PREFIX = "/api/v1/"
+
+# Parallel bajariladigan (xavfsiz) metodlar
+SAFE_METHODS = ("GET", "HEAD")
+ALLOWED_METHODS = SAFE_METHODS + ("POST", "PUT", "PATCH", "DELETE")
+
+# Operatsiya header'larida qayta yozib bo'lmaydigan header'lar
+PROTECTED_HEADERS = ("authorization", "host", "content-length", "cookie", "accept")
+
+
+class BatchOperationIn(BaseModel):
+    """Bitta ichki so'rov."""
+    id: Optional[str] = Field(None, max_length=64)
+    method: str = "GET"
+    path: str = Field(..., max_length=2048)
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = None
+
+
+class BatchIn(BaseModel):
+    """Batch so'rov."""
+    operations: List[BatchOperationIn]
+
+
+def _validate_operation(operation: BatchOperationIn) -> Tuple[str, str, str]:
+    """Metod va yo'lni tekshirish, (method, path, query) qaytarish."""
+    method = operation.method.upper()
+    if method not in ALLOWED_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ruxsat etilmagan metod: {operation.method}"
+        )
+
+    parts = urlsplit(operation.path)
+    if parts.scheme or parts.netloc or not parts.path.startswith(BATCH_PATH_PREFIX):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Yo'l {BATCH_PATH_PREFIX} bilan boshlanishi kerak: {operation.path}"
+        )
+    if parts.path.rstrip("/") == f"{BATCH_PATH_PREFIX}batch":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch ichida batch so'rovga ruxsat yo'q"
+        )
+    return method, parts.path, parts.query
+
+
+def _build_scope(
+    request: Request,
+    method: str,
+    path: str,
+    query: str,
+    operation: BatchOperationIn,
+    current_user: Optional[dict],
+) -> Dict[str, Any]:
+    """Tashqi so'rov scope'idan ichki so'rov uchun ASGI scope yaratish."""
+    parent = request.scope
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in operation.headers.items()
+        if name.lower() not in PROTECTED_HEADERS
+    ]
+    for name in ("host", "authorization", "user-agent"):
+        value = request.headers.get(name)
+        if value is not None:
+            headers.append((name.encode("latin-1"), value.encode("latin-1")))
+    # Ichki javoblar doim JSON - natijaga qayta kodlanmasdan joylanadi
+    headers.append((b"accept", JSON_MEDIA_TYPE.encode("latin-1")))
+    if operation.body is not None and not any(name == b"content-type" for name, _ in headers):
+        headers.append((b"content-type", b"application/json"))
+
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("latin-1"),
+        "headers": headers,
+        "app": parent.get("app"),
+        "state": dict(parent.get("state", {})),
+    }
+    # HTTPException va boshqa handler'lar ichki so'rovda ham ishlashi uchun
+    if "starlette.exception_handlers" in parent:
+        scope["starlette.exception_handlers"] = parent["starlette.exception_handlers"]
+    if current_user is not None:
+        scope[AUTH_SCOPE_KEY] = current_user
+    return scope
+
+
+async def _dispatch(request: Request, scope: Dict[str, Any], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+    """Ichki so'rovni routerga yuborib, javobni yig'ish."""
+    response_start: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response_start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    async def call_router():
+        # FastAPI AsyncExitStackMiddleware o'rnini bosadi (middleware'lar chetlab o'tiladi)
+        async with AsyncExitStack() as stack:
+            scope["fastapi_middleware_astack"] = stack
+            await request.app.router(scope, receive, send)
+
+    try:
+        # Alohida task - ichki so'rovdagi contextvar o'zgarishlari tashqi so'rovga o'tmaydi
+        await asyncio.ensure_future(call_router())
+    except Exception as exc:
+        response = await global_exception_handler(request, exc)
+        return response.status_code, {"content-type": response.media_type}, bytes(response.body)
+
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in response_start.get("headers", [])
+    }
+    return response_start.get("status", 500), headers, b"".join(chunks)
+
+
+def _result_body(headers: Dict[str, str], body: bytes) -> Any:
+    """Javob body'sini natijaga joylash - JSON qayta parse qilinmaydi."""
+    if not body:
+        return None
+    if headers.get("content-type", "").startswith(JSON_MEDIA_TYPE):
+        if current_media_type() == MSGPACK_MEDIA_TYPE:
+            return loads(body)
+        return orjson.Fragment(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _run_operation(
+    request: Request,
+    index: int,
+    operation: BatchOperationIn,
+    current_user: Optional[dict],
+) -> Dict[str, Any]:
+    """Bitta operatsiyani bajarish."""
+    result: Dict[str, Any] = {"id": operation.id if operation.id is not None else str(index)}
+    try:
+        method, path, query = _validate_operation(operation)
+    except HTTPException as e:
+        result.update({"status": e.status_code, "body": {"detail": e.detail}})
+        return result
+
+    body = b"" if operation.body is None else dumps(operation.body)
+    scope = _build_scope(request, method, path, query, operation, current_user)
+    status_code, headers, response_body = await _dispatch(request, scope, body)
+    result.update({
+        "status": status_code,
+        "headers": headers,
+        "body": _result_body(headers, response_body),
+    })
+    return result
+
+
+def _group_operations(operations: List[BatchOperationIn]) -> List[List[int]]:
+    """Ketma-ket o'qish operatsiyalarini guruhlash; har bir yozish alohida guruh."""
+    groups: List[List[int]] = []
+    previous_safe = False
+    for index, operation in enumerate(operations):
+        is_safe = operation.method.upper() in SAFE_METHODS
+        if is_safe and previous_safe:
+            groups[-1].append(index)
+        else:
+            groups.append([index])
+        previous_safe = is_safe
+    return groups
+
+
+@router.post("", response_model=dict)
+async def run_batch(
+    request: Request,
+    batch: BatchIn,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+):
+    """Bir nechta API operatsiyasini bitta so'rovda bajarish.
+
+    Har bir operatsiya uchun `status`, `headers` va `body` qaytariladi.
+    """
+    if not batch.operations:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="operations bo'sh bo'lmasligi kerak")
+    if len(batch.operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bir batch'da {MAX_BATCH_OPERATIONS} tadan ko'p operatsiya bo'lishi mumkin emas"
+        )
+
+    # Token bir marta tekshiriladi
+    current_user = authenticate_token(credentials.credentials) if credentials else None
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(batch.operations)
+    for group in _group_operations(batch.operations):
+        if len(group) == 1:
+            index = group[0]
+            results[index] = await _run_operation(request, index, batch.operations[index], current_user)
+            continue
+
+        # O'qishlar bitta ulanishni (tranzaksiya) bo'lishib, parallel bajariladi.
+        # Tashqi so'rovlar bilan coalesce qilinmaydi: SQLite'da tashqi leader shu
+        # tranzaksiya tugashini kutadi, tranzaksiya esa leader'ni - deadlock
+        async with in_transaction():
+            token = coalescing_enabled.set(False)
+            try:
+                group_results = await asyncio.gather(*(
+                    _run_operation(request, index, batch.operations[index], current_user)
+                    for index in group
+                ))
+            finally:
+                coalescing_enabled.reset(token)
+        for index, result in zip(group, group_results):
+            results[index] = result
+
+    return ResponseFormatter.success(
+        data={"results": results},
+        message="Batch bajarildi"
+    )
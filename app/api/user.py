@@ -2,29 +2,104 @@
 User API endpoints - to'liq CRUD operatsiyalar, xavfsizlik va authentication bilan.
 """
 
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, Query, status, Request
 from tortoise.exceptions import IntegrityError, DoesNotExist
 from tortoise.contrib.pydantic import pydantic_model_creator
+from tortoise.expressions import Q
 from typing import List, Optional
 from datetime import datetime, date
+from decouple import config
 
-from app.models.user import User, UserCreateIn, UserUpdateIn, UserLoginIn, UserOut
+from app.models.user import User, UserCreateIn, UserUpdateIn, UserLoginIn, UserOut, USER_PRIVATE_FIELDS
+from app.models.ledger import TransferIn
 from app.core.utils import SecurityUtils, RateLimiter, ResponseFormatter, Utils
 from app.core.security import get_current_user, validate_input_security, rate_limit
+from app.core.cache import response_cache, cache_scope
+from app.core.idempotency import idempotency_store
+from app.core.serialization import JSON_MEDIA_TYPE, current_media_type
+from app.core.cursor import CursorError, decode_cursor, encode_cursor
+from app.core.filters import (
+    FilterError, FilterField, FilterSet, RANGE, TEXT,
+    parse_bool, parse_datetime, parse_date, parse_decimal,
+)
+from app.services.user_cache import USERS_LIST_TAG, user_tag
+from app.services.user_loader import user_loader
+from app.services.user_availability import availability_index
+from app.services import ledger
+from app.services import media
+from app.services.leaderboard import LEADERBOARD_MAX_LIMIT, leaderboard
+from app.services.user_snapshot import snapshot_is_fresh, store_snapshot
 
 
 # Tortoise Pydantic modellari
-User_Pydantic = pydantic_model_creator(User, name="User", exclude=("password_hash",))
-UserIn_Pydantic = pydantic_model_creator(User, name="UserIn", exclude_readonly=True, exclude=("password_hash",))
+User_Pydantic = pydantic_model_creator(User, name="User", exclude=USER_PRIVATE_FIELDS)
+UserIn_Pydantic = pydantic_model_creator(User, name="UserIn", exclude_readonly=True, exclude=USER_PRIVATE_FIELDS)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Faqat birinchi sahifalar keshlanadi (trafikning asosiy qismi)
+USERS_LIST_CACHE_PAGES = 5
+
+# `?ids=` bilan bir so'rovda olinadigan maksimal userlar soni
+MAX_BATCH_IDS = 100
+
+# Indekssiz maydon bo'yicha tartiblashga ruxsat etilgan maksimal qatorlar soni
+UNINDEXED_SORT_MAX_ROWS = config('UNINDEXED_SORT_MAX_ROWS', default=10000, cast=int)
+
+# /users ro'yxati uchun filter whitelist'i.
+# indexed=True - maydon indeks bilan qo'llab-quvvatlanadi (pk/unique yoki User.Meta.indexes)
+USER_FILTERS = FilterSet.of(
+    FilterField("id", int, RANGE, indexed=True),
+    FilterField("username", validate_input_security, TEXT, indexed=True),
+    FilterField("is_active", parse_bool),
+    FilterField("is_superuser", parse_bool),
+    FilterField("created_at", parse_datetime, RANGE, indexed=True),
+    FilterField("updated_at", parse_datetime, RANGE, indexed=True),
+    FilterField("birth_date", parse_date, RANGE, nullable=True),
+    FilterField("age", int, RANGE, nullable=True),
+    FilterField("rating", float, RANGE, indexed=True, nullable=True),
+    FilterField("balance", parse_decimal, RANGE, indexed=True),
+    reserved_params=("page", "per_page", "search", "order", "ids"),
+)
+
+
+def parse_ids(raw: str) -> List[int]:
+    """`1,2,3` ko'rinishidagi id'larni tartibni saqlagan holda (takrorlarsiz) o'qish."""
+    ids = []
+    seen = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            user_id = int(part)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Noto'g'ri id: {part}")
+        if user_id not in seen:
+            seen.add(user_id)
+            ids.append(user_id)
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids bo'sh bo'lmasligi kerak")
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bir so'rovda {MAX_BATCH_IDS} tadan ko'p id berish mumkin emas"
+        )
+    return ids
+
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
 @rate_limit(5, 60)  # 5 marta 1 daqiqada
 async def register_user(request: Request, user_data: UserCreateIn):
-    """Yangi foydalanuvchi ro'yxatdan o'tkazish."""
+    """Yangi foydalanuvchi ro'yxatdan o'tkazish.
     
+    `Idempotency-Key` header'i bilan qayta yuborilgan so'rov birinchi javobni oladi.
+    """
+    return await idempotency_store.run(request, "anonymous", lambda: _register_user(request, user_data))
+
+
+async def _register_user(request: Request, user_data: UserCreateIn):
     # Rate limiting tekshiruvi
     if RateLimiter.is_rate_limited(request):
         raise HTTPException(
@@ -66,7 +141,8 @@ async def register_user(request: Request, user_data: UserCreateIn):
         user_out = await User_Pydantic.from_tortoise_orm(user_obj)
         return ResponseFormatter.success(
             data=user_out,
-            message="Foydalanuvchi muvaffaqiyatli ro'yxatdan o'tdi"
+            message="Foydalanuvchi muvaffaqiyatli ro'yxatdan o'tdi",
+            status_code=status.HTTP_201_CREATED
         )
         
     except IntegrityError as e:
@@ -106,7 +182,7 @@ async def login_user(request: Request, login_data: UserLoginIn):
         
         # Last login yangilash
         user.last_login = datetime.utcnow()
-        await user.save()
+        await user.save(update_fields=["last_login", "updated_at"])
         
         # JWT token yaratish
         access_token = SecurityUtils.create_access_token(
@@ -129,60 +205,358 @@ async def login_user(request: Request, login_data: UserLoginIn):
         )
 
 
+@router.post("/transfer", response_model=dict, status_code=status.HTTP_201_CREATED)
+@rate_limit(30, 60)  # 30 marta 1 daqiqada
+async def transfer_balance(
+    request: Request,
+    transfer_in: TransferIn,
+    current_user: dict = Depends(get_current_user)
+):
+    """Joriy foydalanuvchi balansidan boshqa foydalanuvchiga o'tkazma.
+    
+    Ikki ledger yozuvi va ikki atomik `balance = balance + ?` UPDATE bitta tranzaksiyada.
+    `Idempotency-Key` bilan qayta yuborilgan so'rov ikkinchi marta o'tkazilmaydi.
+    """
+    user_id = int(current_user["user_id"])
+    return await idempotency_store.run(
+        request, f"user:{user_id}", lambda: _transfer_balance(user_id, transfer_in)
+    )
+
+
+async def _transfer_balance(user_id: int, transfer_in: TransferIn):
+    description = validate_input_security(transfer_in.description) if transfer_in.description else None
+    try:
+        transfer_id = await ledger.transfer(user_id, transfer_in.to_user_id, transfer_in.amount, description)
+    except ledger.InsufficientFunds:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Balansingiz yetarli emas"
+        )
+    except ledger.LedgerError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    balance = await User.filter(id=user_id).values_list("balance", flat=True)
+    return ResponseFormatter.success(
+        data={
+            "transfer_id": transfer_id,
+            "from_user_id": user_id,
+            "to_user_id": transfer_in.to_user_id,
+            "amount": transfer_in.amount,
+            "balance": balance[0] if balance else None,
+        },
+        message="O'tkazma bajarildi",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.put("/me/picture", response_model=dict)
+@rate_limit(10, 60)  # 10 marta 1 daqiqada
+async def upload_profile_picture(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """Profil rasmini yuklash - body'da xom rasm (image/jpeg, image/png, image/gif, image/webp).
+    
+    Body diskka chunk'lab yoziladi, fayl SHA-256 bo'yicha saqlanadi (bir xil rasm - bitta fayl),
+    thumbnail'lar process pool'da yaratiladi.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > media.MEDIA_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Fayl hajmi {media.MEDIA_MAX_UPLOAD_BYTES} baytdan oshmasligi kerak"
+        )
+    
+    try:
+        user = await User.get(id=current_user["user_id"])
+    except DoesNotExist:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Foydalanuvchi topilmadi"
+        )
+    
+    try:
+        stored = await media.store_image(request.stream())
+    except media.MediaTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except media.MediaError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if user.profile_picture != stored.path:
+        user.profile_picture = stored.path
+        # post_save signal'lari kesh va profil snapshot'ini yangilaydi
+        await user.save(update_fields=["profile_picture", "updated_at"])
+    
+    return ResponseFormatter.success(
+        data={
+            "profile_picture": stored.path,
+            "url": stored.url,
+            "thumbnails": {size: media.media_url(path) for size, path in stored.thumbnails.items()},
+            "sha256": stored.sha256,
+            "size": stored.size,
+            "deduplicated": stored.deduplicated,
+        },
+        message="Profil rasmi yangilandi"
+    )
+
+
 @router.get("/", response_model=dict)
 async def get_users(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
     search: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Vergul bilan ajratilgan id'lar: 1,2,3"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Barcha foydalanuvchilar ro'yxati (pagination, filter va ordering bilan).
+    
+    Filter misollari: `?is_active=true&created_at__gte=2025-01-01T00:00:00&order=-rating`
+    `?ids=1,2,3` - userlar so'ralgan tartibda, topilmaganlari `missing` da.
+    """
+    
+    if ids is not None:
+        return await get_users_by_ids(request, parse_ids(ids), current_user)
+    
+    try:
+        compiled = USER_FILTERS.compile(request.query_params)
+    except FilterError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def build_response():
+        # Search va filterlar
+        query = User.all()
+        if search:
+            clean_search = validate_input_security(search)
+            query = query.filter(username__icontains=clean_search)
+        try:
+            query = compiled.apply(query, request.query_params)
+        except FilterError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        # Pagination
+        total_count = await query.count()
+        if compiled.unindexed_sort and total_count > UNINDEXED_SORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Indekssiz maydon bo'yicha tartiblash {UNINDEXED_SORT_MAX_ROWS} tadan "
+                    f"ko'p qatorda ruxsat etilmaydi. Filterlarni toraytiring"
+                )
+            )
+        pagination = Utils.calculate_pagination(page, per_page, total_count)
+        
+        # Ma'lumotlarni olish
+        users = await query.offset(pagination["offset"]).limit(per_page)
+        users_data = []
+        for user in users:
+            user_data = await User_Pydantic.from_tortoise_orm(user)
+            users_data.append(user_data)
+        
+        return ResponseFormatter.paginated(
+            data=users_data,
+            pagination=pagination,
+            message="Foydalanuvchilar ro'yxati"
+        )
+    
+    if page > USERS_LIST_CACHE_PAGES:
+        return await build_response()
+    
+    return await response_cache.respond(
+        request,
+        cache_scope(current_user),
+        build_response,
+        tags=[USERS_LIST_TAG],
+        coalesce=True
+    )
+
+
+async def get_users_by_ids(request: Request, user_ids: List[int], current_user: dict):
+    """Id'lar bo'yicha userlarni bitta batch so'rov bilan olish."""
+    
+    async def build_response():
+        users = await user_loader.load_many(user_ids)
+        users_data = []
+        missing = []
+        for user_id, user in zip(user_ids, users):
+            if user is None:
+                missing.append(user_id)
+            else:
+                users_data.append(await User_Pydantic.from_tortoise_orm(user))
+        
+        return ResponseFormatter.success(
+            data={"users": users_data, "missing": missing},
+            message="Foydalanuvchilar ma'lumotlari"
+        )
+    
+    # Topilmagan id'lar keyin yaratilishi mumkin - ro'yxat tag'i ham qo'shiladi
+    return await response_cache.respond(
+        request,
+        cache_scope(current_user),
+        build_response,
+        tags=[USERS_LIST_TAG, *(user_tag(user_id) for user_id in user_ids)],
+        coalesce=True
+    )
+
+
+@router.get("/availability", response_model=dict)
+@rate_limit(60, 60)  # 60 marta 1 daqiqada
+async def check_availability(
+    request: Request,
+    username: Optional[str] = None,
+    email: Optional[str] = None
+):
+    """Username va/yoki email bandligini tekshirish (ro'yxatdan o'tish formasi uchun).
+    
+    Bloom filter'da yo'q qiymatlar uchun bazaga murojaat qilinmaydi.
+    """
+    
+    if not username and not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="username yoki email berilishi kerak"
+        )
+    
+    result = {}
+    if username:
+        clean_username = validate_input_security(username)
+        result["username"] = {
+            "value": clean_username,
+            "available": await availability_index.is_username_available(clean_username),
+        }
+    if email:
+        clean_email = validate_input_security(email)
+        result["email"] = {
+            "value": clean_email,
+            "available": await availability_index.is_email_available(clean_email),
+        }
+    
+    return ResponseFormatter.success(
+        data=result,
+        message="Bandlik tekshiruvi"
+    )
+
+
+@router.get("/leaderboard", response_model=dict)
+async def get_leaderboard(
+    limit: int = Query(10, ge=1, le=LEADERBOARD_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
     current_user: dict = Depends(get_current_user)
 ):
-    """Barcha foydalanuvchilar ro'yxati (pagination bilan)."""
+    """Reyting bo'yicha leaderboard va joriy foydalanuvchi o'rni.
     
-    # Search qilish
-    query = User.all()
-    if search:
-        clean_search = validate_input_security(search)
-        query = query.filter(username__icontains=clean_search)
+    Xotiradagi order-statistic indeksdan o'qiladi - ORDER BY rating bazada bajarilmaydi.
+    """
     
-    # Pagination
-    total_count = await query.count()
-    pagination = Utils.calculate_pagination(page, per_page, total_count)
+    await leaderboard.ensure_loaded()
+    top = leaderboard.top(limit, offset)
+    users = await user_loader.load_many(user_id for _, user_id, _ in top)
     
-    # Ma'lumotlarni olish
-    users = await query.offset(pagination["offset"]).limit(per_page)
-    users_data = []
+    entries = [
+        {
+            "rank": rank,
+            "user_id": user_id,
+            "username": user.username if user is not None else None,
+            "rating": rating,
+        }
+        for (rank, user_id, rating), user in zip(top, users)
+    ]
+    
+    me = leaderboard.rank_of(int(current_user["user_id"]))
+    return ResponseFormatter.success(
+        data={
+            "entries": entries,
+            "total": len(leaderboard),
+            "me": {"rank": me[0], "rating": me[1]} if me is not None else None,
+        },
+        message="Reyting jadvali"
+    )
+
+
+@router.get("/changes", response_model=dict)
+async def get_user_changes(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_user)
+):
+    """Cursor'dan keyin o'zgargan foydalanuvchilar (sinxronizatsiya uchun).
+    
+    Natija `(updated_at, id)` bo'yicha tartiblangan (indeks bilan qo'llab-quvvatlanadi).
+    O'chirilgan (`deleted_at`) yoki `is_active=False` userlar `deleted: true` tombstone sifatida qaytariladi.
+    Javobdagi `next_cursor` keyingi so'rovda ishlatiladi.
+    """
+    
+    query = User.with_deleted()
+    if cursor:
+        try:
+            last_updated_at, last_id = decode_cursor(cursor, 2)
+            last_updated_at = parse_datetime(last_updated_at)
+            last_id = int(last_id)
+        except (CursorError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Noto'g'ri cursor")
+        query = query.filter(
+            Q(updated_at__gt=last_updated_at) | Q(updated_at=last_updated_at, id__gt=last_id)
+        )
+    
+    # Keyingi sahifa bor-yo'qligini bilish uchun bitta ortiqcha qator olinadi
+    users = await query.order_by("updated_at", "id").limit(limit + 1)
+    has_more = len(users) > limit
+    users = users[:limit]
+    
+    changes = []
     for user in users:
-        user_data = await User_Pydantic.from_tortoise_orm(user)
-        users_data.append(user_data)
+        if user.is_active and not user.is_deleted:
+            changes.append(await User_Pydantic.from_tortoise_orm(user))
+        else:
+            changes.append({"id": user.id, "deleted": True, "updated_at": user.updated_at})
+    
+    if users:
+        next_cursor = encode_cursor(users[-1].updated_at.isoformat(), users[-1].id)
+    else:
+        # O'zgarish yo'q - mijoz shu cursor bilan keyinroq qayta so'raydi
+        next_cursor = cursor
     
-    return ResponseFormatter.paginated(
-        data=users_data,
-        pagination=pagination,
-        message="Foydalanuvchilar ro'yxati"
+    return ResponseFormatter.success(
+        data={"changes": changes, "next_cursor": next_cursor, "has_more": has_more},
+        message="Foydalanuvchilar o'zgarishlari"
     )
 
 
 @router.get("/{user_id}", response_model=dict)
 async def get_user(
+    request: Request,
     user_id: int,
     current_user: dict = Depends(get_current_user)
 ):
     """Bitta foydalanuvchi ma'lumotlarini olish."""
     
-    try:
-        user = await User.get(id=user_id)
-        user_data = await User_Pydantic.from_tortoise_orm(user)
+    async def build_response():
+        # Bir vaqtda kelgan /users/{id} so'rovlari bitta IN so'roviga yig'iladi
+        user = await user_loader.load(user_id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Foydalanuvchi topilmadi"
+            )
         
+        if current_media_type() == JSON_MEDIA_TYPE:
+            # Oldindan kodlangan snapshot - pydantic serializatsiyasiz
+            snapshot = user.profile_snapshot if snapshot_is_fresh(user) else await store_snapshot(user)
+            user_data = orjson.Fragment(snapshot)
+        else:
+            user_data = await User_Pydantic.from_tortoise_orm(user)
         return ResponseFormatter.success(
             data=user_data,
             message="Foydalanuvchi ma'lumotlari"
         )
-        
-    except DoesNotExist:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Foydalanuvchi topilmadi"
-        )
+    
+    return await response_cache.respond(
+        request,
+        cache_scope(current_user),
+        build_response,
+        tags=[user_tag(user_id)],
+        coalesce=True
+    )
 
 
 @router.put("/{user_id}", response_model=dict)
@@ -273,10 +647,8 @@ async def delete_user(
                 detail="Bu amalni bajarish huquqingiz yo'q"
             )
         
-        # Soft delete (is_active = False) yoki hard delete
-        # Bu misolda soft delete qilamiz
-        user.is_active = False
-        await user.save()
+        # Soft delete: deleted_at belgilanadi, qator purge job'da butunlay o'chiriladi
+        await user.soft_delete()
         
         return ResponseFormatter.success(
             message="Foydalanuvchi muvaffaqiyatli o'chirildi"
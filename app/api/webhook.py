@@ -0,0 +1,97 @@
+"""
+Webhook obunalari API - faqat superuser'lar uchun.
+
+Hodisalar: user.created, user.updated, user.deactivated. Yetkazish - app/services/webhooks.py.
+"""
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from tortoise.functions import Count
+
+from app.core.security import get_current_user, validate_input_security
+from app.core.utils import ResponseFormatter
+from app.models.user import User
+from app.models.webhook import WEBHOOK_EVENTS, WebhookSubscription, WebhookSubscriptionIn
+from app.services.webhooks import webhook_dispatcher
+
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+SUBSCRIPTION_FIELDS = ("id", "url", "events", "is_active", "failures", "retry_at", "last_error", "created_at")
+
+
+async def require_superuser(current_user: dict = Depends(get_current_user)) -> dict:
+    """Faqat faol superuser."""
+    if not await User.filter(id=current_user["user_id"], is_superuser=True, is_active=True).exists():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Faqat administratorlar uchun"
+        )
+    return current_user
+
+
+@router.get("", response_model=dict)
+async def list_subscriptions(current_user: dict = Depends(require_superuser)):
+    """Obunalar, navbatdagi va dead-letter'dagi hodisalar soni bilan."""
+    subscriptions = await (
+        WebhookSubscription.all()
+        .annotate(pending=Count("outbox", distinct=True), dead_letters=Count("dead_letters", distinct=True))
+        .order_by("id")
+        .values(*SUBSCRIPTION_FIELDS, "pending", "dead_letters")
+    )
+    return ResponseFormatter.success(data=subscriptions, message="Webhook obunalari")
+
+
+@router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_subscription(
+    subscription_in: WebhookSubscriptionIn,
+    current_user: dict = Depends(require_superuser)
+):
+    """Obuna yaratish. `secret` berilmasa yaratiladi va faqat shu javobda qaytariladi."""
+    unknown = sorted(set(subscription_in.events) - set(WEBHOOK_EVENTS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Noma'lum hodisalar: {', '.join(unknown)}"
+        )
+
+    secret = subscription_in.secret or secrets.token_hex(32)
+    subscription = await WebhookSubscription.create(
+        url=validate_input_security(subscription_in.url),
+        events=",".join(dict.fromkeys(subscription_in.events)),
+        secret=secret,
+    )
+    return ResponseFormatter.success(
+        data={"id": subscription.id, "url": subscription.url, "events": subscription.event_list, "secret": secret},
+        message="Webhook obunasi yaratildi",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.delete("/{subscription_id}", response_model=dict)
+async def delete_subscription(subscription_id: int, current_user: dict = Depends(require_superuser)):
+    """Obunani o'chirish (navbatdagi hodisalari ham o'chadi)."""
+    subscription = await WebhookSubscription.get_or_none(id=subscription_id)
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Obuna topilmadi"
+        )
+    await subscription.delete()
+    return ResponseFormatter.success(message="Webhook obunasi o'chirildi")
+
+
+@router.post("/{subscription_id}/replay", response_model=dict)
+async def replay_dead_letters(subscription_id: int, current_user: dict = Depends(require_superuser)):
+    """Dead-letter'dagi hodisalarni qayta navbatga qo'yish."""
+    if not await WebhookSubscription.filter(id=subscription_id).exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Obuna topilmadi"
+        )
+    replayed = await webhook_dispatcher.replay_dead_letters(subscription_id)
+    return ResponseFormatter.success(
+        data={"replayed": replayed},
+        message="Hodisalar qayta navbatga qo'yildi"
+    )
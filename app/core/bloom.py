@@ -0,0 +1,53 @@
+"""
+Bloom filter - "aniq yo'q" javoblarini bazaga murojaat qilmasdan berish uchun.
+
+False negative bo'lmaydi; false positive ehtimoli `error_rate` atrofida
+(elementlar soni `capacity` dan oshmaguncha).
+"""
+
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """Bit massivli oddiy bloom filter (double hashing bilan)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("capacity musbat bo'lishi kerak")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate 0 va 1 orasida bo'lishi kerak")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, value: str) -> None:
+        """Qiymatni qo'shish (allaqachon bor qiymat `count` ni oshirmaydi)."""
+        added = False
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    @property
+    def is_saturated(self) -> bool:
+        """Sig'imdan oshib ketdimi (false positive ehtimoli o'sgan)."""
+        return self.count > self.capacity
@@ -0,0 +1,252 @@
+"""
+Server tomonidagi response kesh - kodlangan bytes, TTL va LRU chegarasi bilan.
+
+Har bir yozuv tag'lar bilan belgilanadi (masalan `user:5`, `users:list`),
+model o'zgarganda faqat tegishli tag'lar bekor qilinadi.
+
+`coalesce=True` route'larda bir xil kalitli parallel miss'lar bitta hisoblashni
+bo'lishadi (single-flight) va bir xil bytes oladi.
+
+Producer ishlayotgan paytda tag'lari bekor qilingan javob keshga yozilmaydi
+(har bir tag invalidatsiyasi generation raqami bilan belgilanadi).
+"""
+
+import time
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from decouple import config
+from fastapi import Request, Response
+
+from app.core.serialization import negotiate_media_type
+from app.core.singleflight import SingleFlight
+
+
+# Kesh holatini ko'rsatuvchi header
+CACHE_STATUS_HEADER = "X-Cache"
+
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=30, cast=int)
+RESPONSE_CACHE_MAX_ENTRIES = config('RESPONSE_CACHE_MAX_ENTRIES', default=1024, cast=int)
+
+# False - joriy kontekstda `coalesce=True` e'tiborsiz qoldiriladi (masalan, tranzaksiya
+# ichidagi /batch o'qishlari: tashqi leader shu tranzaksiya qulfini kutib qolishi mumkin)
+coalescing_enabled: ContextVar[bool] = ContextVar("response_cache_coalescing", default=True)
+
+
+@dataclass
+class CacheEntry:
+    """Keshdagi bitta javob."""
+    body: bytes
+    status_code: int
+    media_type: Optional[str]
+    expires_at: float
+    tags: Tuple[str, ...]
+
+
+def cache_scope(current_user: Optional[dict]) -> str:
+    """Avtorizatsiya doirasi (scope) - kesh kalitining bir qismi.
+
+    Token'dagi `scope` claim'i bo'lmasa, barcha autentifikatsiyadan o'tgan
+    foydalanuvchilar bir xil ma'lumot ko'radi va bitta doirada bo'ladi.
+    """
+    if not current_user:
+        return "anonymous"
+    return str(current_user.get("payload", {}).get("scope", "authenticated"))
+
+
+class ResponseCache:
+    """TTL + LRU kesh, tag bo'yicha aniq invalidatsiya bilan."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: int = RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = defaultdict(set)
+        self.single_flight = SingleFlight()
+        # Invalidatsiya hisoblagichi va tag -> oxirgi invalidatsiya generation'i.
+        # Faqat ishlayotgan producer'lar uchun kerak - ular tugagach tozalanadi
+        self._generation = 0
+        self._tag_generations: Dict[str, int] = {}
+        self._cleared_generation = 0
+        self._producing = 0
+
+        # Metrikalar
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.stale_skips = 0
+
+    @staticmethod
+    def build_key(request: Request, scope: str) -> str:
+        """Route, query, scope va javob formatidan (JSON/MessagePack) kesh kalitini yaratish."""
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        media_type = negotiate_media_type(request.headers.get("accept"))
+        return f"{scope}|{media_type}|{request.method}|{request.url.path}?{query}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Kalit bo'yicha yozuvni olish (muddati o'tgan bo'lsa - o'chiriladi)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(
+        self,
+        key: str,
+        response: Response,
+        tags: Iterable[str] = (),
+        since: Optional[int] = None,
+    ) -> bool:
+        """Javob body'sini keshga yozish.
+
+        `since` - producer boshlangandagi `generation()`; shundan keyin tag'laridan
+        biri bekor qilingan bo'lsa, javob eskirgan hisoblanadi va yozilmaydi.
+        """
+        tags = tuple(tags)
+        if since is not None and (
+            self._cleared_generation > since
+            or any(self._tag_generations.get(tag, 0) > since for tag in tags)
+        ):
+            self.stale_skips += 1
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        entry = CacheEntry(
+            body=bytes(response.body),
+            status_code=response.status_code,
+            media_type=response.media_type,
+            expires_at=time.monotonic() + self.ttl,
+            tags=tags,
+        )
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index[tag].add(key)
+        self.stores += 1
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+        return True
+
+    def generation(self) -> int:
+        """Joriy invalidatsiya generation'i (`set(since=...)` uchun)."""
+        return self._generation
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Berilgan tag'larga bog'langan barcha yozuvlarni o'chirish."""
+        removed = 0
+        if tags:
+            self._generation += 1
+        for tag in tags:
+            if self._producing:
+                self._tag_generations[tag] = self._generation
+            for key in list(self._tag_index.get(tag, ())):
+                if self._remove(key):
+                    removed += 1
+        self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Keshni to'liq tozalash."""
+        self._entries.clear()
+        self._tag_index.clear()
+        self._generation += 1
+        self._cleared_generation = self._generation
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Kesh metrikalari (hit ratio va boshqalar)."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "stale_skips": self.stale_skips,
+            "single_flight": self.single_flight.stats(),
+        }
+
+    async def respond(
+        self,
+        request: Request,
+        scope: str,
+        producer: Callable[[], Awaitable[Response]],
+        tags: Iterable[str] = (),
+        coalesce: bool = False,
+    ) -> Response:
+        """Keshdan javob qaytarish yoki `producer` orqali yaratib keshga yozish.
+
+        Faqat 200 javoblar keshlanadi; producer'dagi HTTPException o'zgarishsiz uzatiladi.
+        `coalesce=True` - faqat xavfsiz (GET) route'lar uchun: parallel miss'lar
+        producer'ni bir marta ishlatadi, qolganlari `X-Cache: COALESCED` bilan o'sha bytes'ni oladi.
+        """
+        key = self.build_key(request, scope)
+        entry = self.get(key)
+        if entry is not None:
+            return Response(
+                content=entry.body,
+                status_code=entry.status_code,
+                media_type=entry.media_type,
+                headers={CACHE_STATUS_HEADER: "HIT", "Vary": "Accept"},
+            )
+
+        since = self._generation
+        self._producing += 1
+        try:
+            if coalesce and coalescing_enabled.get():
+                response, shared = await self.single_flight.do(key, producer)
+                if shared:
+                    return Response(
+                        content=response.body,
+                        status_code=response.status_code,
+                        media_type=response.media_type,
+                        headers={CACHE_STATUS_HEADER: "COALESCED", "Vary": "Accept"},
+                    )
+            else:
+                response = await producer()
+
+            stored = response.status_code == 200 and self.set(key, response, tags, since=since)
+        finally:
+            self._producing -= 1
+            if not self._producing:
+                self._tag_generations = {}
+
+        if stored:
+            response.headers[CACHE_STATUS_HEADER] = "MISS"
+        else:
+            response.headers[CACHE_STATUS_HEADER] = "BYPASS"
+        return response
+
+
+# Global kesh instance
+response_cache = ResponseCache()
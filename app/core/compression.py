@@ -0,0 +1,407 @@
+"""
+Response siqish (compression) - pure ASGI middleware va oldindan siqilgan static fayllar.
+
+- gzip har doim mavjud, brotli (`brotli`) va zstd (`zstandard`) paketlari o'rnatilgan bo'lsa ishlatiladi
+- Kichik body'lar va allaqachon siqilgan turlar (rasm, arxiv va h.k.) siqilmaydi
+- StreamingResponse body'lari chunk-ma-chunk siqiladi
+- /admin/static uchun .br/.zst/.gz variantlari mavjud bo'lsa, to'g'ridan-to'g'ri beriladi
+"""
+
+import gzip
+import mimetypes
+import os
+import stat
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - ixtiyoriy paket
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - ixtiyoriy paket
+    zstandard = None
+
+
+# Server tomonidan afzal ko'rilgan tartib (eng samaralisi birinchi)
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+
+# Oldindan siqilgan static fayllar kengaytmalari
+ENCODING_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+
+# Har bir encoding uchun standart daraja
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+# Content type bo'yicha darajalar - middleware har bir so'rovda siqadi, shuning uchun
+# faqat tez darajalar (br 11 / zstd 19 o'rtacha darajadan yuzlab marta sekin)
+CONTENT_TYPE_LEVELS: Dict[str, Dict[str, int]] = {
+    "application/json": {"gzip": 5, "br": 4, "zstd": 3},
+    "text/html": {"gzip": 6, "br": 5, "zstd": 6},
+    "text/css": {"gzip": 6, "br": 5, "zstd": 3},
+    "application/javascript": {"gzip": 6, "br": 5, "zstd": 3},
+}
+
+# Maksimal darajalar - faqat `compress_static` buyrug'i (bir marta, deploy paytida)
+PRECOMPRESS_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+# Siqishga arziydigan turlar (qolganlari - rasm, video, arxivlar - tegilmaydi)
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "application/x-msgpack",
+    "image/svg+xml",
+}
+
+# Static fayllarni oldindan siqish uchun kengaytmalar
+PRECOMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map"}
+
+
+def available_encodings() -> List[str]:
+    """Serverda mavjud bo'lgan encoding'lar (afzallik tartibida)."""
+    encodings = []
+    for encoding in ENCODING_PREFERENCE:
+        if encoding == "zstd" and zstandard is None:
+            continue
+        if encoding == "br" and brotli is None:
+            continue
+        encodings.append(encoding)
+    return encodings
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding headerini {encoding: q} ko'rinishiga keltirish."""
+    accepted = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+    return accepted
+
+
+def select_encoding(header: str, encodings: List[str]) -> Optional[str]:
+    """Klient qabul qiladigan va serverda mavjud encoding'ni tanlash."""
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*")
+    for encoding in encodings:
+        quality = accepted.get(encoding, wildcard)
+        if quality is not None and quality > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    """Content type siqishga arziydimi."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+_COMPRESSORS = {
+    "gzip": _GzipCompressor,
+    "br": _BrotliCompressor,
+    "zstd": _ZstdCompressor,
+}
+
+
+class CompressionMiddleware:
+    """Pure ASGI siqish middleware.
+
+    Body to'liq buferlanmaydi: `minimum_size` ga yetmay tugagan javoblar
+    siqilmaydi, qolganlarida har bir chunk siqilib darhol klientga uzatiladi.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        levels: Optional[Dict[str, Dict[str, int]]] = None,
+        encodings: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {**CONTENT_TYPE_LEVELS, **(levels or {})}
+        self.encodings = encodings or available_encodings()
+
+    def get_level(self, encoding: str, content_type: str) -> int:
+        """Content type va encoding uchun siqish darajasini aniqlash."""
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return self.levels.get(media_type, {}).get(encoding, DEFAULT_LEVELS[encoding])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Bitta javob uchun siqish holati.
+
+    BaseHTTPMiddleware orqali o'tgan javoblar ham bir nechta chunk bo'lib keladi,
+    shuning uchun body `minimum_size` ga yetguncha buferlanadi: undan oldin
+    tugasa - siqilmasdan, yetsa - siqilgan stream sifatida yuboriladi.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.buffer: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor = None
+        self.passthrough = False
+
+    def _should_compress(self, headers: Headers) -> bool:
+        status_code = self.start_message["status"]
+        if status_code < 200 or status_code in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        return is_compressible(headers.get("content-type", ""))
+
+    async def _flush_uncompressed(self, message: Optional[Message] = None) -> None:
+        """Buferdagi ma'lumotni siqmasdan yuborish va passthrough rejimiga o'tish.
+
+        `message` berilmasa, javob shu yerda tugaydi.
+        """
+        self.passthrough = True
+        if self.start_message is not None:
+            await self.downstream(self.start_message)
+            self.start_message = None
+
+        body = b"".join(self.buffer)
+        self.buffer = []
+        if message is None:
+            await self.downstream({"type": "http.response.body", "body": body, "more_body": False})
+            return
+        if body:
+            await self.downstream({"type": "http.response.body", "body": body, "more_body": True})
+        await self.downstream(message)
+
+    async def _start_compression(self, more_body: bool) -> None:
+        """Headerlarni yangilab, buferdagi ma'lumotni siqib yuborish."""
+        headers = Headers(raw=self.start_message["headers"])
+        level = self.middleware.get_level(self.encoding, headers.get("content-type", ""))
+        compressor = _COMPRESSORS[self.encoding](level)
+        body = b"".join(self.buffer)
+        data = compressor.compress(body)
+
+        if not more_body:
+            data += compressor.finish()
+            if len(data) >= len(body):
+                # Siqish foyda bermadi - asl body'ni yuboramiz
+                await self._flush_uncompressed()
+                return
+        else:
+            data += compressor.flush()
+
+        self.compressor = compressor
+        self.buffer = []
+        start_message = dict(self.start_message)
+        new_headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        new_headers["Content-Encoding"] = self.encoding
+        new_headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            # Streaming javobda yakuniy uzunlik noma'lum
+            if "content-length" in new_headers:
+                del new_headers["content-length"]
+        else:
+            new_headers["Content-Length"] = str(len(data))
+        start_message["headers"] = new_headers.raw
+        self.start_message = None
+
+        await self.downstream(start_message)
+        await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Headerlarni body haqida qaror qabul qilinguncha ushlab turamiz
+            self.start_message = message
+            if not self._should_compress(Headers(raw=message["headers"])):
+                self.passthrough = True
+            return
+
+        if self.passthrough or message_type != "http.response.body":
+            # pathsend/zerocopysend kabi kengaytmalar siqilmaydi
+            await self._flush_uncompressed(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            data = self.compressor.compress(body)
+            data += self.compressor.flush() if more_body else self.compressor.finish()
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        if body:
+            self.buffer.append(body)
+            self.buffered_size += len(body)
+
+        if self.buffered_size >= self.middleware.minimum_size:
+            await self._start_compression(more_body)
+        elif not more_body:
+            # Javob chegaradan kichik bo'lib tugadi
+            await self._flush_uncompressed()
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Oldindan siqilgan (.zst/.br/.gz) variantlari bo'lgan StaticFiles.
+
+    Variant mavjud bo'lsa u asl Content-Type bilan beriladi, shuning uchun
+    har bir so'rovda CSS/JS qayta siqilmaydi.
+    """
+
+    async def get_response(self, path: str, scope: Scope):
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = None
+        full_path, stat_result = None, None
+
+        accepted = parse_accept_encoding(accept_encoding) if accept_encoding else {}
+        for candidate in available_encodings():
+            quality = accepted.get(candidate, accepted.get("*"))
+            if not quality or quality <= 0:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(
+                self.lookup_path, path + ENCODING_SUFFIXES[candidate]
+            )
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                encoding = candidate
+                break
+
+        if encoding is None:
+            response = await super().get_response(path, scope)
+            if os.path.splitext(path)[1] in PRECOMPRESS_EXTENSIONS:
+                response.headers.add_vary_header("Accept-Encoding")
+            return response
+
+        response = self.file_response(full_path, stat_result, scope)
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        response.headers["Content-Type"] = media_type
+        response.headers["Content-Encoding"] = encoding
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+
+def _write_variant(source_path: str, target_path: str, encoding: str, data: bytes) -> None:
+    """Bitta siqilgan variantni yozish."""
+    if encoding == "gzip":
+        compressed = gzip.compress(data, compresslevel=PRECOMPRESS_LEVELS["gzip"], mtime=0)
+    elif encoding == "br":
+        compressed = brotli.compress(data, quality=PRECOMPRESS_LEVELS["br"])
+    else:
+        compressed = zstandard.ZstdCompressor(level=PRECOMPRESS_LEVELS["zstd"]).compress(data)
+
+    with open(target_path, "wb") as f:
+        f.write(compressed)
+    source_stat = os.stat(source_path)
+    os.utime(target_path, (source_stat.st_atime, source_stat.st_mtime))
+
+
+def precompress_static_files(directory: str) -> Tuple[int, int]:
+    """Papkadagi static fayllar uchun .gz/.br/.zst variantlarini yaratish.
+
+    Faqat yangi yoki o'zgargan fayllar qayta siqiladi.
+    (yaratilgan, o'tkazib yuborilgan) variantlar sonini qaytaradi.
+    """
+    created, skipped = 0, 0
+    encodings = available_encodings()
+
+    for root, _dirs, files in os.walk(directory):
+        for filename in files:
+            if os.path.splitext(filename)[1] not in PRECOMPRESS_EXTENSIONS:
+                continue
+            source_path = os.path.join(root, filename)
+            source_mtime = os.stat(source_path).st_mtime
+            data = None
+
+            for encoding in encodings:
+                target_path = source_path + ENCODING_SUFFIXES[encoding]
+                if os.path.exists(target_path) and os.stat(target_path).st_mtime == source_mtime:
+                    skipped += 1
+                    continue
+                if data is None:
+                    with open(source_path, "rb") as f:
+                        data = f.read()
+                _write_variant(source_path, target_path, encoding, data)
+                created += 1
+
+    return created, skipped
@@ -0,0 +1,33 @@
+"""
+Keyset (cursor) pagination uchun shaffof bo'lmagan cursor'lar.
+
+Cursor - oxirgi qaytarilgan qatorning tartiblash kalitlari (masalan `(updated_at, id)`),
+JSON + URL-safe base64 ko'rinishida.
+"""
+
+import base64
+import binascii
+from typing import Any, List
+
+from app.core.serialization import dumps, loads
+
+
+class CursorError(ValueError):
+    """Noto'g'ri yoki buzilgan cursor."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Kalit qiymatlaridan cursor yaratish."""
+    return base64.urlsafe_b64encode(dumps(list(values))).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Cursor'dan `size` ta kalit qiymatini o'qish."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeEncodeError):
+        raise CursorError("Noto'g'ri cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise CursorError("Noto'g'ri cursor")
+    return values
@@ -0,0 +1,113 @@
+"""
+DataLoader - bir event-loop "tick"idagi alohida yuklashlarni bitta batch so'rovga yig'ish.
+
+Misol: bir vaqtda kelgan `/users/1`, `/users/2`, `/users/3` so'rovlari
+uchta `SELECT` o'rniga bitta `WHERE id IN (1, 2, 3)` bilan yuklanadi.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Set, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Bitta batch so'rovdagi maksimal kalitlar soni (IN (...) ro'yxati chegarasi)
+DEFAULT_MAX_BATCH_SIZE = 500
+
+
+class DataLoader(Generic[K, V]):
+    """Kalitlarni yig'ib, `batch_fn` ni bir marta chaqiruvchi loader.
+
+    `batch_fn` kalitlar ro'yxatini oladi va `{kalit: qiymat}` qaytaradi;
+    topilmagan kalitlar uchun `load()` None qaytaradi.
+    Natijalar keshlanmaydi - har bir batch bazadan yangi o'qiladi.
+
+    Batch turli so'rovlarning chaqiruvlarini birlashtiradi: qiymatlar o'zgaruvchan
+    (mutable) bo'lsa, `clone` berilishi kerak - har bir chaqiruvchi o'z nusxasini oladi.
+    `batch_fn` birinchi chaqiruvchining kontekstida (uning tranzaksiyasi ichida ham)
+    ishlaydi, shuning uchun ulanishni aniq ko'rsatgani ma'qul (`using_db`).
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        clone: Optional[Callable[[V], V]] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.clone = clone
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._scheduled = False
+        # Event loop task'larni faqat kuchsiz havola bilan ushlaydi - batch tugaguncha
+        # GC yig'ib olmasligi uchun
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Metrikalar
+        self.batches = 0
+        self.loads = 0
+        self.keys_fetched = 0
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.loads += 1
+        if not self._scheduled:
+            # Joriy tick'dagi barcha load() chaqiruvlaridan keyin ishga tushadi
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    async def load(self, key: K) -> Optional[V]:
+        """Bitta kalitni yuklash (boshqa chaqiruvlar bilan birga batch qilinadi)."""
+        return await self._enqueue(key)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Bir nechta kalitni so'ralgan tartibda yuklash."""
+        futures = [self._enqueue(key) for key in keys]
+        if not futures:
+            return []
+        return list(await asyncio.gather(*futures))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start:start + self.max_batch_size]
+            task = asyncio.ensure_future(self._run_batch(chunk, {key: pending[key] for key in chunk}))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: List[K], pending: Dict[K, List[asyncio.Future]]) -> None:
+        self.batches += 1
+        self.keys_fetched += len(keys)
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as exc:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+
+        for key, futures in pending.items():
+            value = results.get(key)
+            for future in futures:
+                if not future.done():
+                    if value is not None and self.clone is not None:
+                        future.set_result(self.clone(value))
+                    else:
+                        future.set_result(value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch metrikalari."""
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "keys_fetched": self.keys_fetched,
+            "avg_batch_size": round(self.keys_fetched / self.batches, 2) if self.batches else 0.0,
+        }
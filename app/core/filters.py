@@ -0,0 +1,165 @@
+"""
+Ro'yxat endpointlari uchun filter va tartiblash (ordering) DSL.
+
+Misol: `?is_active=true&created_at__gte=2025-01-01&order=-rating`
+
+- Faqat whitelist'dagi maydon va operatorlarga ruxsat beriladi
+- Har bir maydon indeks bilan qo'llab-quvvatlanishi (indexed) belgilanadi
+- Bir xil "shakl"dagi (maydon+operator+ordering) so'rovlar bir marta kompilyatsiya qilinadi
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from tortoise.queryset import QuerySet
+
+
+class FilterError(ValueError):
+    """Noto'g'ri filter yoki ordering so'rovi."""
+
+
+def parse_bool(value: str) -> bool:
+    """'true'/'false' kabi qiymatlarni bool ga aylantirish."""
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes", "ha"):
+        return True
+    if lowered in ("false", "0", "no", "yo'q"):
+        return False
+    raise ValueError(value)
+
+
+def parse_datetime(value: str) -> datetime:
+    """ISO 8601 sana-vaqtni o'qish (`Z` suffiksi ham qabul qilinadi)."""
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def parse_date(value: str) -> date:
+    """YYYY-MM-DD formatdagi sanani o'qish."""
+    return date.fromisoformat(value.strip())
+
+
+def parse_decimal(value: str) -> Decimal:
+    """Pul qiymatini o'qish (`12.50`); NaN/Infinity qabul qilinmaydi."""
+    try:
+        result = Decimal(value.strip())
+    except InvalidOperation:
+        raise ValueError(value)
+    if not result.is_finite():
+        raise ValueError(value)
+    return result
+
+
+# Kompilyatsiya keshining yuqori chegarasi
+MAX_COMPILED_SHAPES = 512
+
+# Operatorlar guruhlari
+EQUALITY = ("exact",)
+RANGE = ("exact", "gt", "gte", "lt", "lte")
+TEXT = ("exact", "icontains", "istartswith")
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """Filter/ordering uchun ruxsat etilgan maydon."""
+    name: str
+    parser: Callable[[str], Any]
+    operators: Tuple[str, ...] = EQUALITY
+    indexed: bool = False
+    sortable: bool = True
+    nullable: bool = False
+
+
+@dataclass
+class CompiledFilter:
+    """Bitta so'rov shakli uchun kompilyatsiya qilingan filter."""
+    lookups: List[Tuple[str, str, Callable[[str], Any]]]
+    ordering: List[str]
+    unindexed_sort: bool
+
+    def apply(self, queryset: QuerySet, params: Mapping[str, str]) -> QuerySet:
+        """Qiymatlarni o'girib queryset ga filter va ordering qo'llash."""
+        kwargs = {}
+        for param, lookup, parser in self.lookups:
+            raw = params[param]
+            try:
+                kwargs[lookup] = parser(raw)
+            except (TypeError, ValueError):
+                raise FilterError(f"'{param}' uchun noto'g'ri qiymat: {raw}")
+        if kwargs:
+            queryset = queryset.filter(**kwargs)
+        return queryset.order_by(*self.ordering)
+
+
+@dataclass
+class FilterSet:
+    """Model uchun filter whitelist'i va kompilyatsiya keshi."""
+    fields: Dict[str, FilterField]
+    default_ordering: Tuple[str, ...] = ("id",)
+    reserved_params: Tuple[str, ...] = ("page", "per_page", "search", "order")
+    order_param: str = "order"
+    tiebreaker: str = "id"
+    _compiled: Dict[Tuple, CompiledFilter] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, *fields: FilterField, **kwargs) -> "FilterSet":
+        """FilterField ro'yxatidan FilterSet yaratish."""
+        return cls(fields={f.name: f for f in fields}, **kwargs)
+
+    def _split_param(self, param: str) -> Tuple[FilterField, str]:
+        name, _, operator = param.partition("__")
+        operator = operator or "exact"
+        filter_field = self.fields.get(name)
+        if filter_field is None:
+            raise FilterError(f"Noma'lum filter maydoni: {name}")
+        if operator == "isnull" and filter_field.nullable:
+            return filter_field, operator
+        if operator not in filter_field.operators:
+            raise FilterError(f"'{name}' uchun '{operator}' operatoriga ruxsat yo'q")
+        return filter_field, operator
+
+    def _compile(self, filter_params: Tuple[str, ...], order: Optional[str]) -> CompiledFilter:
+        lookups = []
+        for param in filter_params:
+            filter_field, operator = self._split_param(param)
+            lookup = filter_field.name if operator == "exact" else f"{filter_field.name}__{operator}"
+            parser = parse_bool if operator == "isnull" else filter_field.parser
+            lookups.append((param, lookup, parser))
+
+        ordering = []
+        unindexed_sort = False
+        for item in (order.split(",") if order else self.default_ordering):
+            item = item.strip()
+            name = item[1:] if item.startswith("-") else item
+            filter_field = self.fields.get(name)
+            if filter_field is None or not filter_field.sortable:
+                raise FilterError(f"'{name}' bo'yicha tartiblashga ruxsat yo'q")
+            if not filter_field.indexed:
+                unindexed_sort = True
+            ordering.append(item)
+
+        # Sahifalash barqaror bo'lishi uchun oxirida doim unikal maydon
+        if self.tiebreaker not in {item.lstrip("-") for item in ordering}:
+            ordering.append(self.tiebreaker)
+
+        return CompiledFilter(lookups=lookups, ordering=ordering, unindexed_sort=unindexed_sort)
+
+    def compile(self, params: Mapping[str, str]) -> CompiledFilter:
+        """Query parametrlari shakli bo'yicha kompilyatsiya (keshlangan)."""
+        filter_params = tuple(sorted(
+            key for key in params.keys() if key not in self.reserved_params
+        ))
+        order = params.get(self.order_param) or None
+        shape = (filter_params, order)
+
+        compiled = self._compiled.get(shape)
+        if compiled is None:
+            compiled = self._compile(filter_params, order)
+            if len(self._compiled) >= MAX_COMPILED_SHAPES:
+                self._compiled.clear()
+            self._compiled[shape] = compiled
+        return compiled
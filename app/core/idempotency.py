@@ -0,0 +1,198 @@
+"""
+Idempotency-Key - yaratish endpointlarini qayta yuborishdan himoyalash.
+
+- Birinchi javob (status + body bytes) TTL bilan saqlanadi
+- Takroriy so'rov saqlangan javobni darhol oladi (`Idempotent-Replayed: true`)
+- Bir vaqtda kelgan dublikatlar bajarilayotgan so'rovni kutadi, qayta ishlatmaydi
+- Bir xil kalit boshqa body bilan kelsa - 422
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from decouple import config
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.serialization import negotiate_media_type
+
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+IDEMPOTENCY_TTL = config('IDEMPOTENCY_TTL', default=86400, cast=int)
+IDEMPOTENCY_MAX_ENTRIES = config('IDEMPOTENCY_MAX_ENTRIES', default=10000, cast=int)
+
+
+@dataclass
+class IdempotencyEntry:
+    """Saqlangan javob."""
+    fingerprint: str
+    body: bytes
+    status_code: int
+    media_type: Optional[str]
+    expires_at: float
+
+
+@dataclass
+class _InFlight:
+    """Bajarilayotgan so'rov - dublikatlar shu future'ni kutadi."""
+    fingerprint: str
+    future: asyncio.Future
+
+
+async def request_fingerprint(request: Request) -> str:
+    """So'rov body'sidan (JSON yoki form) barmoq izi."""
+    digest = hashlib.sha256(f"{request.method} {request.url.path}\n".encode("utf-8"))
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+        form = await request.form()
+        for name, value in sorted((k, str(v)) for k, v in form.multi_items()):
+            digest.update(f"{name}={value}\n".encode("utf-8"))
+    else:
+        digest.update(await request.body())
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """Idempotency-Key bo'yicha javoblar ombori (TTL + LRU)."""
+
+    def __init__(self, max_entries: int = IDEMPOTENCY_MAX_ENTRIES, ttl: int = IDEMPOTENCY_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+
+        # Metrikalar
+        self.stored = 0
+        self.replays = 0
+        self.waits = 0
+        self.conflicts = 0
+
+    def _get(self, key: str) -> Optional[IdempotencyEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, fingerprint: str, response: Response) -> None:
+        self._entries[key] = IdempotencyEntry(
+            fingerprint=fingerprint,
+            body=bytes(response.body),
+            status_code=response.status_code,
+            media_type=response.media_type,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+        self.stored += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _replay(self, entry: IdempotencyEntry, fingerprint: str) -> Response:
+        if entry.fingerprint != fingerprint:
+            self.conflicts += 1
+            raise HTTPException(
+                status_code=422,
+                detail="Bu Idempotency-Key boshqa so'rov bilan ishlatilgan"
+            )
+        self.replays += 1
+        return Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            media_type=entry.media_type,
+            headers={IDEMPOTENCY_REPLAYED_HEADER: "true"},
+        )
+
+    async def run(
+        self,
+        request: Request,
+        scope: str,
+        producer: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """Idempotency-Key bo'lsa - bir martalik bajarish, aks holda oddiy `producer()`.
+
+        5xx javoblar va exception'lar saqlanmaydi (kalit qayta ishlatilishi mumkin);
+        kutayotgan dublikatlarga esa xuddi shu natija/exception uzatiladi.
+        """
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not idempotency_key:
+            return await producer()
+        if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key {IDEMPOTENCY_KEY_MAX_LENGTH} belgidan oshmasligi kerak"
+            )
+
+        media_type = negotiate_media_type(request.headers.get("accept"))
+        key = f"{scope}|{media_type}|{request.method}|{request.url.path}|{idempotency_key}"
+        fingerprint = await request_fingerprint(request)
+
+        entry = self._get(key)
+        if entry is not None:
+            return self._replay(entry, fingerprint)
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            if in_flight.fingerprint != fingerprint:
+                self.conflicts += 1
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Bu Idempotency-Key bilan boshqa so'rov bajarilmoqda"
+                )
+            self.waits += 1
+            try:
+                response = await asyncio.shield(in_flight.future)
+            except asyncio.CancelledError:
+                if not in_flight.future.cancelled():
+                    raise
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Birinchi so'rov yakunlanmadi. Qayta urinib ko'ring"
+                )
+            entry = self._get(key)
+            if entry is not None:
+                return self._replay(entry, fingerprint)
+            return response
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = _InFlight(fingerprint=fingerprint, future=future)
+        try:
+            response = await producer()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Hech kim kutmagan bo'lsa "exception was never retrieved" ogohlantirishi chiqmasin
+            future.exception()
+            raise
+        else:
+            if response.status_code < 500:
+                self._store(key, fingerprint, response)
+            future.set_result(response)
+            return response
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Idempotency metrikalari."""
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "stored": self.stored,
+            "replays": self.replays,
+            "waits": self.waits,
+            "conflicts": self.conflicts,
+        }
+
+
+# Global instance
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,124 @@
+"""
+Kontent manzilli (nomi = SHA-256) media fayllarni berish.
+
+- Fayl nomidagi hash - ETag, `Cache-Control: immutable`: fayl hech qachon o'zgarmaydi
+- `If-None-Match` mos kelsa 304 - fayl ochilmaydi va `stat` ham qilinmaydi
+- Body Python orqali o'qilmaydi: server qo'llasa `http.response.pathsend` (butun fayl)
+  yoki `http.response.zerocopysend` (sendfile, Range bilan ham), aks holda katta chunk'lar
+- `Range` so'rovlari (bitta va bir nechta oraliq) - FileResponse orqali
+"""
+
+import os
+import re
+import stat
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+# `avatars/ab/<sha256>.png` yoki thumbnail `avatars/ab/<sha256>_256.webp`
+CONTENT_ADDRESSED_PATH = re.compile(
+    r"^[a-z]+/[0-9a-f]{2}/(?P<hash>[0-9a-f]{64})(?P<variant>_\d+)?\.(?:jpg|png|gif|webp)$"
+)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """`If-None-Match` (vergul bilan ajratilgan, W/ prefiksli bo'lishi mumkin) tekshiruvi."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class MediaFileResponse(FileResponse):
+    """FileResponse + `zerocopysend` ASGI kengaytmasi (server sendfile bilan uzatadi)."""
+
+    # Kengaytma bo'lmasa - kamroq thread hop'lar uchun katta chunk
+    chunk_size = 256 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    async def _send_zerocopy(self, send: Send, offset: int, count: int) -> None:
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            await send({"type": ZEROCOPY_EXTENSION, "file": file, "offset": offset, "count": count, "more_body": False})
+        finally:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(file.close)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool, send_pathsend: bool) -> None:
+        if not self._zerocopy or send_header_only or send_pathsend:
+            await super()._handle_simple(send, send_header_only, send_pathsend)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._send_zerocopy(send, 0, int(self.headers["content-length"]))
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not self._zerocopy or send_header_only:
+            await super()._handle_single_range(send, start, end, file_size, send_header_only)
+            return
+        headers = self.headers.mutablecopy()
+        headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": headers.raw})
+        await self._send_zerocopy(send, start, end - start)
+
+
+class ContentAddressedFiles:
+    """Kontent manzilli fayllar uchun ASGI ilova (`app.mount(...)`).
+
+    Faqat `CONTENT_ADDRESSED_PATH` ga mos yo'llar beriladi - path traversal mumkin emas.
+    """
+
+    def __init__(self, directory: str, cache_control: str = IMMUTABLE_CACHE_CONTROL):
+        self.directory = directory
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = await self.get_response(scope)
+        await response(scope, receive, send)
+
+    async def get_response(self, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            return PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        match = CONTENT_ADDRESSED_PATH.match(path.lstrip("/"))
+        if match is None:
+            return PlainTextResponse("Not Found", status_code=404)
+
+        etag = f'"{match["hash"]}{match["variant"] or ""}"'
+        headers = {"etag": etag, "cache-control": self.cache_control}
+
+        # Kontent o'zgarmaydi - mos ETag'da diskka umuman murojaat qilinmaydi
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        full_path = os.path.join(self.directory, match.group(0))
+        stat_result = await self._stat(full_path)
+        if stat_result is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return MediaFileResponse(full_path, headers=headers, stat_result=stat_result)
+
+    @staticmethod
+    async def _stat(full_path: str) -> Optional[os.stat_result]:
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return stat_result if stat.S_ISREG(stat_result.st_mode) else None
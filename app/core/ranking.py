@@ -0,0 +1,139 @@
+"""
+Order-statistic indeks - tartiblangan kalitlar ustida rank va select.
+
+Bucket'langan sorted list: kalitlar `load` o'lchamli tartiblangan bo'laklarda saqlanadi,
+qo'shish/o'chirish bitta bo'lakni o'zgartiradi (bisect + list.insert),
+rank va select esa bo'lak uzunliklari bo'yicha yuradi - O(n / load + log load).
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Iterable, Iterator, List
+
+
+class OrderStatisticIndex:
+    """Takrorlanmaydigan, tartiblangan kalitlar to'plami."""
+
+    DEFAULT_LOAD = 1000
+
+    def __init__(self, keys: Iterable[Any] = (), load: int = DEFAULT_LOAD):
+        if load < 2:
+            raise ValueError("load kamida 2 bo'lishi kerak")
+        self.load = load
+        self._buckets: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._len = 0
+        self.extend_sorted(sorted(set(keys)))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __contains__(self, key: Any) -> bool:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        return j < len(bucket) and bucket[j] == key
+
+    def extend_sorted(self, keys: Iterable[Any]) -> None:
+        """Tartiblangan va mavjudlaridan katta kalitlarni oxiriga qo'shish (bazadan yuklash uchun)."""
+        for key in keys:
+            if self._maxes and not key > self._maxes[-1]:
+                raise ValueError("Kalitlar o'suvchi tartibda bo'lishi kerak")
+            if not self._buckets or len(self._buckets[-1]) >= self.load:
+                self._buckets.append([])
+                self._maxes.append(key)
+            self._buckets[-1].append(key)
+            self._maxes[-1] = key
+            self._len += 1
+
+    def add(self, key: Any) -> bool:
+        """Kalitni qo'shish. Qaytaradi: yangi qo'shildimi."""
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return True
+
+        i = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if j < len(bucket) and bucket[j] == key:
+            return False
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        self._len += 1
+
+        if len(bucket) > self.load * 2:
+            # Bo'lakni ikkiga bo'lish
+            half = bucket[self.load:]
+            del bucket[self.load:]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+        return True
+
+    def remove(self, key: Any) -> bool:
+        """Kalitni o'chirish. Qaytaradi: kalit bor edimi."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if j == len(bucket) or bucket[j] != key:
+            return False
+        del bucket[j]
+        self._len -= 1
+
+        if not bucket:
+            del self._buckets[i]
+            del self._maxes[i]
+        else:
+            self._maxes[i] = bucket[-1]
+            # Juda kichrayib ketgan bo'lakni qo'shnisi bilan birlashtirish
+            if len(bucket) < self.load // 2 and i + 1 < len(self._buckets):
+                bucket.extend(self._buckets.pop(i + 1))
+                self._maxes.pop(i + 1)
+                self._maxes[i] = bucket[-1]
+        return True
+
+    def rank(self, key: Any) -> int:
+        """`key` dan kichik kalitlar soni (0 dan boshlanadi)."""
+        i = bisect_left(self._maxes, key)
+        position = sum(len(bucket) for bucket in self._buckets[:i])
+        if i < len(self._buckets):
+            position += bisect_left(self._buckets[i], key)
+        return position
+
+    def select(self, index: int) -> Any:
+        """Tartibdagi `index`-kalit."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("index chegaradan tashqarida")
+        for bucket in self._buckets:
+            if index < len(bucket):
+                return bucket[index]
+            index -= len(bucket)
+        raise IndexError("index chegaradan tashqarida")  # pragma: no cover
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """`start:stop` oralig'idagi kalitlar (to'liq ro'yxat yaratmasdan)."""
+        start = max(start, 0)
+        stop = min(stop, self._len)
+        result: List[Any] = []
+        for bucket in self._buckets:
+            if start >= stop:
+                break
+            size = len(bucket)
+            if start < size:
+                result.extend(bucket[start:stop])
+                start = 0
+            else:
+                start -= size
+            stop -= size
+        return result
@@ -17,6 +17,8 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import html
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 # JWT konfiguratsiyasi
@@ -128,9 +130,12 @@ class SecurityUtils:
         return filename
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """JWT tokendan foydalanuvchini olish."""
-    token = credentials.credentials
+# Batch so'rovda bir marta tekshirilgan foydalanuvchi ichki so'rovlarga shu ASGI scope kaliti orqali uzatiladi
+AUTH_SCOPE_KEY = "auth.current_user"
+
+
+def authenticate_token(token: str) -> Dict[str, Any]:
+    """JWT tokenni tekshirib, joriy foydalanuvchi ma'lumotlarini qaytarish."""
     payload = SecurityUtils.verify_token(token)
     user_id = payload.get("sub")
     if user_id is None:
@@ -142,6 +147,14 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return {"user_id": user_id, "payload": payload}
 
 
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """JWT tokendan foydalanuvchini olish."""
+    authenticated = request.scope.get(AUTH_SCOPE_KEY)
+    if authenticated is not None:
+        return authenticated
+    return authenticate_token(credentials.credentials)
+
+
 def validate_input_security(input_data: str) -> str:
     """Input ma'lumotlarni xavfsizlik tekshiruvidan o'tkazish."""
     if not SecurityUtils.validate_sql_input(input_data):
@@ -178,3 +191,38 @@ CSP_HEADER = (
     "connect-src 'self'; "
     "frame-ancestors 'none';"
 )
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": CSP_HEADER,
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+}
+
+
+class SecurityHeadersMiddleware:
+    """Xavfsizlik headerlarini qo'shish - pure ASGI.
+
+    Body message'lariga tegilmaydi, shuning uchun `pathsend`/`zerocopysend`
+    kengaytmalari serverga o'zgarmasdan yetib boradi (BaseHTTPMiddleware'dan farqli).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
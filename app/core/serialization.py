@@ -0,0 +1,190 @@
+"""
+Tez JSON serializatsiya - orjson asosida.
+ResponseFormatter javoblari jsonable_encoder dan o'tmasdan to'g'ridan-to'g'ri bytes ga aylantiriladi.
+
+`Accept: application/msgpack` so'rovlariga xuddi shu envelope MessagePack'da qaytariladi
+(datetime - msgpack Timestamp, Decimal va date - ilova ext turlari).
+"""
+
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack ixtiyoriy
+    msgpack = None
+
+
+# int kalitli dict'lar ham stdlib json kabi string kalitga aylantiriladi
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj: Any) -> Any:
+    """orjson o'zi bilmaydigan turlarni serializatsiya qilish.
+
+    datetime, date, UUID va dataclass'larni orjson o'zi native yozadi.
+    Decimal pydantic'ning JSON rejimi kabi string ko'rinishida qaytariladi
+    (aniqlik yo'qolmasligi uchun).
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        # Python rejimida dump - datetime'lar orjson'ga native holda boradi
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Obyektni JSON bytes ga aylantirish."""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """JSON bytes/str ni Python obyektga aylantirish."""
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson bilan render qilinadigan JSON response.
+
+    Content allaqachon kodlangan bytes bo'lsa, qayta serializatsiya qilinmaydi.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> FastJSONResponse:
+    """Envelope dict'dan tayyor FastJSONResponse yaratish."""
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
+
+
+# MessagePack
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# Ilova ext turlari (datetime uchun msgpack'ning standart Timestamp -1 turi ishlatiladi)
+MSGPACK_EXT_DECIMAL = 1
+MSGPACK_EXT_DATE = 2
+
+# Joriy so'rov uchun tanlangan javob formati
+_response_media_type: ContextVar[str] = ContextVar("response_media_type", default=JSON_MEDIA_TYPE)
+
+
+def msgpack_default(obj: Any) -> Any:
+    """msgpack o'zi bilmaydigan turlarni kodlash."""
+    if isinstance(obj, datetime):
+        # Bazadagi naive vaqtlar UTC (use_tz=True)
+        return obj.replace(tzinfo=timezone.utc)
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(MSGPACK_EXT_DECIMAL, str(obj).encode("ascii"))
+    if isinstance(obj, date):
+        return msgpack.ExtType(MSGPACK_EXT_DATE, obj.isoformat().encode("ascii"))
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not MessagePack serializable: {type(obj).__name__}")
+
+
+def msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """Ilova ext turlarini Python obyektlariga qaytarish."""
+    if code == MSGPACK_EXT_DECIMAL:
+        return Decimal(data.decode("ascii"))
+    if code == MSGPACK_EXT_DATE:
+        return date.fromisoformat(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
+
+def msgpack_dumps(content: Any) -> bytes:
+    """Obyektni MessagePack bytes ga aylantirish."""
+    return msgpack.packb(content, default=msgpack_default, datetime=True, use_bin_type=True)
+
+
+def msgpack_loads(data: bytes) -> Any:
+    """MessagePack bytes ni Python obyektga aylantirish (datetime - aware UTC)."""
+    return msgpack.unpackb(data, ext_hook=msgpack_ext_hook, timestamp=3, raw=False, strict_map_key=False)
+
+
+class MsgPackResponse(Response):
+    """MessagePack bilan render qilinadigan response."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return msgpack_dumps(content)
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Accept header bo'yicha javob formatini tanlash (JSON yoki MessagePack)."""
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+
+    msgpack_q = 0.0
+    json_q = 0.0
+    for media_range in accept.split(","):
+        media_type, *params = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, quality)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_q = max(json_q, quality)
+
+    if msgpack_q > 0 and msgpack_q >= json_q:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+async def negotiate_response_format(request: Request) -> str:
+    """Router dependency: so'rovning Accept header'i bo'yicha formatni belgilash."""
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    _response_media_type.set(media_type)
+    return media_type
+
+
+def current_media_type() -> str:
+    """Joriy so'rov uchun tanlangan javob formati."""
+    return _response_media_type.get()
+
+
+def api_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Envelope'ni tanlangan formatda (JSON yoki MessagePack) qaytarish."""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if current_media_type() == MSGPACK_MEDIA_TYPE:
+        return MsgPackResponse(content=content, status_code=status_code, headers=headers)
+    return json_response(content, status_code=status_code, headers=headers)
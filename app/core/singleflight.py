@@ -0,0 +1,68 @@
+"""
+Single-flight - bir xil kalitli parallel hisoblashlarni bittaga birlashtirish.
+
+Birinchi chaqiruv (leader) hisoblashni bajaradi, qolganlari uning natijasini
+(yoki exception'ini) kutadi va qayta ishlatadi.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Kalit bo'yicha bajarilayotgan hisoblashlar jadvali."""
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Metrikalar
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """`func` ni kalit bo'yicha bir marta bajarish.
+
+        Qaytaradi: (natija, shared) - shared=True bo'lsa natija boshqa chaqiruvdan olingan.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Leader bekor qilindi - o'zimiz bajaramiz
+                return await self.do(key, func)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.executions += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Hech kim kutmagan bo'lsa "exception was never retrieved" ogohlantirishi chiqmasin
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._in_flight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Birlashtirish metrikalari."""
+        requests = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+        }
@@ -0,0 +1,57 @@
+"""
+Rasm thumbnail'lari - process pool worker'larida ishlaydigan sof funksiyalar.
+
+Modul yengil saqlangan (faqat Pillow): `spawn` qilingan worker uni tez import qiladi.
+Pillow o'rnatilmagan bo'lsa thumbnail'lar yaratilmaydi, asl rasm saqlanaveradi.
+"""
+
+import os
+from typing import Dict, Iterable
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow ixtiyoriy
+    Image = None
+
+# Bitta rasm uchun maksimal piksel soni ("decompression bomb" himoyasi)
+MAX_IMAGE_PIXELS = 40_000_000
+
+
+def thumbnail_path(source: str, size: int) -> str:
+    """`ab/abcdef.jpg` -> `ab/abcdef_256.webp`."""
+    base, _ = os.path.splitext(source)
+    return f"{base}_{size}.webp"
+
+
+def make_thumbnails(source: str, sizes: Iterable[int]) -> Dict[int, str]:
+    """Kvadrat (markazdan kesilgan) WebP thumbnail'lar yaratish.
+
+    Rasm o'qilmasa - ValueError. Mavjud thumbnail qayta yaratilmaydi (kontent manzilli).
+    Qaytaradi: o'lcham -> fayl yo'li.
+    """
+    if Image is None:
+        return {}
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+    result = {}
+    try:
+        with Image.open(source) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            side = min(image.size)
+            left = (image.width - side) // 2
+            top = (image.height - side) // 2
+            square = image.crop((left, top, left + side, top + side))
+
+            for size in sorted(set(sizes), reverse=True):
+                target = thumbnail_path(source, size)
+                if not os.path.exists(target):
+                    thumb = square.resize((min(size, side),) * 2, Image.LANCZOS)
+                    tmp_path = f"{target}.tmp{os.getpid()}"
+                    thumb.save(tmp_path, "WEBP", quality=85, method=4)
+                    os.replace(tmp_path, target)
+                result[size] = target
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Rasmni o'qib bo'lmadi: {e}") from e
+    return result
@@ -23,10 +23,11 @@ from pydantic import BaseModel
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from fastapi import Request, status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from tortoise import Tortoise
 
 from config.tortoise_config import TORTOISE_ORM
+from app.core.serialization import FastJSONResponse, api_response
 
 
 # JWT va parol konfiguratsiyasi
@@ -444,16 +445,24 @@ class RateLimiter:
 
 
 class ResponseFormatter:
-    """API response formatlash."""
+    """API response formatlash.
+
+    success/paginated tayyor FastJSONResponse qaytaradi - body orjson bilan
+    bir marta bytes ga kodlanadi, FastAPI ning jsonable_encoder bosqichi o'tkazib yuboriladi.
+    `Accept: application/msgpack` so'rovlarida xuddi shu envelope MsgPackResponse bo'ladi.
+    """
     
     @staticmethod
-    def success(data: Any = None, message: str = "Success") -> Dict[str, Any]:
+    def success(data: Any = None, message: str = "Success", status_code: int = 200) -> Response:
         """Muvaffaqiyatli response."""
-        return {
-            "success": True,
-            "message": message,
-            "data": data
-        }
+        return api_response(
+            {
+                "success": True,
+                "message": message,
+                "data": data
+            },
+            status_code=status_code
+        )
     
     @staticmethod
     def error(message: str = "Error", error_code: str = None, details: Any = None) -> Dict[str, Any]:
@@ -469,20 +478,28 @@ class ResponseFormatter:
         return response
     
     @staticmethod
-    def paginated(data: List[Any], pagination: Dict[str, Any], message: str = "Success") -> Dict[str, Any]:
+    def paginated(
+        data: List[Any],
+        pagination: Dict[str, Any],
+        message: str = "Success",
+        status_code: int = 200
+    ) -> Response:
         """Pagination bilan response."""
-        return {
-            "success": True,
-            "message": message,
-            "data": data,
-            "pagination": pagination
-        }
+        return api_response(
+            {
+                "success": True,
+                "message": message,
+                "data": data,
+                "pagination": pagination
+            },
+            status_code=status_code
+        )
 
 
 # Global exception handler
 async def global_exception_handler(request: Request, exc: Exception):
     """Kutilmagan xatoliklar uchun global handler."""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ResponseFormatter.error("Kutilmagan xatolik yuz berdi", "INTERNAL_ERROR", str(exc)),
     )
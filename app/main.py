@@ -2,7 +2,7 @@
 FastAPI asosiy ilova - xavfsizlik, middleware va to'liq konfiguratsiya bilan.
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from starlette.middleware.sessions import SessionMiddleware
@@ -14,16 +14,48 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import uvicorn
+import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional
 from decouple import config
 
 from app.core.utils import global_exception_handler, ResponseFormatter
-from app.core.security import ALLOWED_ORIGINS, CSP_HEADER, limiter
-from app.api import user, auth
+from app.core.serialization import FastJSONResponse, negotiate_response_format
+from app.core.compression import CompressionMiddleware
+from app.core.cache import response_cache
+from app.core.idempotency import idempotency_store
+from app.services.user_loader import user_loader
+from app.services.user_availability import availability_index
+from app.services.leaderboard import leaderboard
+from app.services.media import MEDIA_ROOT, MEDIA_URL, thumbnail_pool
+from app.core.media_files import ContentAddressedFiles
+from app.services.user_purge import USER_PURGE_INTERVAL, purge_worker
+from app.services.user_stats import USER_STATS_RECONCILE_INTERVAL, reconcile_worker
+from app.services.webhooks import WEBHOOK_POLL_INTERVAL, webhook_dispatcher, webhook_worker
+from app.core.security import ALLOWED_ORIGINS, SecurityHeadersMiddleware, limiter
+from app.api import user, auth, batch, webhook
 from app.admin import setup_admin_panel
 from config.tortoise_config import TORTOISE_ORM
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Fon vazifalari (Tortoise ORM ulangandan keyin ishga tushadi)."""
+    background_tasks = [asyncio.create_task(leaderboard.ensure_loaded())]
+    if USER_PURGE_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(purge_worker(USER_PURGE_INTERVAL)))
+    if USER_STATS_RECONCILE_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(reconcile_worker(USER_STATS_RECONCILE_INTERVAL)))
+    if WEBHOOK_POLL_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(webhook_worker(WEBHOOK_POLL_INTERVAL)))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    thumbnail_pool.shutdown()
+    await webhook_dispatcher.aclose()
+
+
 # FastAPI ilova yaratish
 app = FastAPI(
     title="FastAPI + Tortoise ORM Template",
@@ -63,6 +95,9 @@ app = FastAPI(
         "name": "MIT License",
         "url": "https://opensource.org/licenses/MIT",
     },
+    # orjson asosidagi default response - stdlib json o'rniga
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # Rate limiting setup
@@ -73,23 +108,8 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 SECRET_KEY = config('SECRET_KEY', default='your-secret-key-change-it-in-production-please-use-strong-key')
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
-# Security Middleware
-@app.middleware("http")
-async def security_headers_middleware(request: Request, call_next):
-    """Xavfsizlik headerlarini qo'shish."""
-    response = await call_next(request)
-    
-    # Security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Content-Security-Policy"] = CSP_HEADER
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-    
-    return response
-
+# Security headerlari - pure ASGI (sendfile kengaytmalarini to'smaydi)
+app.add_middleware(SecurityHeadersMiddleware)
 
 # CORS middleware - faqat ruxsat berilgan domenlarga
 app.add_middleware(
@@ -98,7 +118,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count", "X-Page-Count"],
+    expose_headers=["X-Total-Count", "X-Page-Count", "X-Cache", "Idempotent-Replayed"],
 )
 
 # Trusted Host middleware
@@ -107,6 +127,12 @@ app.add_middleware(
     allowed_hosts=["localhost", "127.0.0.1", "*.example.com"]
 )
 
+# Response siqish (gzip, mavjud bo'lsa zstd/brotli) - eng tashqi qatlam
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config('COMPRESSION_MIN_SIZE', default=500, cast=int)
+)
+
 # Global exception handler
 app.add_exception_handler(Exception, global_exception_handler)
 
@@ -126,6 +152,23 @@ async def health_check():
     )
 
 
+# Metrikalar endpoint
+@app.get("/metrics", tags=["System"])
+async def metrics(current_user: dict = Depends(webhook.require_superuser)):
+    """Kesh va boshqa ichki metrikalar (faqat superuser)."""
+    return ResponseFormatter.success(
+        data={
+            "response_cache": response_cache.stats(),
+            "user_loader": user_loader.stats(),
+            "idempotency": idempotency_store.stats(),
+            "availability_bloom": availability_index.stats(),
+            "leaderboard": leaderboard.stats(),
+            "webhooks": webhook_dispatcher.stats(),
+        },
+        message="Tizim metrikalari"
+    )
+
+
 # Root endpoint
 @app.get("/", tags=["System"])
 async def root():
@@ -144,8 +187,12 @@ async def root():
 
 
 # API routerlarini qo'shish
-app.include_router(auth.router, prefix="/api/v1")
-app.include_router(user.router, prefix="/api/v1")
+# Accept: application/msgpack - barcha API routerlarida MessagePack javob
+api_dependencies = [Depends(negotiate_response_format)]
+app.include_router(auth.router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(user.router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(batch.router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(webhook.router, prefix="/api/v1", dependencies=api_dependencies)
 
 # 2FA Status API qo'shish
 from app.admin.status_api import router as status_router
@@ -154,6 +201,9 @@ app.include_router(status_router)
 # Admin panel ni ulash
 setup_admin_panel(app)
 
+# Profil rasmlari (kontent manzilli, immutable kesh, Range, sendfile)
+app.mount(MEDIA_URL.rstrip("/"), ContentAddressedFiles(directory=MEDIA_ROOT), name="media")
+
 
 # Custom OpenAPI schema
 def custom_openapi():
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Admin static fayllari uchun oldindan siqilgan (.gz/.br/.zst) variantlarni yaratish
+Foydalanish: python -m app.management.commands.compress_static [papka]
+"""
+
+import sys
+
+from app.core.compression import available_encodings, precompress_static_files
+
+
+STATIC_DIR = "app/admin/static"
+
+
+def main():
+    """Asosiy funksiya."""
+    directory = sys.argv[1] if len(sys.argv) > 1 else STATIC_DIR
+    
+    print(f"=== Static fayllarni siqish: {directory} ===")
+    print(f"Encoding'lar: {', '.join(available_encodings())}")
+    
+    created, skipped = precompress_static_files(directory)
+    
+    print(f"✅ Yaratildi: {created} ta variant")
+    print(f"⏩ O'zgarmagan: {skipped} ta variant")
+
+
+if __name__ == "__main__":
+    main()
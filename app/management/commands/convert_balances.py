@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+users.balance -> users.balance_minor onlayn konvertatsiyasi (ilova to'xtatilmaydi)
+Foydalanish: python -m app.management.commands.convert_balances [batch_size] [pauza_soniya]
+"""
+
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.services.balance_migration import BALANCE_CONVERT_BATCH_SIZE, convert_legacy_balances
+from config.tortoise_config import TORTOISE_ORM
+
+
+async def main():
+    """Asosiy funksiya."""
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else BALANCE_CONVERT_BATCH_SIZE
+    pause = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    print(f"=== Balanslarni minor unit'ga o'tkazish (batch: {batch_size}, pauza: {pause}s) ===")
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        converted = await convert_legacy_balances(batch_size=batch_size, pause=pause)
+        print(f"✅ {converted} ta qator konvertatsiya qilindi")
+    except Exception as e:
+        print(f"❌ Xatolik: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
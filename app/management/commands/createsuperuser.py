@@ -31,7 +31,7 @@ async def create_superuser():
                 continue
             
             # Username mavjudligini tekshirish
-            existing_user = await User.filter(username=username).first()
+            existing_user = await User.with_deleted().filter(username=username).first()
             if existing_user:
                 print(f"'{username}' username allaqachon mavjud!")
                 continue
@@ -50,7 +50,7 @@ async def create_superuser():
                 continue
             
             # Email mavjudligini tekshirish
-            existing_email = await User.filter(email=email).first()
+            existing_email = await User.with_deleted().filter(email=email).first()
             if existing_email:
                 print(f"'{email}' email allaqachon mavjud!")
                 continue
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Soft-delete qilingan userlarni saqlash muddatidan keyin butunlay o'chirish
+Foydalanish: python -m app.management.commands.purge_deleted_users [kunlar] [batch_size]
+"""
+
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.services.user_purge import USER_PURGE_BATCH_SIZE, USER_PURGE_RETENTION_DAYS, purge_deleted_users
+from config.tortoise_config import TORTOISE_ORM
+
+
+async def main():
+    """Asosiy funksiya."""
+    retention_days = int(sys.argv[1]) if len(sys.argv) > 1 else USER_PURGE_RETENTION_DAYS
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else USER_PURGE_BATCH_SIZE
+
+    print(f"=== {retention_days} kundan oldin o'chirilgan userlarni tozalash (batch: {batch_size}) ===")
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        counts = await purge_deleted_users(retention_days=retention_days, batch_size=batch_size)
+        for model_name, count in counts.items():
+            print(f"🧹 {model_name}: {count} ta qator o'chirildi")
+    except Exception as e:
+        print(f"❌ Xatolik: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Admin global qidiruv indeksini (admin_search_terms) qayta qurish
+Foydalanish: python -m app.management.commands.rebuild_admin_search
+"""
+
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.admin.autodiscovery import auto_register_models
+from app.services.admin_search import admin_search_index
+from config.tortoise_config import TORTOISE_ORM
+
+
+async def main():
+    """Asosiy funksiya."""
+    print("=== Admin qidiruv indeksini qayta qurish ===")
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        auto_register_models()
+        counts = await admin_search_index.rebuild()
+        for model_name, indexed in counts.items():
+            print(f"📊 {model_name}: {indexed} ta obyekt")
+        print("✅ Indeks qayta qurildi")
+    except Exception as e:
+        print(f"❌ Xatolik: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+User profil snapshot'larini qayta qurish (sxema o'zgargandan keyin)
+Foydalanish: python -m app.management.commands.rebuild_profile_snapshots [--all] [batch_size]
+"""
+
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.services.user_snapshot import PROFILE_SNAPSHOT_VERSION, REBUILD_BATCH_SIZE, rebuild_snapshots
+from config.tortoise_config import TORTOISE_ORM
+
+
+async def main():
+    """Asosiy funksiya."""
+    args = [arg for arg in sys.argv[1:] if arg != "--all"]
+    only_stale = "--all" not in sys.argv[1:]
+    batch_size = int(args[0]) if args else REBUILD_BATCH_SIZE
+
+    scope = "eskirgan" if only_stale else "barcha"
+    print(f"=== {scope} profil snapshot'larini qayta qurish (versiya: {PROFILE_SNAPSHOT_VERSION}, batch: {batch_size}) ===")
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        counts = await rebuild_snapshots(batch_size=batch_size, only_stale=only_stale)
+        print(f"✅ {counts['scanned']} ta user tekshirildi, {counts['rebuilt']} ta snapshot qayta qurildi")
+    except Exception as e:
+        print(f"❌ Xatolik: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Admin dashboard hisoblagichlarini (user_stats) haqiqiy qiymatlarga keltirish
+Foydalanish: python -m app.management.commands.reconcile_user_stats
+"""
+
+import asyncio
+import sys
+
+from tortoise import Tortoise
+
+from app.services.user_stats import get_dashboard_stats, reconcile_user_stats
+from config.tortoise_config import TORTOISE_ORM
+
+
+async def main():
+    """Asosiy funksiya."""
+    print("=== Dashboard statistikasi rekonsilyatsiyasi ===")
+
+    try:
+        await Tortoise.init(config=TORTOISE_ORM)
+        drift = await reconcile_user_stats()
+        if drift:
+            for key, delta in sorted(drift.items()):
+                print(f"🧹 {key}: {delta:+d}")
+        else:
+            print("✅ Hisoblagichlar to'g'ri")
+        print(f"📊 {await get_dashboard_stats()}")
+    except Exception as e:
+        print(f"❌ Xatolik: {e}")
+        sys.exit(1)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,7 +3,12 @@ Models package - Tortoise ORM modellari shu yerga yoziladi
 """
 from .user import User
 from .admin_security import AdminSecurity, DeviceBlock, PendingVerification, LoginAttempt
+from .ledger import LedgerEntry
+from .webhook import WebhookSubscription, WebhookOutbox, WebhookDeadLetter
+from .stats import UserStat
+from .search import AdminSearchTerm
 
-__all__ = ["User", "AdminSecurity", "DeviceBlock", "PendingVerification", "LoginAttempt"]
+__all__ = ["User", "AdminSecurity", "DeviceBlock", "PendingVerification", "LoginAttempt", "LedgerEntry",
+           "WebhookSubscription", "WebhookOutbox", "WebhookDeadLetter", "UserStat", "AdminSearchTerm"]
 
 __all__ = ["User", "Post", "Student"]
\ No newline at end of file
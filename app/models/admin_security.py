@@ -156,6 +156,8 @@ class LoginAttempt(Model):
     
     class Meta:
         table = "login_attempts"
+        # Dashboard grafiklari vaqt oralig'i bo'yicha guruhlaydi
+        indexes = (("created_at",),)
         
     def __str__(self):
         status_icons = {
@@ -0,0 +1,80 @@
+"""
+Qo'shimcha Tortoise ORM maydonlari.
+"""
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Optional
+
+from tortoise import fields
+
+
+class MoneyField(fields.DecimalField):
+    """Pul qiymati: bazada butun son (tiyin/sent - minor unit), Python'da `Decimal`.
+
+    `SUM`, oraliq filterlari va `ORDER BY` string cast'siz, indeks bilan ishlaydi.
+
+    Python'da berilgan `int` - asosiy birlik (`balance=500` - 500.00), faqat bazadan
+    kelgan `int` minor unit (`to_python_value`). Model'ga `MoneyModelMixin` qo'shilishi kerak:
+    Tortoise konstruktor va `update_from_dict` qiymatlarini ham `to_python_value` orqali o'tkazadi.
+    `F("balance") + x` kabi ifodalarda `x` minor unit'da bo'ladi - `to_minor(x)` bilan bering.
+    """
+
+    # BIGINT - drayverdan int keladi, har doim Decimal'ga aylantiriladi
+    skip_to_python_if_native = False
+
+    SQL_TYPE = "BIGINT"  # type: ignore[assignment]
+
+    class _db_sqlite:
+        SQL_TYPE = "BIGINT"
+
+    def __init__(self, max_digits: int = 18, decimal_places: int = 2, **kwargs: Any) -> None:
+        super().__init__(max_digits=max_digits, decimal_places=decimal_places, **kwargs)
+
+    def to_decimal(self, value: Any) -> Optional[Decimal]:
+        """Python qiymati (Decimal/str/int/float, asosiy birlikda) -> Decimal."""
+        if value is None:
+            return None
+        return Decimal(str(value)).quantize(self.quant, ROUND_HALF_EVEN)
+
+    def to_minor(self, value: Any) -> Optional[int]:
+        """Python qiymati (asosiy birlikda) -> minor unit (bank yaxlitlashi bilan)."""
+        if value is None:
+            return None
+        return int((Decimal(str(value)) * 10 ** self.decimal_places).to_integral_value(ROUND_HALF_EVEN))
+
+    def to_db_value(self, value: Any, instance: Any) -> Optional[int]:
+        self.validate(value)
+        return self.to_minor(value)
+
+    def to_python_value(self, value: Any) -> Optional[Decimal]:
+        """Bazadagi qiymat -> Decimal (`int` - minor unit)."""
+        if value is None:
+            return None
+        if isinstance(value, int):
+            return Decimal(value).scaleb(-self.decimal_places).quantize(self.quant)
+        return Decimal(str(value)).quantize(self.quant)
+
+
+class MoneyModelMixin:
+    """Python'da berilgan pul qiymatlari asosiy birlikda: `User(balance=500)` va
+    `user.update_from_dict({"balance": 500})` - 500.00.
+
+    Tortoise konstruktor va `update_from_dict` qiymatlarini `to_python_value` orqali o'tkazadi,
+    u esa `int` ni bazadan kelgan minor unit deb oladi - shuning uchun qiymatlar oldindan
+    Decimal qilinadi. Bazadan o'qish (`_init_from_db`, `values()`) bu yerdan o'tmaydi.
+    """
+
+    def _money_to_decimal(self, data: dict) -> dict:
+        fields_map = self._meta.fields_map
+        return {
+            key: field.to_decimal(value)
+            if isinstance(field := fields_map.get(key), MoneyField) and value is not None
+            else value
+            for key, value in data.items()
+        }
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**self._money_to_decimal(kwargs))
+
+    def update_from_dict(self, data: dict):
+        return super().update_from_dict(self._money_to_decimal(data))
@@ -0,0 +1,52 @@
+"""
+Balans ledger'i - faqat qo'shiladigan (append-only) yozuvlar jadvali.
+`User.balance` faqat ledger orqali (app/services/ledger.py) o'zgartiriladi.
+"""
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, Field
+from tortoise import fields
+from tortoise.exceptions import OperationalError
+from tortoise.models import Model
+
+from app.models.fields import MoneyField, MoneyModelMixin
+
+
+class LedgerEntry(MoneyModelMixin, Model):
+    """
+    Bitta balans harakati. Musbat amount - kirim, manfiy - chiqim.
+    Bir o'tkazmaning yozuvlari `transfer_id` bilan bog'lanadi va yig'indisi 0 ga teng.
+    """
+    id = fields.BigIntField(pk=True)
+    transfer_id = fields.UUIDField(db_index=True, description="Bir tranzaksiyadagi yozuvlar guruhi")
+    user = fields.ForeignKeyField(
+        'models.User', related_name='ledger_entries', null=True, on_delete=fields.SET_NULL
+    )
+    amount = MoneyField(source_field="amount_minor", description="Musbat - kirim, manfiy - chiqim")
+    kind = fields.CharField(max_length=20, description="transfer_in, transfer_out, adjustment")
+    description = fields.CharField(max_length=255, null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "ledger_entries"
+        # User tarixi (eng yangisi birinchi)
+        indexes = (("user_id", "id"),)
+
+    def __str__(self):
+        return f"{self.kind}: {self.amount}"
+
+    async def save(self, *args, **kwargs):
+        if self._saved_in_db:
+            raise OperationalError("Ledger yozuvlarini o'zgartirib bo'lmaydi")
+        await super().save(*args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        raise OperationalError("Ledger yozuvlarini o'chirib bo'lmaydi")
+
+
+# Pydantic schema: o'tkazma so'rovi
+class TransferIn(BaseModel):
+    to_user_id: int
+    amount: Decimal = Field(gt=0, max_digits=12, decimal_places=2)
+    description: Optional[str] = Field(default=None, max_length=255)
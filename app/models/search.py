@@ -0,0 +1,29 @@
+"""
+Admin global qidiruvi - inverted indeks (app/services/admin_search.py).
+"""
+from tortoise import fields
+from tortoise.models import Model
+
+
+class AdminSearchTerm(Model):
+    """
+    Bitta so'z -> bitta obyekt. `AdminConfig.search_fields` qiymatlaridan olinadi;
+    `weight` - maydon tartibi bo'yicha (birinchi search field eng og'ir).
+    """
+    id = fields.BigIntField(pk=True)
+    term = fields.CharField(max_length=64)
+    model = fields.CharField(max_length=64, description="Admin registry'dagi model nomi")
+    object_id = fields.CharField(max_length=64)
+    weight = fields.SmallIntField(default=1)
+
+    class Meta:
+        table = "admin_search_terms"
+        indexes = (
+            # Prefiks qidiruv: term >= ? AND term < ?
+            ("term", "model", "object_id"),
+            # Obyekt saqlanganda/o'chirilganda uning so'zlarini almashtirish
+            ("model", "object_id"),
+        )
+
+    def __str__(self):
+        return f"{self.term} -> {self.model}#{self.object_id}"
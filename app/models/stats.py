@@ -0,0 +1,20 @@
+"""
+Dashboard statistikasi - inkremental yangilanadigan hisoblagichlar (app/services/user_stats.py).
+"""
+from tortoise import fields
+from tortoise.models import Model
+
+
+class UserStat(Model):
+    """
+    Bitta hisoblagich: `total`, `active`, `superusers` yoki soatlik ro'yxatdan o'tishlar
+    (`signups:2026-10-19T13`). Qiymat `value = value + ?` bilan o'zgaradi.
+    """
+    key = fields.CharField(max_length=64, pk=True)
+    value = fields.BigIntField(default=0)
+
+    class Meta:
+        table = "user_stats"
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
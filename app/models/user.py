@@ -3,12 +3,73 @@
 # Tortoise ORM model: User
 
 from tortoise import fields
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.indexes import Index
+from tortoise.manager import Manager
 from tortoise.models import Model
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Any, Callable, List, Optional
 from datetime import datetime
+from decimal import Decimal
 
-class User(Model):
+from app.core.datetime_utils import utc_now
+from app.models.fields import MoneyField, MoneyModelMixin
+
+
+# API javoblariga chiqmaydigan maydonlar
+PROFILE_SNAPSHOT_FIELDS = ("profile_snapshot", "profile_snapshot_version")
+USER_PRIVATE_FIELDS = ("password_hash", "legacy_balance", *PROFILE_SNAPSHOT_FIELDS)
+
+# Bazadan o'qilgandagi qiymati eslab qolinadigan maydonlar (signal handler'lari o'zgarishni aniqlaydi)
+TRACKED_FIELDS = ("is_active", "is_superuser", "deleted_at")
+
+# User.save()/delete() o'z tranzaksiyasi commit bo'lgandan keyin chaqiriladigan funksiyalar
+_after_commit_hooks: List[Callable[["User"], Any]] = []
+
+
+def after_commit(func: Callable[["User"], Any]) -> Callable[["User"], Any]:
+    """`User.save()`/`delete()` commit'idan keyin chaqiriladigan (sync) funksiyani qo'shish.
+
+    Signal handler'lari tranzaksiya ichida ishlaydi; javoblar keshi kabi narsalar commit'dan
+    oldin tozalansa, parallel so'rov eski qatorni qayta keshlab qo'yishi mumkin.
+    Tashqi tranzaksiyada (`using_db=TransactionalDBClient`) saqlanganda chaqirilmaydi -
+    commit'ni boshqargan kod o'zi bajaradi (app/services/ledger.py, user_bulk.py kabi).
+    """
+    _after_commit_hooks.append(func)
+    return func
+
+
+class LiveUserManager(Manager):
+    """Standart scope - soft-delete qilingan (deleted_at to'ldirilgan) userlar yashiriladi."""
+
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ConditionalIndex(Index):
+    """WHERE shartli (partial) indeks - PostgreSQL va SQLite uchun."""
+
+    def __init__(self, *, fields: tuple, name: str, where: str) -> None:
+        super().__init__(fields=fields, name=name)
+        self.where = where
+        self.extra = f" WHERE {where}"
+
+    def get_sql(self, schema_generator, model, safe: bool) -> str:
+        # Maydon nomi emas, ustun nomi (source_field) bo'yicha
+        columns = [model._meta.fields_db_projection.get(name, name) for name in self.fields]
+        return schema_generator._get_index_sql(
+            model, columns, safe, index_name=self.name, index_type=self.INDEX_TYPE, extra=self.extra
+        )
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs["where"] = self.where
+        return path, args, kwargs
+
+
+class User(MoneyModelMixin, Model):
     """
     Foydalanuvchi modeli (User) - barcha Tortoise ORM fieldlarini namoyish qilish uchun
     """
@@ -21,7 +82,10 @@ class User(Model):
     is_active = fields.BooleanField(default=True)
     is_superuser = fields.BooleanField(default=False)
     age = fields.IntField(null=True)
-    balance = fields.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # Bazada butun tiyin/sent (balance_minor BIGINT), Python'da Decimal
+    balance = MoneyField(default=Decimal("0.00"), source_field="balance_minor")
+    # Eski ustun - faqat konvertatsiya qilinmagan qatorlar uchun o'qiladi (app/services/balance_migration.py)
+    legacy_balance = fields.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0.00"), source_field="balance")
     bio = fields.TextField(null=True)
     rating = fields.FloatField(null=True)
     birth_date = fields.DateField(null=True)
@@ -29,13 +93,81 @@ class User(Model):
     profile_picture = fields.CharField(max_length=500, null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)  # Soft delete vaqti
+    # Oldindan kodlangan profil JSON'i (app/services/user_snapshot.py)
+    profile_snapshot = fields.BinaryField(null=True)
+    profile_snapshot_version = fields.IntField(default=0)
 
     class Meta:
         table = "users"
+        # User.all()/filter()/get() faqat o'chirilmagan userlarni ko'radi
+        manager = LiveUserManager()
+        # Ro'yxat filter/ordering'lari uchun indekslar (app/api/user.py USER_FILTERS) -
+        # faqat "tirik" qatorlarni qamraydi
+        indexes = (
+            ConditionalIndex(fields=("created_at",), name="idx_users_created_live", where='"deleted_at" IS NULL'),
+            ConditionalIndex(fields=("rating",), name="idx_users_rating_live", where='"deleted_at" IS NULL'),
+            ConditionalIndex(fields=("balance",), name="idx_users_balance_live", where='"deleted_at" IS NULL'),
+            # /users/changes keyset sinxronizatsiyasi uchun (tombstone'lar ham kerak)
+            ("updated_at", "id"),
+            # Purge job uchun - faqat o'chirilgan qatorlar
+            ConditionalIndex(fields=("deleted_at",), name="idx_users_deleted_purge", where='"deleted_at" IS NOT NULL'),
+        )
 
     def __str__(self):
         return f"User: {self.username}"
 
+    @classmethod
+    def _init_from_db(cls, **kwargs):
+        instance = super()._init_from_db(**kwargs)
+        # balance_minor hali to'ldirilmagan qator - eski ustundan (keyingi save() minor unit'da yozadi)
+        if getattr(instance, "balance", 0) is None:
+            instance.balance = getattr(instance, "legacy_balance", None)
+        instance._remember_tracked()
+        return instance
+
+    def _remember_tracked(self) -> None:
+        # webhook `user.deactivated` va dashboard statistikasi deltalari uchun
+        self._loaded_values = {name: getattr(self, name, None) for name in TRACKED_FIELDS}
+
+    async def save(self, using_db=None, update_fields=None, force_create=False, force_update=False) -> None:
+        # post_save handler'lari (webhook outbox) user yozuvi bilan bitta tranzaksiyada
+        if isinstance(using_db, TransactionalDBClient):
+            await super().save(using_db, update_fields, force_create, force_update)
+        else:
+            async with in_transaction(self._meta.default_connection) as connection:
+                await super().save(connection, update_fields, force_create, force_update)
+            self._run_after_commit()
+        # post_save handler'lari eski qiymatlarni ko'rib bo'ldi
+        self._remember_tracked()
+
+    async def delete(self, using_db=None) -> None:
+        if isinstance(using_db, TransactionalDBClient):
+            await super().delete(using_db)
+            return
+        async with in_transaction(self._meta.default_connection) as connection:
+            await super().delete(connection)
+        self._run_after_commit()
+
+    def _run_after_commit(self) -> None:
+        for hook in _after_commit_hooks:
+            hook(self)
+
+    @classmethod
+    def with_deleted(cls) -> QuerySet:
+        """Soft-delete qilinganlarni ham o'z ichiga olgan queryset."""
+        return QuerySet(cls)
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+    async def soft_delete(self) -> None:
+        """Userni o'chirilgan deb belgilash (purge job keyinroq butunlay o'chiradi)."""
+        self.deleted_at = utc_now()
+        self.is_active = False
+        await self.save(update_fields=["deleted_at", "is_active", "updated_at"])
+
 # Pydantic schema: input uchun (user yaratish va yangilash)
 class UserCreateIn(BaseModel):
     username: str
@@ -0,0 +1,88 @@
+"""
+Webhook'lar - obunalar, yuborilmagan hodisalar (outbox) va yetkazib bo'lmaganlar (dead-letter).
+Outbox yozuvi `User` yozuvi bilan bitta tranzaksiyada qo'shiladi (app/services/webhooks.py).
+"""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+from tortoise import fields
+from tortoise.models import Model
+
+
+USER_CREATED = "user.created"
+USER_UPDATED = "user.updated"
+USER_DEACTIVATED = "user.deactivated"
+
+WEBHOOK_EVENTS = (USER_CREATED, USER_UPDATED, USER_DEACTIVATED)
+
+
+class WebhookSubscription(Model):
+    """
+    Tashqi tizim obunasi. Bitta URL'ga bir nechta hodisa bitta POST'da (batch) yuboriladi.
+    `retry_at` - keyingi yetkazish vaqti (xatolikdan keyin backoff, worker uchun lease).
+    """
+    id = fields.IntField(pk=True)
+    url = fields.CharField(max_length=500)
+    events = fields.CharField(max_length=255, description="Vergul bilan: user.created,user.updated,...")
+    secret = fields.CharField(max_length=64, description="X-Webhook-Signature (HMAC-SHA256) kaliti")
+    is_active = fields.BooleanField(default=True)
+    failures = fields.IntField(default=0, description="Ketma-ket muvaffaqiyatsiz yetkazishlar")
+    retry_at = fields.DatetimeField(null=True)
+    last_error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "webhook_subscriptions"
+
+    def __str__(self):
+        return f"Webhook: {self.url}"
+
+    @property
+    def event_list(self) -> List[str]:
+        return [event.strip() for event in self.events.split(",") if event.strip()]
+
+
+class WebhookOutbox(Model):
+    """Yuborilishi kutilayotgan hodisa (har bir obuna uchun alohida qator)."""
+    id = fields.BigIntField(pk=True)
+    subscription = fields.ForeignKeyField(
+        'models.WebhookSubscription', related_name='outbox', on_delete=fields.CASCADE
+    )
+    event = fields.CharField(max_length=32)
+    user_id = fields.IntField()
+    payload = fields.BinaryField(description="Oldindan kodlangan JSON")
+    attempts = fields.IntField(default=0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "webhook_outbox"
+        # Worker obuna bo'yicha eng eskisidan o'qiydi
+        indexes = (("subscription_id", "id"),)
+
+
+class WebhookDeadLetter(Model):
+    """Urinishlar tugagan hodisa - qo'lda ko'rib chiqish yoki qayta yuborish uchun."""
+    id = fields.BigIntField(pk=True)
+    subscription = fields.ForeignKeyField(
+        'models.WebhookSubscription', related_name='dead_letters', on_delete=fields.CASCADE
+    )
+    event_id = fields.BigIntField(description="Outbox'dagi id (qabul qiluvchi uchun dedup kaliti)")
+    event = fields.CharField(max_length=32)
+    user_id = fields.IntField()
+    payload = fields.BinaryField()
+    attempts = fields.IntField()
+    last_error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(description="Hodisa vaqti")
+    failed_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "webhook_dead_letters"
+        indexes = (("subscription_id", "event_id"),)
+
+
+# Pydantic schema: obuna yaratish
+class WebhookSubscriptionIn(BaseModel):
+    url: str = Field(max_length=500, pattern=r"^https?://")
+    events: List[str] = Field(default_factory=lambda: list(WEBHOOK_EVENTS), min_length=1)
+    secret: Optional[str] = Field(default=None, min_length=16, max_length=64)
@@ -0,0 +1,139 @@
+"""
+Admin dashboard grafiklari - ro'yxatdan o'tishlar va login urinishlari (soatlik / kunlik).
+
+- Har bir seriya - bitta `GROUP BY bucket` so'rovi (`created_at` indeksi bo'yicha oraliq)
+- Yopilgan bucket'lar (joriy soat/kundan oldingilari) o'zgarmaydi - jarayon xotirasida
+  doimiy keshlanadi; keyingi so'rovlarda faqat joriy bucket qayta hisoblanadi
+- Oynadan chiqib ketgan bucket'lar keshdan o'chiriladi
+- Ro'yxatdan o'tishlar soft-delete qilingan userlarni ham sanaydi (`User.with_deleted()`):
+  aks holda o'tgan kunlar soni o'chirishdan keyin o'zgarib, worker keshlariga qarab farq qiladi
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from tortoise import Tortoise
+from tortoise.expressions import RawSQL
+from tortoise.functions import Count
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+from app.core.datetime_utils import make_aware, utc_now
+from app.models.admin_security import LoginAttempt
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Granularity:
+    step: timedelta
+    buckets: int
+    # Bucket kaliti: Python, SQLite va PostgreSQL formatlari bir xil satr beradi
+    python_format: str
+    sqlite_format: str
+    postgres_format: str
+
+
+GRANULARITIES: Dict[str, Granularity] = {
+    "hour": Granularity(timedelta(hours=1), 48, "%Y-%m-%dT%H", "%Y-%m-%dT%H", 'YYYY-MM-DD"T"HH24'),
+    "day": Granularity(timedelta(days=1), 30, "%Y-%m-%d", "%Y-%m-%d", "YYYY-MM-DD"),
+}
+
+# Seriya nomi -> asosiy queryset (`created_at` bo'yicha sanaladi)
+SERIES: Dict[str, Callable[[], QuerySet]] = {
+    "signups": User.with_deleted,
+    "logins": LoginAttempt.all,
+}
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """`moment` tushgan bucket boshi (UTC)."""
+    moment = make_aware(moment).astimezone(timezone.utc)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_key(moment: datetime, granularity: str) -> str:
+    return bucket_start(moment, granularity).strftime(GRANULARITIES[granularity].python_format)
+
+
+def bucket_keys(now: datetime, granularity: str) -> List[str]:
+    """Oynadagi bucket kalitlari - eskisidan joriysigacha."""
+    spec = GRANULARITIES[granularity]
+    current = bucket_start(now, granularity)
+    return [
+        (current - spec.step * offset).strftime(spec.python_format)
+        for offset in range(spec.buckets - 1, -1, -1)
+    ]
+
+
+def _bucket_expression(model: Type[Model], granularity: str) -> RawSQL:
+    spec = GRANULARITIES[granularity]
+    dialect = Tortoise.get_connection(model._meta.default_connection).capabilities.dialect
+    if dialect == "postgres":
+        return RawSQL(f"""to_char("created_at" AT TIME ZONE 'UTC', '{spec.postgres_format}')""")
+    return RawSQL(f"""strftime('{spec.sqlite_format}', "created_at")""")
+
+
+async def count_by_bucket(query: QuerySet, granularity: str, since: datetime) -> Dict[str, int]:
+    """Bitta `GROUP BY` so'rovi: `since` dan boshlab har bir bucket'dagi qatorlar soni."""
+    rows = await (
+        query.filter(created_at__gte=since)
+        .annotate(bucket=_bucket_expression(query.model, granularity))
+        .annotate(count=Count("id"))
+        .group_by("bucket")
+        .values("bucket", "count")
+    )
+    return {row["bucket"]: row["count"] for row in rows}
+
+
+class ActivityCharts:
+    """Yopilgan bucket'lar keshi bilan grafik ma'lumotlari."""
+
+    def __init__(self):
+        # (seriya, granularity) -> {bucket: soni} - faqat yopilgan bucket'lar
+        self._closed: Dict[Tuple[str, str], Dict[str, int]] = {}
+        # (seriya, granularity) -> shu vaqtgacha bo'lgan bucket'lar keshda
+        self._closed_until: Dict[Tuple[str, str], datetime] = {}
+
+    def clear(self) -> None:
+        self._closed.clear()
+        self._closed_until.clear()
+
+    async def series(self, name: str, granularity: str, now: Optional[datetime] = None) -> List[int]:
+        """Oyna bo'yicha qiymatlar (`bucket_keys` tartibida)."""
+        now = now or utc_now()
+        spec = GRANULARITIES[granularity]
+        current = bucket_start(now, granularity)
+        window_start = current - spec.step * (spec.buckets - 1)
+        cache_key = (name, granularity)
+
+        closed = self._closed.setdefault(cache_key, {})
+        cached_until = self._closed_until.get(cache_key)
+        # Keshlanmagan eng eski bucket'dan (odatda - faqat joriy bucket'dan) so'raladi
+        since = window_start if cached_until is None or cached_until < window_start else cached_until
+        counts = await count_by_bucket(SERIES[name](), granularity, since)
+
+        current_key = current.strftime(spec.python_format)
+        keys = bucket_keys(now, granularity)
+        for key in keys:
+            if key < current_key and key >= since.strftime(spec.python_format):
+                closed[key] = counts.get(key, 0)
+        for key in [key for key in closed if key < keys[0]]:
+            del closed[key]
+        self._closed_until[cache_key] = current
+
+        return [closed.get(key, 0) if key < current_key else counts.get(key, 0) for key in keys]
+
+    async def chart(self, granularity: str, now: Optional[datetime] = None) -> Dict:
+        """Dashboard uchun JSON: `labels` va har bir seriya qiymatlari."""
+        now = now or utc_now()
+        return {
+            "granularity": granularity,
+            "labels": bucket_keys(now, granularity),
+            "series": {name: await self.series(name, granularity, now) for name in SERIES},
+        }
+
+
+activity_charts = ActivityCharts()
@@ -0,0 +1,255 @@
+"""
+Admin global qidiruvi - barcha ro'yxatdan o'tgan model'lar bo'yicha inverted indeks.
+
+- So'zlar `AdminConfig.search_fields` qiymatlaridan olinadi va `admin_search_terms`
+  jadvalida saqlanadi (barcha worker'lar uchun bitta indeks)
+- Obyekt saqlanganda/o'chirilganda (post_save/post_delete, o'sha tranzaksiya ichida)
+  faqat uning so'zlari almashtiriladi; search field'lar o'zgarmagan `update_fields`
+  saqlashlari indeksga tegmaydi
+- Qidiruv - bitta SQL so'rovi: har bir so'z uchun prefiks-oraliq (`term >= ? AND term < ?`),
+  ballar va "barcha so'zlar mos kelgan" sharti bazada hisoblanadi, har bir model uchun
+  faqat `per_model` ta natija qaytadi (Python'ga indeks qatorlari o'qilmaydi)
+- Tez o'sadigan jadvallar (`AdminConfig.global_search=False`) indekslanmaydi
+- Signalsiz o'zgarishlardan (`QuerySet.update()`) keyin:
+  `python -m app.management.commands.rebuild_admin_search`
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from tortoise import Tortoise
+from tortoise.models import Model
+from tortoise.signals import Signals
+from tortoise.transactions import in_transaction
+
+from app.admin.registry import AdminConfig, AdminRegistry, admin_registry
+from app.models.search import AdminSearchTerm
+
+
+TERM_MAX_LENGTH = 64
+# Bundan qisqa so'rov so'zlari e'tiborsiz qoldiriladi (1-2 harfli prefiks indeksning
+# katta qismiga mos keladi)
+MIN_QUERY_TERM_LENGTH = 3
+MAX_QUERY_TERMS = 5
+# Prefiks oralig'ining yuqori chegarasi (eng katta Unicode belgisi)
+_PREFIX_END = chr(0x10FFFF)
+# To'liq mos kelgan so'z prefiks mosligidan shuncha marta og'irroq
+EXACT_MATCH_BONUS = 3
+
+REBUILD_BATCH_SIZE = 2000
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(value: Any) -> Set[str]:
+    """Qiymatdagi so'zlar (registrsiz). `john_doe@mail.uz` -> john, doe, mail, uz."""
+    if value is None:
+        return set()
+    return {word[:TERM_MAX_LENGTH] for word in _WORD.findall(str(value).casefold())}
+
+
+def document_terms(config: AdminConfig, values: Dict[str, Any]) -> Dict[str, int]:
+    """Obyekt so'zlari va og'irliklari - birinchi search field eng og'ir."""
+    terms: Dict[str, int] = {}
+    for position, field in enumerate(config.search_fields):
+        weight = len(config.search_fields) - position
+        for term in tokenize(values.get(field)):
+            terms[term] = max(terms.get(term, 0), weight)
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    terms = sorted(term for term in tokenize(query) if len(term) >= MIN_QUERY_TERM_LENGTH)
+    return terms[:MAX_QUERY_TERMS]
+
+
+# Har bir so'z uchun obyektning eng yaxshi bali; so'zlar bo'yicha yig'indi, faqat barcha
+# so'zlar mos kelganlar; model ichida ball bo'yicha o'rin va jami natijalar soni.
+# SQLite (3.25+) va PostgreSQL'da bir xil ishlaydi
+_TERM_SQL = (
+    'SELECT "model", "object_id", MAX("weight" * CASE WHEN "term" = {exact} THEN {bonus} ELSE 1 END) AS "score" '
+    'FROM "admin_search_terms" WHERE "term" >= {start} AND "term" < {end} AND "model" IN ({models}) '
+    'GROUP BY "model", "object_id"'
+)
+_SEARCH_SQL = (
+    'SELECT "model", "object_id", "score", "total" FROM ('
+    'SELECT "model", "object_id", SUM("score") AS "score", '
+    'ROW_NUMBER() OVER (PARTITION BY "model" ORDER BY SUM("score") DESC, "object_id") AS "position", '
+    'COUNT(*) OVER (PARTITION BY "model") AS "total" '
+    'FROM ({matches}) AS "matches" GROUP BY "model", "object_id" HAVING COUNT(*) = {terms}'
+    ') AS "ranked" WHERE "position" <= {per_model} ORDER BY "score" DESC, "model", "object_id"'
+)
+
+
+def search_sql(terms: List[str], models: List[str], per_model: int, dialect: str) -> Tuple[str, List[Any]]:
+    """Qidiruv so'rovi va parametrlari."""
+    params: List[Any] = []
+
+    def param(value: Any) -> str:
+        params.append(value)
+        return f"${len(params)}" if dialect == "postgres" else "?"
+
+    matches = " UNION ALL ".join(
+        _TERM_SQL.format(
+            exact=param(term),
+            bonus=EXACT_MATCH_BONUS,
+            start=param(term),
+            end=param(term + _PREFIX_END),
+            models=", ".join(param(model) for model in models),
+        )
+        for term in terms
+    )
+    sql = _SEARCH_SQL.format(matches=matches, terms=param(len(terms)), per_model=param(per_model))
+    return sql, params
+
+
+class AdminSearchIndex:
+    """Admin registry asosidagi inverted indeks."""
+
+    def __init__(self, registry: AdminRegistry):
+        self.registry = registry
+        self._connected: Set[type] = set()
+
+    def searchable(self) -> Dict[str, AdminConfig]:
+        return {
+            name: config
+            for name, config in self.registry.get_registered_models().items()
+            if config.search_fields and config.global_search and config.model is not AdminSearchTerm
+        }
+
+    def _config_for(self, model: type) -> Optional[Tuple[str, AdminConfig]]:
+        for name, config in self.searchable().items():
+            if config.model is model:
+                return name, config
+        return None
+
+    def connect(self) -> None:
+        """Qidiriladigan model'larga post_save/post_delete signallarini ulash."""
+        for config in self.searchable().values():
+            if config.model in self._connected:
+                continue
+            config.model.register_listener(Signals.post_save, self._on_save)
+            config.model.register_listener(Signals.post_delete, self._on_delete)
+            self._connected.add(config.model)
+
+    async def index_object(self, model_name: str, config: AdminConfig, instance: Model, using_db=None) -> None:
+        """Obyekt so'zlarini almashtirish (soft-delete qilingan bo'lsa - faqat o'chirish)."""
+        object_id = str(instance.pk)
+        await AdminSearchTerm.filter(model=model_name, object_id=object_id).using_db(using_db).delete()
+        if getattr(instance, "deleted_at", None) is not None:
+            return
+        values = {field: getattr(instance, field, None) for field in config.search_fields}
+        terms = document_terms(config, values)
+        if terms:
+            await AdminSearchTerm.bulk_create(
+                [
+                    AdminSearchTerm(term=term, model=model_name, object_id=object_id, weight=weight)
+                    for term, weight in terms.items()
+                ],
+                using_db=using_db,
+            )
+
+    async def _on_save(self, sender, instance, created, using_db, update_fields):
+        found = self._config_for(sender)
+        if found is None:
+            return
+        model_name, config = found
+        if update_fields and not {*config.search_fields, "deleted_at"} & set(update_fields):
+            return
+        await self.index_object(model_name, config, instance, using_db)
+
+    async def _on_delete(self, sender, instance, using_db):
+        found = self._config_for(sender)
+        if found is None:
+            return
+        model_name, _ = found
+        await self.remove(model_name, [instance.pk], using_db)
+
+    async def remove(self, model_name: str, object_ids: Iterable[Any], using_db=None) -> None:
+        """Obyektlarni indeksdan chiqarish (signalsiz bulk o'chirishlardan keyin ham)."""
+        object_ids = [str(object_id) for object_id in object_ids]
+        if object_ids:
+            await AdminSearchTerm.filter(model=model_name, object_id__in=object_ids).using_db(using_db).delete()
+
+    async def rebuild(self) -> Dict[str, int]:
+        """Indeksni bazadan qayta qurish. Qaytaradi: model -> indekslangan obyektlar soni."""
+        counts: Dict[str, int] = {}
+        for model_name, config in self.searchable().items():
+            model = config.model
+            pk = model._meta.pk_attr
+            async with in_transaction() as connection:
+                await AdminSearchTerm.filter(model=model_name).using_db(connection).delete()
+                indexed = 0
+                last_pk = None
+                while True:
+                    query = model.all().using_db(connection).order_by(pk).limit(REBUILD_BATCH_SIZE)
+                    if last_pk is not None:
+                        query = query.filter(**{f"{pk}__gt": last_pk})
+                    rows = await query.values(pk, *config.search_fields)
+                    if not rows:
+                        break
+                    batch = [
+                        AdminSearchTerm(term=term, model=model_name, object_id=str(row[pk]), weight=weight)
+                        for row in rows
+                        for term, weight in document_terms(config, row).items()
+                    ]
+                    if batch:
+                        await AdminSearchTerm.bulk_create(batch, using_db=connection)
+                    indexed += len(rows)
+                    last_pk = rows[-1][pk]
+            counts[model_name] = indexed
+        return counts
+
+    async def search(self, query: str, per_model: int = 10) -> List[Dict[str, Any]]:
+        """Ballar bo'yicha saralangan, model bo'yicha guruhlangan natijalar."""
+        terms = query_terms(query)
+        searchable = self.searchable()
+        if not terms or not searchable:
+            return []
+
+        connection = Tortoise.get_connection(AdminSearchTerm._meta.default_connection)
+        sql, params = search_sql(terms, sorted(searchable), per_model, connection.capabilities.dialect)
+        _, rows = await connection.execute_query(sql, params)
+
+        by_model: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        totals: Dict[str, int] = {}
+        for row in rows:
+            by_model[row["model"]].append((int(row["score"]), row["object_id"]))
+            totals[row["model"]] = int(row["total"])
+
+        groups = []
+        for model_name, top in by_model.items():
+            config = searchable[model_name]
+            labels = await self._labels(config, [object_id for _, object_id in top])
+            results = [
+                {"id": object_id, "label": labels[object_id], "score": score}
+                for score, object_id in top
+                if object_id in labels
+            ]
+            if results:
+                groups.append({
+                    "model": model_name,
+                    "name": config.name_plural,
+                    "icon": config.icon,
+                    "total": totals[model_name],
+                    "results": results,
+                })
+        groups.sort(key=lambda group: -group["results"][0]["score"])
+        return groups
+
+    @staticmethod
+    async def _labels(config: AdminConfig, object_ids: List[str]) -> Dict[str, str]:
+        """Natija sarlavhalari - search field qiymatlari (bitta so'rov)."""
+        pk = config.model._meta.pk_attr
+        pk_field = config.model._meta.fields_map[pk]
+        ids = [pk_field.to_python_value(object_id) for object_id in object_ids]
+        rows = await config.model.filter(**{f"{pk}__in": ids}).values(pk, *config.search_fields)
+        return {
+            str(row[pk]): " · ".join(str(row[field]) for field in config.search_fields if row[field]) or str(row[pk])
+            for row in rows
+        }
+
+
+# Global instance
+admin_search_index = AdminSearchIndex(admin_registry)
@@ -0,0 +1,82 @@
+"""
+`users.balance` (VARCHAR/DECIMAL) -> `users.balance_minor` (BIGINT) onlayn konvertatsiyasi.
+
+Migratsiya faqat bo'sh (NULL) ustun qo'shadi - jadval qayta yozilmaydi. Qatorlar
+`convert_legacy_balances()` bilan kichik batch'larda (har biri alohida qisqa tranzaksiya)
+to'ldiriladi, ilova esa ishlashda davom etadi:
+- to'ldirilmagan qator o'qilganda `User.balance` eski ustundan (`legacy_balance`) olinadi
+  va keyingi `save()` uni minor unit'da yozadi
+- ledger o'zi tegadigan qatorlarni `balance_minor + ?` dan oldin konvertatsiya qiladi
+
+Konvertatsiya tugagach eski `balance` ustuni keyingi migratsiyada olib tashlanishi mumkin.
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.models.user import User
+
+
+BALANCE_CONVERT_BATCH_SIZE = 1000
+
+# SQLite va PostgreSQL'da bir xil ishlaydi (eski ustun - 2 xonali kasr)
+_CONVERT_SQL = (
+    'UPDATE "users" SET "balance_minor" = CAST(ROUND(CAST("balance" AS NUMERIC) * 100) AS BIGINT) '
+    'WHERE "balance_minor" IS NULL AND "id" IN ({ids})'
+)
+
+# None - hali tekshirilmagan; False - konvertatsiya qilinmagan qator qolmagan
+_pending: Optional[bool] = None
+
+
+def _connection(using_db: Optional[BaseDBAsyncClient] = None) -> BaseDBAsyncClient:
+    return using_db or Tortoise.get_connection(User._meta.default_connection)
+
+
+async def legacy_balances_pending(using_db: Optional[BaseDBAsyncClient] = None) -> bool:
+    """Konvertatsiya qilinmagan qatorlar bormi (yo'q bo'lsa - qayta tekshirilmaydi)."""
+    global _pending
+    if _pending is False:
+        return False
+    _pending = await User.with_deleted().using_db(using_db).filter(balance__isnull=True).exists()
+    return _pending
+
+
+async def convert_users(user_ids: Iterable[int], using_db: Optional[BaseDBAsyncClient] = None) -> int:
+    """Berilgan userlar balansini konvertatsiya qilish (allaqachon o'tkazilganlar o'zgarmaydi)."""
+    ids = [int(user_id) for user_id in user_ids]
+    if not ids:
+        return 0
+    sql = _CONVERT_SQL.format(ids=", ".join(str(user_id) for user_id in ids))
+    rows, _ = await _connection(using_db).execute_query(sql)
+    return rows
+
+
+async def convert_legacy_balances(
+    batch_size: int = BALANCE_CONVERT_BATCH_SIZE,
+    pause: float = 0.0,
+    max_batches: Optional[int] = None,
+) -> int:
+    """NULL qatorlarni id bo'yicha batch'lab konvertatsiya qilish. Qaytaradi: qatorlar soni."""
+    global _pending
+    converted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        user_ids = await (
+            User.with_deleted()
+            .filter(balance__isnull=True)
+            .order_by("id")
+            .limit(batch_size)
+            .values_list("id", flat=True)
+        )
+        if not user_ids:
+            _pending = False
+            break
+        converted += await convert_users(user_ids)
+        batches += 1
+        # Boshqa so'rovlarga navbat berish
+        await asyncio.sleep(pause)
+    return converted
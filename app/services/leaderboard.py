@@ -0,0 +1,161 @@
+"""
+Reyting leaderboard'i - xotiradagi order-statistic indeks.
+
+- Ilova ishga tushganda `idx_users_rating_live` indeksi bo'yicha (rating DESC, id) tartibida
+  keyset bo'laklari bilan to'ldiriladi
+- Har bir `User.save()` / `delete()` da inkremental yangilanadi (post_save/post_delete)
+- Top-k - indeksning boshidagi k ta kalit, userning o'rni - `rank()`
+- Reytingi yo'q va soft-delete qilingan userlar qatnashmaydi
+
+Kalit `(-rating, id)`: o'suvchi tartib = leaderboard tartibi, teng reytingda kichik id oldinda.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from decouple import config
+from tortoise.expressions import Q
+from tortoise.signals import post_delete, post_save
+
+from app.core.ranking import OrderStatisticIndex
+from app.models.user import User
+
+
+# Bir so'rovda qaytariladigan maksimal o'rinlar soni
+LEADERBOARD_MAX_LIMIT = config('LEADERBOARD_MAX_LIMIT', default=100, cast=int)
+
+# Yuklashda bir so'rovda o'qiladigan qatorlar soni
+SEED_BATCH_SIZE = 5000
+
+RankKey = Tuple[float, int]
+
+
+def rank_key(user_id: int, rating: Optional[float], deleted: bool = False) -> Optional[RankKey]:
+    """User'ning indeks kaliti (leaderboard'da qatnashmasa - None)."""
+    if rating is None or rating == "" or deleted:
+        return None
+    # Admin formasidan string kelishi mumkin
+    return (-float(rating), user_id)
+
+
+class Leaderboard:
+    """Reyting bo'yicha tartiblangan userlar."""
+
+    def __init__(self):
+        self._index: Optional[OrderStatisticIndex] = None
+        self._keys: Dict[int, RankKey] = {}
+        self._lock = asyncio.Lock()
+        self._building = False
+        self._pending: Dict[int, Optional[RankKey]] = {}
+
+        # Metrikalar
+        self.seeds = 0
+        self.updates = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index is not None
+
+    async def ensure_loaded(self) -> None:
+        """Indeks hali yuklanmagan bo'lsa - yuklash."""
+        if self._index is not None:
+            return
+        async with self._lock:
+            if self._index is None:
+                await self.seed()
+
+    async def seed(self) -> None:
+        """Indeksni bazadan (rating DESC, id) keyset bo'laklari bilan qurish."""
+        self._building = True
+        self._pending = {}
+        try:
+            index = OrderStatisticIndex()
+            keys: Dict[int, RankKey] = {}
+            last: Optional[Tuple[float, int]] = None
+            while True:
+                queryset = User.filter(rating__isnull=False)
+                if last is not None:
+                    queryset = queryset.filter(
+                        Q(rating__lt=last[0]) | Q(rating=last[0], id__gt=last[1])
+                    )
+                rows = await (
+                    queryset.order_by("-rating", "id")
+                    .limit(SEED_BATCH_SIZE)
+                    .values_list("id", "rating")
+                )
+                if not rows:
+                    break
+                # Yuklash paytida reytingi o'zgarib ikkinchi marta kelgan user o'tkazib yuboriladi -
+                # yakuniy qiymat `_pending` dan olinadi
+                batch = [(-rating, user_id) for user_id, rating in rows if user_id not in keys]
+                index.extend_sorted(batch)
+                keys.update((key[1], key) for key in batch)
+                last = (rows[-1][1], rows[-1][0])
+
+            self._index, self._keys = index, keys
+            # Yuklash paytidagi yozuvlar
+            for user_id, key in self._pending.items():
+                self._apply(user_id, key)
+            self.seeds += 1
+        finally:
+            self._building = False
+            self._pending = {}
+
+    def _apply(self, user_id: int, key: Optional[RankKey]) -> None:
+        old = self._keys.get(user_id)
+        if old == key:
+            return
+        if old is not None:
+            self._index.remove(old)
+            del self._keys[user_id]
+        if key is not None:
+            self._index.add(key)
+            self._keys[user_id] = key
+        self.updates += 1
+
+    def update(self, user_id: int, key: Optional[RankKey]) -> None:
+        """User kalitini yangilash (None - leaderboard'dan chiqarish)."""
+        if self._building:
+            self._pending[user_id] = key
+        if self._index is not None:
+            self._apply(user_id, key)
+
+    def top(self, limit: int, offset: int = 0) -> List[Tuple[int, int, float]]:
+        """(o'rin, user_id, rating) ro'yxati."""
+        keys = self._index.slice(offset, offset + limit)
+        return [(offset + i + 1, user_id, -negative) for i, (negative, user_id) in enumerate(keys)]
+
+    def rank_of(self, user_id: int) -> Optional[Tuple[int, float]]:
+        """User'ning o'rni (1 dan) va reytingi; qatnashmasa - None."""
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        return self._index.rank(key) + 1, -key[0]
+
+    def __len__(self) -> int:
+        return len(self._index) if self._index is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Leaderboard metrikalari."""
+        return {
+            "loaded": self.is_loaded,
+            "entries": len(self),
+            "seeds": self.seeds,
+            "updates": self.updates,
+        }
+
+
+# Global instance
+leaderboard = Leaderboard()
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    """Reyting (yoki soft-delete) o'zgarsa indeksni yangilash."""
+    leaderboard.update(instance.id, rank_key(instance.id, instance.rating, instance.is_deleted))
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance, using_db):
+    """O'chirilgan userni leaderboard'dan chiqarish."""
+    leaderboard.update(instance.id, None)
@@ -0,0 +1,175 @@
+"""
+Balans ledger'i - atomik o'tkazmalar.
+
+- Har bir harakat `ledger_entries` ga yoziladi (faqat qo'shiladi, o'zgartirilmaydi)
+- `users.balance_minor` read-modify-write `save()` bilan emas, `balance_minor = balance_minor + ?`
+  UPDATE bilan (butun tiyin/sent) o'zgaradi - parallel o'tkazmalarda yangilanish yo'qolmaydi
+- Bitta `post_entries()` chaqiruvi - bitta tranzaksiya: barcha yozuvlar bitta INSERT bilan,
+  har bir user balansi bitta UPDATE bilan (deltalar yig'ilib), manfiy balans bo'lsa - rollback
+- UPDATE signal chaqirmaydi: `updated_at` (/users/changes) va `user.updated` webhook hodisalari
+  o'sha tranzaksiyada, kesh va profil snapshot'lari commit'dan keyin qo'lda yangilanadi
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from app.core.datetime_utils import utc_now
+from app.models.ledger import LedgerEntry
+from app.models.user import User
+from app.models.webhook import USER_UPDATED
+from app.services.balance_migration import convert_users, legacy_balances_pending
+from app.services.user_cache import invalidate_user
+from app.services.user_snapshot import refresh_snapshots
+from app.services.webhooks import record_user_events
+
+
+TRANSFER_IN = "transfer_in"
+TRANSFER_OUT = "transfer_out"
+ADJUSTMENT = "adjustment"
+
+# Pul qiymatlari aniqligi (User.balance decimal_places=2)
+CENT = Decimal("0.01")
+
+# `F("balance") + x` da x minor unit'da (tiyin/sent) bo'lishi kerak
+BALANCE_FIELD = User._meta.fields_map["balance"]
+
+
+class LedgerError(Exception):
+    """Ledger amali bajarilmadi (tranzaksiya bekor qilingan)."""
+
+
+class InsufficientFunds(LedgerError):
+    """Balans yetarli emas."""
+
+    def __init__(self, user_ids: List[int]):
+        super().__init__(f"Balans yetarli emas: {user_ids}")
+        self.user_ids = user_ids
+
+
+@dataclass
+class Posting:
+    """Bitta balans harakati (musbat - kirim, manfiy - chiqim)."""
+    user_id: int
+    amount: Decimal
+    kind: str = ADJUSTMENT
+    description: Optional[str] = None
+
+
+def to_money(value) -> Decimal:
+    """Qiymatni 2 xonali Decimal'ga aylantirish (ortiqcha aniqlik - xato)."""
+    amount = Decimal(str(value))
+    if amount != amount.quantize(CENT):
+        raise LedgerError("Summa ko'pi bilan 2 xonali kasr bo'lishi kerak")
+    return amount.quantize(CENT)
+
+
+async def post_entries(
+    postings: Iterable[Posting],
+    transfer_id: Optional[uuid.UUID] = None,
+    allow_negative: bool = False,
+) -> uuid.UUID:
+    """Harakatlarni bitta tranzaksiyada yozish va balanslarni atomik o'zgartirish.
+
+    Qaytaradi: yozuvlar guruhining `transfer_id` si.
+    """
+    postings = list(postings)
+    if not postings:
+        raise LedgerError("Bo'sh o'tkazma")
+    transfer_id = transfer_id or uuid.uuid4()
+
+    deltas: Dict[int, Decimal] = defaultdict(Decimal)
+    for posting in postings:
+        deltas[posting.user_id] += to_money(posting.amount)
+
+    async with in_transaction() as connection:
+        now = utc_now()
+        # balance_minor hali to'ldirilmagan qatorlar (onlayn konvertatsiya davri)
+        if await legacy_balances_pending(connection):
+            await convert_users(deltas, using_db=connection)
+
+        # Deadlock bo'lmasligi uchun qatorlar doim bir xil (id) tartibda qulflanadi
+        for user_id in sorted(deltas):
+            delta = deltas[user_id]
+            if not delta:
+                continue
+            updated = await (
+                User.filter(id=user_id, is_active=True)
+                .using_db(connection)
+                .update(balance=F("balance") + BALANCE_FIELD.to_minor(delta), updated_at=now)
+            )
+            if not updated:
+                raise LedgerError(f"Foydalanuvchi topilmadi yoki faol emas: {user_id}")
+
+        if not allow_negative:
+            debited = [user_id for user_id, delta in deltas.items() if delta < 0]
+            if debited:
+                # Butun sonli ustun - taqqoslash bazada, cast'siz
+                overdrawn = await (
+                    User.filter(id__in=debited, balance__lt=Decimal(0))
+                    .using_db(connection)
+                    .order_by("id")
+                    .values_list("id", flat=True)
+                )
+                if overdrawn:
+                    raise InsufficientFunds(list(overdrawn))
+
+        await record_user_events(
+            USER_UPDATED, [user_id for user_id, delta in deltas.items() if delta], using_db=connection
+        )
+
+        await LedgerEntry.bulk_create(
+            [
+                LedgerEntry(
+                    transfer_id=transfer_id,
+                    user_id=posting.user_id,
+                    amount=to_money(posting.amount),
+                    kind=posting.kind,
+                    description=posting.description,
+                )
+                for posting in postings
+            ],
+            using_db=connection,
+        )
+
+    for user_id in deltas:
+        invalidate_user(user_id)
+    await refresh_snapshots(deltas)
+    return transfer_id
+
+
+async def transfer(
+    from_user_id: int,
+    to_user_id: int,
+    amount,
+    description: Optional[str] = None,
+) -> uuid.UUID:
+    """Bir userdan ikkinchisiga o'tkazma (ikki yozuv, bitta tranzaksiya)."""
+    amount = to_money(amount)
+    if amount <= 0:
+        raise LedgerError("Summa musbat bo'lishi kerak")
+    if from_user_id == to_user_id:
+        raise LedgerError("O'zingizga o'tkazma qilib bo'lmaydi")
+
+    return await post_entries([
+        Posting(from_user_id, -amount, TRANSFER_OUT, description),
+        Posting(to_user_id, amount, TRANSFER_IN, description),
+    ])
+
+
+async def post_batch(
+    postings: Iterable[Posting],
+    batch_size: int = 500,
+    allow_negative: bool = False,
+) -> List[uuid.UUID]:
+    """Ko'p harakatlarni `batch_size` talik tranzaksiyalarda yozish (masalan, ommaviy bonus)."""
+    postings = list(postings)
+    return [
+        await post_entries(postings[start:start + batch_size], allow_negative=allow_negative)
+        for start in range(0, len(postings), batch_size)
+    ]
@@ -0,0 +1,180 @@
+"""
+Profil rasmlarini saqlash - oqimli yuklash va kontent manzilli (content-addressed) fayllar.
+
+- So'rov body'si chunk-ma-chunk diskka yoziladi, xotirada butun rasm saqlanmaydi
+- SHA-256 yozish bilan birga hisoblanadi; fayl `avatars/ab/<sha256>.<ext>` ga ko'chiriladi,
+  bir xil rasm ikkinchi marta saqlanmaydi
+- Thumbnail'lar (Pillow) process pool'da yaratiladi - event loop bloklanmaydi
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+import anyio
+from decouple import config
+
+from app.core import thumbnails
+from app.core.thumbnails import make_thumbnails, thumbnail_path
+
+
+MEDIA_ROOT = config('MEDIA_ROOT', default='media')
+MEDIA_URL = config('MEDIA_URL', default='/media/')
+MEDIA_MAX_UPLOAD_BYTES = config('MEDIA_MAX_UPLOAD_BYTES', default=5 * 1024 * 1024, cast=int)
+THUMBNAIL_SIZES = [int(size) for size in config('THUMBNAIL_SIZES', default='64,256').split(',') if size.strip()]
+MEDIA_PROCESS_WORKERS = config('MEDIA_PROCESS_WORKERS', default=2, cast=int)
+
+AVATARS_DIR = "avatars"
+
+# Fayl boshidagi "magic" baytlar bo'yicha format (Content-Type'ga ishonilmaydi)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+class MediaError(ValueError):
+    """Yuklangan fayl qabul qilinmadi."""
+
+
+class MediaTooLarge(MediaError):
+    """Fayl hajmi chegaradan oshdi."""
+
+
+@dataclass
+class StoredImage:
+    """Saqlangan rasm."""
+    path: str  # MEDIA_ROOT ga nisbatan
+    sha256: str
+    size: int
+    deduplicated: bool
+    thumbnails: Dict[int, str]
+
+    @property
+    def url(self) -> str:
+        return media_url(self.path)
+
+
+def media_url(path: Optional[str]) -> Optional[str]:
+    """Nisbiy yo'ldan URL."""
+    return f"{MEDIA_URL}{path}" if path else None
+
+
+def thumbnail_urls(path: Optional[str], sizes: List[int] = THUMBNAIL_SIZES) -> Dict[int, str]:
+    """Saqlangan rasm uchun thumbnail URL'lari."""
+    if not path:
+        return {}
+    return {size: media_url(thumbnail_path(path, size)) for size in sizes}
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """Birinchi baytlardan rasm kengaytmasi."""
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class ThumbnailPool:
+    """Thumbnail'lar uchun lazy process pool (ilova yopilganda `shutdown`)."""
+
+    def __init__(self, workers: int = MEDIA_PROCESS_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn - event loop va DB ulanishlari bor jarayonni fork qilmaslik uchun
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def make(self, source: str, sizes: List[int]) -> Dict[int, str]:
+        if not sizes or thumbnails.Image is None:
+            # Pillow yo'q - worker ishga tushirilmaydi
+            return {}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), make_thumbnails, source, sizes)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+thumbnail_pool = ThumbnailPool()
+
+
+async def store_image(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int = MEDIA_MAX_UPLOAD_BYTES,
+    root: str = MEDIA_ROOT,
+) -> StoredImage:
+    """Oqimni diskka yozish, hash bo'yicha dedup qilish va thumbnail'lar yaratish."""
+    upload_dir = os.path.join(root, AVATARS_DIR, ".uploads")
+    await anyio.to_thread.run_sync(lambda: os.makedirs(upload_dir, exist_ok=True))
+    tmp_path = os.path.join(upload_dir, uuid.uuid4().hex)
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as tmp_file:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise MediaTooLarge(f"Fayl hajmi {max_bytes} baytdan oshmasligi kerak")
+                if len(head) < 16:
+                    head += chunk[:16]
+                digest.update(chunk)
+                await tmp_file.write(chunk)
+
+        extension = sniff_image_type(head)
+        if extension is None:
+            raise MediaError("Faqat JPEG, PNG, GIF yoki WebP rasm yuklash mumkin")
+
+        sha256 = digest.hexdigest()
+        path = os.path.join(AVATARS_DIR, sha256[:2], f"{sha256}.{extension}")
+        full_path = os.path.join(root, path)
+        deduplicated = await anyio.to_thread.run_sync(_move_into_place, tmp_path, full_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    try:
+        created = await thumbnail_pool.make(full_path, THUMBNAIL_SIZES)
+    except ValueError as e:
+        # Buzilgan rasm - faqat shu yuklash yaratgan faylni o'chirish
+        if not deduplicated:
+            os.unlink(full_path)
+        raise MediaError(str(e)) from e
+
+    return StoredImage(
+        path=path,
+        sha256=sha256,
+        size=size,
+        deduplicated=deduplicated,
+        thumbnails={size: os.path.relpath(thumb, root) for size, thumb in created.items()},
+    )
+
+
+def _move_into_place(tmp_path: str, full_path: str) -> bool:
+    """Vaqtinchalik faylni kontent manziliga ko'chirish. Qaytaradi: fayl allaqachon bormidi."""
+    if os.path.exists(full_path):
+        return True
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    os.replace(tmp_path, full_path)
+    return False
@@ -0,0 +1,153 @@
+"""
+Username/email bandligini tekshirish - bloom filter + indeksli tasdiqlash.
+
+- Bloom filter'da yo'q qiymat aniq bo'sh - bazaga so'rov yuborilmaydi
+- Bloom "bor" desa - unique indeks bo'yicha `exists()` bilan tasdiqlanadi
+- Filter birinchi murojaatda quriladi va har bir `User.save()` da to'ldiriladi
+- Soft-delete qilingan userlar ham hisobga olinadi (unique qiymat purge'gacha band)
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from decouple import config
+from tortoise.signals import post_save
+
+from app.core.bloom import BloomFilter
+from app.models.user import User
+
+
+AVAILABILITY_BLOOM_CAPACITY = config('AVAILABILITY_BLOOM_CAPACITY', default=100000, cast=int)
+AVAILABILITY_BLOOM_ERROR_RATE = config('AVAILABILITY_BLOOM_ERROR_RATE', default=0.01, cast=float)
+
+# Qayta qurishda bir so'rovda o'qiladigan qatorlar soni
+REBUILD_BATCH_SIZE = 5000
+
+
+def normalize(value: str) -> str:
+    """Bloom filter kaliti - bo'shliqsiz va registrsiz."""
+    return value.strip().casefold()
+
+
+class AvailabilityIndex:
+    """Username va email'lar uchun ikki bloom filter."""
+
+    def __init__(self, capacity: int = AVAILABILITY_BLOOM_CAPACITY, error_rate: float = AVAILABILITY_BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.usernames: Optional[BloomFilter] = None
+        self.emails: Optional[BloomFilter] = None
+        self._lock = asyncio.Lock()
+        self._building = False
+        self._pending: List[Tuple[str, str]] = []
+
+        # Metrikalar
+        self.checks = 0
+        self.db_skipped = 0
+        self.db_confirmed = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    async def ensure_loaded(self) -> None:
+        """Filter hali qurilmagan (yoki to'lib ketgan) bo'lsa - qurish."""
+        if self.usernames is not None:
+            return
+        async with self._lock:
+            if self.usernames is None:
+                await self.rebuild()
+
+    async def rebuild(self) -> None:
+        """Filterlarni bazadan (id bo'yicha bo'laklab) qayta qurish."""
+        self._building = True
+        self._pending = []
+        try:
+            total = await User.with_deleted().count()
+            capacity = max(self.capacity, total * 2)
+            usernames = BloomFilter(capacity, self.error_rate)
+            emails = BloomFilter(capacity, self.error_rate)
+
+            last_id = 0
+            while True:
+                rows = await (
+                    User.with_deleted().filter(id__gt=last_id)
+                    .order_by("id")
+                    .limit(REBUILD_BATCH_SIZE)
+                    .values_list("id", "username", "email")
+                )
+                if not rows:
+                    break
+                for _, username, email in rows:
+                    usernames.add(normalize(username))
+                    emails.add(normalize(email))
+                last_id = rows[-1][0]
+
+            # Qurish paytida yozilgan userlar
+            for username, email in self._pending:
+                usernames.add(normalize(username))
+                emails.add(normalize(email))
+
+            self.usernames, self.emails = usernames, emails
+            self.rebuilds += 1
+        finally:
+            self._building = False
+            self._pending = []
+
+    def add_user(self, username: str, email: str) -> None:
+        """Yangi yoki o'zgargan user qiymatlarini qo'shish (inkremental)."""
+        if self._building:
+            self._pending.append((username, email))
+        if self.usernames is None:
+            return
+        self.usernames.add(normalize(username))
+        self.emails.add(normalize(email))
+        if self.usernames.is_saturated:
+            # Keyingi tekshiruvda kattaroq sig'im bilan qayta quriladi
+            self.usernames = self.emails = None
+
+    async def _is_available(self, bloom_name: str, field: str, value: str) -> bool:
+        bloom = getattr(self, bloom_name)
+        while bloom is None:
+            await self.ensure_loaded()
+            bloom = getattr(self, bloom_name)
+
+        self.checks += 1
+        if normalize(value) not in bloom:
+            self.db_skipped += 1
+            return True
+
+        self.db_confirmed += 1
+        taken = await User.with_deleted().filter(**{field: value}).exists()
+        if not taken:
+            self.false_positives += 1
+        return not taken
+
+    async def is_username_available(self, username: str) -> bool:
+        """Username bo'shmi."""
+        return await self._is_available("usernames", "username", username)
+
+    async def is_email_available(self, email: str) -> bool:
+        """Email bo'shmi."""
+        return await self._is_available("emails", "email", email)
+
+    def stats(self) -> Dict[str, Any]:
+        """Bloom filter metrikalari."""
+        return {
+            "loaded": self.usernames is not None,
+            "entries": self.usernames.count if self.usernames is not None else 0,
+            "capacity": self.usernames.capacity if self.usernames is not None else self.capacity,
+            "checks": self.checks,
+            "db_skipped": self.db_skipped,
+            "db_confirmed": self.db_confirmed,
+            "false_positives": self.false_positives,
+            "rebuilds": self.rebuilds,
+        }
+
+
+# Global instance
+availability_index = AvailabilityIndex()
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    """Yangi username/email'ni filterga qo'shish."""
+    availability_index.add_user(instance.username, instance.email)
@@ -0,0 +1,73 @@
+"""
+Userlarni ommaviy o'zgartirish (admin bulk action'lari) - bitta `UPDATE ... WHERE id IN`, bitta tranzaksiya.
+
+`QuerySet.update()` signal chaqirmaydi, shuning uchun signallar qiladigan ishlar shu yerda:
+- dashboard hisoblagichlari, webhook hodisalari, admin qidiruv indeksi - o'sha tranzaksiyada
+- javoblar keshi, profil snapshot'lari, leaderboard - commit'dan keyin
+username/email o'zgarmaydi - availability bloom filter'ga tegilmaydi.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.core.datetime_utils import utc_now
+from app.models.user import TRACKED_FIELDS, User
+from app.models.webhook import USER_DEACTIVATED, USER_UPDATED
+from app.services.leaderboard import leaderboard
+from app.services.user_cache import invalidate_user
+from app.services.user_snapshot import refresh_snapshots
+from app.services.user_stats import apply_deltas, contribution, diff
+from app.services.webhooks import record_user_events
+
+
+async def _bulk_update(query: QuerySet, changes: Dict[str, Any]) -> List[int]:
+    """`changes` ni hali shunday bo'lmagan userlarga qo'llash. Qaytaradi: o'zgargan id'lar."""
+    # admin_search -> app.admin.registry -> app.admin -> actions -> shu modul: aylanma import
+    from app.services.admin_search import admin_search_index
+
+    async with in_transaction(User._meta.default_connection) as connection:
+        rows = await query.using_db(connection).values("id", "created_at", *TRACKED_FIELDS)
+        rows = [row for row in rows if any(row[field] != value for field, value in changes.items())]
+        if not rows:
+            return []
+        user_ids = [row["id"] for row in rows]
+
+        await User.filter(id__in=user_ids).using_db(connection).update(**changes, updated_at=utc_now())
+
+        deltas: Dict[str, int] = defaultdict(int)
+        events: Dict[str, List[int]] = defaultdict(list)
+        for row in rows:
+            before = contribution(row, row["created_at"])
+            after = contribution({**row, **changes}, row["created_at"])
+            for key, delta in diff(before, after).items():
+                deltas[key] += delta
+            # user_event() bilan bir xil: faol user faolsizlantirilsa (soft-delete ham) - deactivated
+            deactivated = row["is_active"] and changes.get("is_active") is False
+            events[USER_DEACTIVATED if deactivated else USER_UPDATED].append(row["id"])
+
+        await apply_deltas({key: delta for key, delta in deltas.items() if delta}, using_db=connection)
+        for event, ids in events.items():
+            await record_user_events(event, ids, using_db=connection)
+        if changes.get("deleted_at") is not None:
+            await admin_search_index.remove("user", user_ids, using_db=connection)
+
+    for user_id in user_ids:
+        invalidate_user(user_id)
+    if changes.get("deleted_at") is not None:
+        for user_id in user_ids:
+            leaderboard.update(user_id, None)
+    await refresh_snapshots(user_ids)
+    return user_ids
+
+
+async def set_users_active(query: QuerySet, is_active: bool) -> int:
+    """Userlarni faollashtirish / faolsizlantirish. Qaytaradi: o'zgargan userlar soni."""
+    return len(await _bulk_update(query, {"is_active": is_active}))
+
+
+async def soft_delete_users(query: QuerySet) -> int:
+    """Userlarni o'chirilgan deb belgilash (`User.soft_delete()` kabi, purge job keyinroq o'chiradi)."""
+    return len(await _bulk_update(query, {"deleted_at": utc_now(), "is_active": False}))
@@ -0,0 +1,31 @@
+"""
+User javoblari keshi uchun tag'lar va invalidatsiya signallari.
+
+API, admin panel (`model_edit_submit` ham) va boshqa joylardagi barcha
+`User.save()` / `User.delete()` chaqiruvlari tegishli kesh yozuvlarini commit'dan
+keyin bekor qiladi (`after_commit`): post_save signali tranzaksiya ichida ishlaydi va
+undan keyin, commit'gacha kelgan so'rov eski qatorni qayta keshlab qo'yishi mumkin edi.
+"""
+
+from app.core.cache import response_cache
+from app.models.user import User, after_commit
+
+
+# Ro'yxat sahifalari har qanday user o'zgarishiga bog'liq
+USERS_LIST_TAG = "users:list"
+
+
+def user_tag(user_id: int) -> str:
+    """Bitta user javoblari uchun tag."""
+    return f"user:{user_id}"
+
+
+def invalidate_user(user_id: int) -> int:
+    """User va ro'yxat sahifalari keshini bekor qilish."""
+    return response_cache.invalidate_tags(user_tag(user_id), USERS_LIST_TAG)
+
+
+@after_commit
+def _user_committed(instance: User) -> None:
+    """User saqlangan yoki o'chirilgan tranzaksiya commit bo'lgach keshni tozalash."""
+    invalidate_user(instance.id)
@@ -0,0 +1,74 @@
+"""
+User'larni id bo'yicha batch yuklash.
+
+Bir tick ichidagi barcha `user_loader.load(id)` chaqiruvlari
+bitta `User.filter(id__in=[...])` so'roviga birlashtiriladi.
+
+- Har bir chaqiruvchi User'ning o'z nusxasini oladi (`store_snapshot` kabi
+  o'zgartirishlar boshqa so'rovlarga o'tmaydi)
+- Batch'lar ulanish bo'yicha ajratiladi: tranzaksiya ichidagi chaqiruvlar (masalan /batch)
+  faqat o'sha tranzaksiyada, qolganlari asosiy ulanishda o'qiladi - boshqa so'rovning
+  userlari uning tranzaksiyasidan o'qilmaydi
+"""
+
+import copy
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional
+from weakref import WeakKeyDictionary
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.core.dataloader import DataLoader
+from app.models.user import User
+
+
+async def fetch_users_by_ids(user_ids: List[int], using_db: Optional[BaseDBAsyncClient] = None) -> Dict[int, User]:
+    """Id'lar bo'yicha userlarni bitta `IN` so'rovi bilan olish."""
+    users = await User.filter(id__in=user_ids).using_db(using_db)
+    return {user.id: user for user in users}
+
+
+def copy_user(user: User) -> User:
+    """Chaqiruvchi uchun alohida instance (bazaga qayta murojaatsiz)."""
+    clone = copy.copy(user)
+    clone._loaded_values = dict(user._loaded_values)
+    return clone
+
+
+class UserLoader:
+    """Joriy ulanish (asosiy yoki tranzaksiya) bo'yicha alohida DataLoader'lar."""
+
+    def __init__(self):
+        self._loaders: "WeakKeyDictionary[BaseDBAsyncClient, DataLoader[int, User]]" = WeakKeyDictionary()
+
+    def _loader(self) -> DataLoader:
+        connection = Tortoise.get_connection(User._meta.default_connection)
+        loader = self._loaders.get(connection)
+        if loader is None:
+            loader = DataLoader(partial(fetch_users_by_ids, using_db=connection), clone=copy_user)
+            self._loaders[connection] = loader
+        return loader
+
+    async def load(self, user_id: int) -> Optional[User]:
+        return await self._loader().load(user_id)
+
+    async def load_many(self, user_ids: Iterable[int]) -> List[Optional[User]]:
+        return await self._loader().load_many(user_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hozir mavjud loader'lar bo'yicha umumiy batch metrikalari."""
+        loads = sum(loader.loads for loader in self._loaders.values())
+        batches = sum(loader.batches for loader in self._loaders.values())
+        keys_fetched = sum(loader.keys_fetched for loader in self._loaders.values())
+        return {
+            "loads": loads,
+            "batches": batches,
+            "keys_fetched": keys_fetched,
+            "avg_batch_size": round(keys_fetched / batches, 2) if batches else 0.0,
+        }
+
+
+# Global loader - natijalar keshlanmaydi va har bir chaqiruvchi nusxa oladi,
+# shuning uchun so'rovlar orasida bo'lishish xavfsiz
+user_loader = UserLoader()
@@ -0,0 +1,75 @@
+"""
+Soft-delete qilingan userlarni saqlash muddatidan keyin butunlay o'chirish.
+
+Har bir batch bitta tranzaksiyada: avval bog'liq yozuvlar (LoginAttempt, DeviceBlock,
+PendingVerification, AdminSecurity), keyin userlarning o'zi.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Dict, Optional
+
+from decouple import config
+from tortoise.transactions import in_transaction
+
+from app.core.datetime_utils import utc_now
+from app.models.admin_security import AdminSecurity, DeviceBlock, LoginAttempt, PendingVerification
+from app.models.user import User
+
+
+USER_PURGE_RETENTION_DAYS = config('USER_PURGE_RETENTION_DAYS', default=30, cast=int)
+USER_PURGE_BATCH_SIZE = config('USER_PURGE_BATCH_SIZE', default=500, cast=int)
+# 0 - fon vazifasi o'chirilgan (faqat management command orqali)
+USER_PURGE_INTERVAL = config('USER_PURGE_INTERVAL', default=3600, cast=int)
+
+# Userdan oldin o'chiriladigan bog'liq modellar
+DEPENDENT_MODELS = (LoginAttempt, DeviceBlock, PendingVerification, AdminSecurity)
+
+
+async def purge_deleted_users(
+    retention_days: int = USER_PURGE_RETENTION_DAYS,
+    batch_size: int = USER_PURGE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """`deleted_at` saqlash muddatidan oshgan userlarni batch'lab o'chirish.
+
+    Qaytaradi: model nomi bo'yicha o'chirilgan qatorlar soni.
+    """
+    cutoff = utc_now() - timedelta(days=retention_days)
+    counts = {model.__name__: 0 for model in (*DEPENDENT_MODELS, User)}
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        # idx_users_deleted_purge (WHERE deleted_at IS NOT NULL) bo'yicha
+        user_ids = await (
+            User.with_deleted()
+            .filter(deleted_at__lt=cutoff)
+            .order_by("id")
+            .limit(batch_size)
+            .values_list("id", flat=True)
+        )
+        if not user_ids:
+            break
+
+        async with in_transaction():
+            for model in DEPENDENT_MODELS:
+                counts[model.__name__] += await model.filter(user_id__in=user_ids).delete()
+            counts[User.__name__] += await User.with_deleted().filter(id__in=user_ids).delete()
+
+        batches += 1
+        # Boshqa so'rovlarga navbat berish
+        await asyncio.sleep(0)
+
+    return counts
+
+
+async def purge_worker(interval: int = USER_PURGE_INTERVAL) -> None:
+    """Fon vazifasi: har `interval` soniyada purge ishga tushadi."""
+    while True:
+        try:
+            counts = await purge_deleted_users()
+            if counts[User.__name__]:
+                print(f"🧹 Purge: {counts}")
+        except Exception as e:
+            print(f"❌ Purge xatoligi: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,107 @@
+"""
+Oldindan kodlangan profil snapshot'lari - `GET /users/{id}` uchun serializatsiyasiz o'qish.
+
+- Snapshot `User_Pydantic` JSON'i bilan bir xil, `users.profile_snapshot` ustunida saqlanadi
+- Har bir `User.save()` dan keyin (post_save) qayta hisoblanadi
+- Versiya sxemadan olinadi: maydonlar o'zgarsa eski snapshot'lar avtomatik eskiradi
+  va `rebuild_profile_snapshots` buyrug'i bilan qayta quriladi
+- `QuerySet.update()` signal chaqirmaydi - bunday joylarda `refresh_snapshots()` ishlatiladi
+"""
+
+import copy
+import zlib
+from typing import Dict, Iterable
+
+from tortoise import fields
+from tortoise.contrib.pydantic import pydantic_model_creator
+from tortoise.signals import post_save
+
+from app.core.serialization import dumps
+from app.models.fields import MoneyField
+from app.models.user import User, USER_PRIVATE_FIELDS
+
+
+# app/api/user.py dagi User_Pydantic bilan bir xil model
+ProfileSnapshot_Pydantic = pydantic_model_creator(User, name="User", exclude=USER_PRIVATE_FIELDS)
+
+# Sxema o'zgarsa versiya ham o'zgaradi (IntField'ga sig'ishi uchun 31 bit)
+PROFILE_SNAPSHOT_VERSION = zlib.crc32(dumps(ProfileSnapshot_Pydantic.model_json_schema())) & 0x7FFFFFFF
+
+# Qayta qurishda bir so'rovda o'qiladigan qatorlar soni
+REBUILD_BATCH_SIZE = 500
+
+
+def snapshot_is_fresh(user: User) -> bool:
+    """Saqlangan snapshot joriy sxemaga mosmi."""
+    return user.profile_snapshot is not None and user.profile_snapshot_version == PROFILE_SNAPSHOT_VERSION
+
+
+async def build_snapshot(user: User) -> bytes:
+    """User'ning profil JSON'ini hisoblash (`user` o'zgartirilmaydi)."""
+    # Yangi yaratilgan obyektda default qiymatlar (balance=0.00 float) bazadan o'qilgandek
+    # bo'lsin - nusxada, chaqiruvchining obyekti o'zgarmasligi uchun
+    view = copy.copy(user)
+    for name, field in user._meta.fields_map.items():
+        if isinstance(field, MoneyField):
+            # to_python_value int'ni bazadagi minor unit deb oladi - bu yerda Python qiymati
+            setattr(view, name, field.to_decimal(getattr(user, name)))
+        elif isinstance(field, fields.DecimalField):
+            setattr(view, name, field.to_python_value(getattr(user, name)))
+    return dumps(await ProfileSnapshot_Pydantic.from_tortoise_orm(view))
+
+
+async def store_snapshot(user: User, using_db=None) -> bytes:
+    """Snapshot'ni hisoblab saqlash.
+
+    `save()` emas, to'g'ridan-to'g'ri UPDATE - signal va `updated_at` (auto_now) qayta ishlamaydi.
+    """
+    snapshot = await build_snapshot(user)
+    await (
+        User.with_deleted()
+        .filter(id=user.id)
+        .using_db(using_db)
+        .update(profile_snapshot=snapshot, profile_snapshot_version=PROFILE_SNAPSHOT_VERSION)
+    )
+    user.profile_snapshot = snapshot
+    user.profile_snapshot_version = PROFILE_SNAPSHOT_VERSION
+    return snapshot
+
+
+async def refresh_snapshots(user_ids: Iterable[int]) -> int:
+    """Signalsiz (bulk) yangilangan userlar snapshot'larini qayta qurish."""
+    users = await User.with_deleted().filter(id__in=list(user_ids))
+    for user in users:
+        await store_snapshot(user)
+    return len(users)
+
+
+async def rebuild_snapshots(
+    batch_size: int = REBUILD_BATCH_SIZE,
+    only_stale: bool = True,
+) -> Dict[str, int]:
+    """Barcha (yoki faqat eskirgan) snapshot'larni id bo'yicha bo'laklab qayta qurish."""
+    counts = {"scanned": 0, "rebuilt": 0}
+    last_id = 0
+    while True:
+        users = await (
+            User.with_deleted().filter(id__gt=last_id)
+            .order_by("id")
+            .limit(batch_size)
+        )
+        if not users:
+            break
+        for user in users:
+            counts["scanned"] += 1
+            if only_stale and snapshot_is_fresh(user):
+                continue
+            await store_snapshot(user)
+            counts["rebuilt"] += 1
+        last_id = users[-1].id
+    return counts
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    """Har bir saqlashdan keyin snapshot'ni yangilash."""
+    # Javoblar keshi commit'dan keyin tozalanadi (app/services/user_cache.py)
+    await store_snapshot(instance, using_db=using_db)
@@ -0,0 +1,194 @@
+"""
+Admin dashboard statistikasi - `user_stats` jadvalidagi inkremental hisoblagichlar.
+
+- Har bir `User.save()` / `delete()` da (post_save/post_delete, user tranzaksiyasi ichida)
+  faqat o'zgargan hisoblagichlar bitta upsert bilan `value = value + delta` qilinadi
+- "Oxirgi 7 kun" - soatlik `signups:YYYY-MM-DDTHH` hisoblagichlari yig'indisi (≤169 qator)
+- Dashboard jadval hajmidan qat'i nazar doimiy narxda: bitta kichik SELECT
+- `reconcile_user_stats()` bitta shartli-agregat so'rov bilan haqiqiy qiymatlarni hisoblab
+  hisoblagichlarni tuzatadi (signalsiz `QuerySet.update()` va qo'lda o'zgarishlardan keyin ham)
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Mapping, Optional
+
+from decouple import config
+from tortoise import Tortoise
+from tortoise.expressions import Q
+from tortoise.functions import Count
+from tortoise.signals import post_delete, post_save
+from tortoise.transactions import in_transaction
+
+from app.core.datetime_utils import make_aware, utc_now
+from app.models.stats import UserStat
+from app.models.user import TRACKED_FIELDS, User
+
+
+# 0 - fon rekonsilyatsiyasi o'chirilgan (faqat management command orqali)
+USER_STATS_RECONCILE_INTERVAL = config('USER_STATS_RECONCILE_INTERVAL', default=600, cast=int)
+
+TOTAL = "total"
+ACTIVE = "active"
+SUPERUSERS = "superusers"
+RECONCILED_AT = "reconciled_at"
+SIGNUP_PREFIX = "signups:"
+
+# Dashboard oynasi va soatlik hisoblagichlar saqlanadigan muddat
+NEW_USERS_WINDOW = timedelta(days=7)
+SIGNUP_RETENTION = timedelta(days=8)
+
+# SQLite (3.24+) va PostgreSQL'da bir xil ishlaydi
+_UPSERT_SQL = (
+    'INSERT INTO "user_stats" ("key", "value") VALUES {rows} '
+    'ON CONFLICT ("key") DO UPDATE SET "value" = "user_stats"."value" + excluded."value"'
+)
+
+
+def signup_key(created_at: datetime) -> str:
+    """Ro'yxatdan o'tish soati hisoblagichi (UTC)."""
+    return SIGNUP_PREFIX + make_aware(created_at).astimezone(timezone.utc).strftime("%Y-%m-%dT%H")
+
+
+def contribution(values: Mapping, created_at: Optional[datetime]) -> Dict[str, int]:
+    """Bitta userning hisoblagichlarga qo'shadigan hissasi (soft-delete qilingan - hech narsa)."""
+    if values.get("deleted_at") is not None:
+        return {}
+    counters = {
+        TOTAL: 1,
+        ACTIVE: int(bool(values.get("is_active"))),
+        SUPERUSERS: int(bool(values.get("is_superuser"))),
+    }
+    if created_at is not None:
+        counters[signup_key(created_at)] = 1
+    return counters
+
+
+def diff(before: Mapping[str, int], after: Mapping[str, int]) -> Dict[str, int]:
+    """Nol bo'lmagan deltalar."""
+    deltas = {key: after.get(key, 0) - before.get(key, 0) for key in {*before, *after}}
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _connection(using_db=None):
+    return using_db or Tortoise.get_connection(UserStat._meta.default_connection)
+
+
+async def apply_deltas(deltas: Mapping[str, int], using_db=None) -> None:
+    """Hisoblagichlarni atomik o'zgartirish (bitta so'rov, parallel yozishlarda ham to'g'ri)."""
+    if not deltas:
+        return
+    connection = _connection(using_db)
+    # Deadlock bo'lmasligi uchun kalitlar doim bir xil tartibda
+    keys = sorted(deltas)
+    if connection.capabilities.dialect == "postgres":
+        rows = ", ".join(f"(${2 * i + 1}, ${2 * i + 2})" for i in range(len(keys)))
+    else:
+        rows = ", ".join("(?, ?)" for _ in keys)
+    params = [item for key in keys for item in (key, int(deltas[key]))]
+    await connection.execute_query(_UPSERT_SQL.format(rows=rows), params)
+
+
+async def get_dashboard_stats(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Dashboard kartochkalari - bitta SELECT (hisoblagichlar hali bo'lmasa - rekonsilyatsiya)."""
+    now = now or utc_now()
+    first_hour = signup_key(now - NEW_USERS_WINDOW)
+    rows = await (
+        UserStat.filter(
+            Q(key__in=(TOTAL, ACTIVE, SUPERUSERS, RECONCILED_AT))
+            | Q(key__gte=first_hour, key__lte=signup_key(now))
+        )
+        .values_list("key", "value")
+    )
+    values = dict(rows)
+    if RECONCILED_AT not in values:
+        await reconcile_user_stats(now)
+        return await get_dashboard_stats(now)
+
+    return {
+        "total_users": values.get(TOTAL, 0),
+        "active_users": values.get(ACTIVE, 0),
+        "superusers": values.get(SUPERUSERS, 0),
+        "new_users_week": sum(value for key, value in values.items() if key.startswith(SIGNUP_PREFIX)),
+        "stats_age_seconds": max(0, int(time.time()) - values[RECONCILED_AT]),
+    }
+
+
+async def reconcile_user_stats(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Hisoblagichlarni haqiqiy qiymatlarga keltirish. Qaytaradi: tuzatilgan farqlar (drift)."""
+    now = now or utc_now()
+    since = now - SIGNUP_RETENTION
+
+    async with in_transaction() as connection:
+        # total / active / superusers - bitta shartli-agregat so'rov
+        totals = await (
+            User.all()
+            .using_db(connection)
+            .annotate(
+                total=Count("id"),
+                active=Count("id", _filter=Q(is_active=True)),
+                superusers=Count("id", _filter=Q(is_superuser=True)),
+            )
+            .first()
+            .values("total", "active", "superusers")
+        )
+        # Soatlik hisoblagichlar - idx_users_created_live bo'yicha faqat oxirgi kunlar
+        actual: Dict[str, int] = defaultdict(int)
+        actual.update({TOTAL: totals["total"], ACTIVE: totals["active"], SUPERUSERS: totals["superusers"]})
+        for created_at in await User.filter(created_at__gte=since).using_db(connection).values_list("created_at", flat=True):
+            actual[signup_key(created_at)] += 1
+
+        stored = dict(
+            await UserStat.filter(Q(key__in=(TOTAL, ACTIVE, SUPERUSERS)) | Q(key__startswith=SIGNUP_PREFIX))
+            .using_db(connection)
+            .values_list("key", "value")
+        )
+        # Saqlash muddatidan o'tgan soatlar o'chiriladi, qolganlari tuzatiladi
+        expired = [key for key in stored if key.startswith(SIGNUP_PREFIX) and key < signup_key(since)]
+        if expired:
+            await UserStat.filter(key__in=expired).using_db(connection).delete()
+        drift = diff({key: value for key, value in stored.items() if key not in expired}, actual)
+        await apply_deltas(drift, using_db=connection)
+
+        reconciled_at = int(time.time())
+        updated = await UserStat.filter(key=RECONCILED_AT).using_db(connection).update(value=reconciled_at)
+        if not updated:
+            await UserStat.create(key=RECONCILED_AT, value=reconciled_at, using_db=connection)
+    return drift
+
+
+async def reconcile_worker(interval: int = USER_STATS_RECONCILE_INTERVAL) -> None:
+    """Fon vazifasi: har `interval` soniyada rekonsilyatsiya."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            drift = await reconcile_user_stats()
+            if drift:
+                print(f"🧹 Dashboard statistikasi tuzatildi: {drift}")
+        except Exception as e:
+            print(f"❌ Statistika rekonsilyatsiyasi xatoligi: {e}")
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    """Hisoblagichlarni user yozuvi bilan bitta tranzaksiyada o'zgartirish."""
+    after = contribution({name: getattr(instance, name) for name in TRACKED_FIELDS}, instance.created_at)
+    if created:
+        before = {}
+    else:
+        loaded = getattr(instance, "_loaded_values", None)
+        if loaded is None:
+            # Eski holat noma'lum (bazadan o'qilmagan obyekt) - keyingi rekonsilyatsiya tuzatadi
+            return
+        before = contribution(loaded, instance.created_at)
+    await apply_deltas(diff(before, after), using_db=using_db)
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance, using_db):
+    loaded = getattr(instance, "_loaded_values", None)
+    if loaded is None:
+        return
+    await apply_deltas(diff(contribution(loaded, instance.created_at), {}), using_db=using_db)
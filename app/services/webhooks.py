@@ -0,0 +1,420 @@
+"""
+User hodisalari uchun webhook'lar - transactional outbox va batch yetkazish.
+
+- `User.save()` / `delete()` tranzaksiya ichida ishlaydi (app/models/user.py), post_save/post_delete
+  handler'i outbox qatorini shu tranzaksiyada yozadi: user o'zgarishi va hodisa birga commit
+  yoki birga rollback bo'ladi
+- Worker har bir obuna uchun eng eski hodisalardan `WEBHOOK_BATCH_SIZE` tasini bitta POST'da yuboradi
+- Har bir endpoint (scheme://host:port) uchun alohida keep-alive `httpx.AsyncClient` pool'i
+- Xatolikda obuna `retry_at` gacha to'xtatiladi (eksponensial backoff + jitter) - hodisalar
+  tartibi buzilmaydi; `WEBHOOK_MAX_ATTEMPTS` dan keyin hodisa dead-letter jadvaliga o'tadi
+- `QuerySet.update()` signal chaqirmaydi - bunday joylarda `record_user_events()` ishlatiladi
+"""
+
+import asyncio
+import hashlib
+import hmac
+import random
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from decouple import config
+from tortoise.expressions import F, Q
+from tortoise.signals import post_delete, post_save
+from tortoise.transactions import in_transaction
+
+from app.core.datetime_utils import utc_now
+from app.core.serialization import dumps
+from app.models.user import User
+from app.models.webhook import (
+    USER_CREATED, USER_DEACTIVATED, USER_UPDATED,
+    WebhookDeadLetter, WebhookOutbox, WebhookSubscription,
+)
+from app.services.user_snapshot import build_snapshot
+
+
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=100, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=8, cast=int)
+WEBHOOK_TIMEOUT = config('WEBHOOK_TIMEOUT', default=10.0, cast=float)
+WEBHOOK_MAX_CONNECTIONS = config('WEBHOOK_MAX_CONNECTIONS', default=4, cast=int)
+WEBHOOK_BACKOFF_BASE = config('WEBHOOK_BACKOFF_BASE', default=5.0, cast=float)
+WEBHOOK_BACKOFF_MAX = config('WEBHOOK_BACKOFF_MAX', default=3600.0, cast=float)
+# 0 - fon worker'i o'chirilgan
+WEBHOOK_POLL_INTERVAL = config('WEBHOOK_POLL_INTERVAL', default=1.0, cast=float)
+
+# Bir aylanishda bitta obunaga yuboriladigan maksimal batch'lar (boshqa obunalar kutib qolmasin)
+MAX_BATCHES_PER_ROUND = 10
+
+# Faqat shu maydonlar o'zgargan saqlash hodisa hosil qilmaydi
+SILENT_FIELDS = frozenset({"last_login", "updated_at"})
+
+# Obunalar ro'yxati boshqa jarayonlarda o'zgargan bo'lishi mumkin
+SUBSCRIPTIONS_TTL = 30.0
+
+
+class SubscriptionIndex:
+    """Faol obunalar (hodisa -> obuna id'lari) - har bir user yozuvida bazaga murojaat qilmaslik uchun."""
+
+    def __init__(self, ttl: float = SUBSCRIPTIONS_TTL):
+        self.ttl = ttl
+        self._by_event: Optional[Dict[str, List[int]]] = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        self._by_event = None
+
+    async def matching(self, event: str, using_db=None) -> List[int]:
+        if self._by_event is None or time.monotonic() - self._loaded_at > self.ttl:
+            by_event: Dict[str, List[int]] = {}
+            for subscription in await WebhookSubscription.filter(is_active=True).using_db(using_db):
+                for name in subscription.event_list:
+                    by_event.setdefault(name, []).append(subscription.id)
+            self._by_event = by_event
+            self._loaded_at = time.monotonic()
+        return self._by_event.get(event, [])
+
+
+# Global instance
+subscription_index = SubscriptionIndex()
+
+
+def user_event(instance: User, created: bool, update_fields: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Saqlash qaysi hodisaga mos keladi (hodisa bo'lmasa - None)."""
+    if created:
+        return USER_CREATED
+    if update_fields and set(update_fields) <= SILENT_FIELDS:
+        return None
+    # Yuklanganda faol bo'lgan user faolsizlantirildi (soft delete ham)
+    if getattr(instance, "_loaded_values", {}).get("is_active") is True and not instance.is_active:
+        return USER_DEACTIVATED
+    return USER_UPDATED
+
+
+async def record_event(event: str, user: User, using_db=None) -> int:
+    """Obunalar uchun outbox qatorlarini yozish. Qaytaradi: qatorlar soni."""
+    subscription_ids = await subscription_index.matching(event, using_db)
+    if not subscription_ids:
+        return 0
+    payload = await build_snapshot(user)
+    await WebhookOutbox.bulk_create(
+        [
+            WebhookOutbox(subscription_id=subscription_id, event=event, user_id=user.id, payload=payload)
+            for subscription_id in subscription_ids
+        ],
+        using_db=using_db,
+    )
+    return len(subscription_ids)
+
+
+async def record_user_events(event: str, user_ids: Iterable[int], using_db=None) -> int:
+    """Signalsiz (bulk) o'zgartirilgan userlar uchun hodisalar (chaqiruvchi tranzaksiyasida)."""
+    if not await subscription_index.matching(event, using_db):
+        return 0
+    recorded = 0
+    for user in await User.with_deleted().filter(id__in=list(user_ids)).using_db(using_db):
+        recorded += await record_event(event, user, using_db)
+    return recorded
+
+
+def backoff_delay(failures: int, base: float = WEBHOOK_BACKOFF_BASE, cap: float = WEBHOOK_BACKOFF_MAX) -> float:
+    """Eksponensial backoff (yarim jitter): 5s, 10s, 20s, ... `cap` gacha."""
+    delay = min(cap, base * 2 ** max(failures - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """`X-Webhook-Signature`: HMAC-SHA256(secret, "<timestamp>." + body)."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+def encode_batch(rows: List[WebhookOutbox]) -> bytes:
+    """Batch body'si - payload'lar qayta serializatsiya qilinmaydi."""
+    return dumps({
+        "events": [
+            {
+                "id": row.id,
+                "type": row.event,
+                "user_id": row.user_id,
+                "occurred_at": row.created_at,
+                "data": orjson.Fragment(row.payload),
+            }
+            for row in rows
+        ]
+    })
+
+
+@dataclass
+class DeliveryResult:
+    """Bitta POST natijasi."""
+    ok: bool
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+
+class WebhookSender:
+    """Endpoint bo'yicha keep-alive HTTP client'lar."""
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        timeout: float = WEBHOOK_TIMEOUT,
+        max_connections: int = WEBHOOK_MAX_CONNECTIONS,
+    ):
+        self.transport = transport
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                follow_redirects=False,
+            )
+            self._clients[key] = client
+        return client
+
+    async def send(self, url: str, secret: str, body: bytes) -> DeliveryResult:
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Signature": sign(secret, timestamp, body),
+        }
+        try:
+            response = await self.client_for(url).post(url, content=body, headers=headers)
+        except httpx.HTTPError as e:
+            return DeliveryResult(ok=False, error=f"{type(e).__name__}: {e}")
+
+        if response.is_success:
+            return DeliveryResult(ok=True, status_code=response.status_code)
+
+        retry_after = response.headers.get("retry-after")
+        return DeliveryResult(
+            ok=False,
+            status_code=response.status_code,
+            error=f"HTTP {response.status_code}: {response.text[:200]}",
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+class WebhookDispatcher:
+    """Outbox'dagi hodisalarni obunalar bo'yicha batch'lab yetkazish."""
+
+    def __init__(
+        self,
+        sender: Optional[WebhookSender] = None,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+    ):
+        self.sender = sender or WebhookSender()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+        # Metrikalar
+        self.batches = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dead_lettered = 0
+
+    async def deliver_due(self) -> int:
+        """Vaqti kelgan barcha obunalarga yetkazish. Qaytaradi: yetkazilgan hodisalar soni."""
+        now = utc_now()
+        pending_ids = await WebhookOutbox.all().distinct().values_list("subscription_id", flat=True)
+        if not pending_ids:
+            return 0
+        subscriptions = await WebhookSubscription.filter(
+            Q(retry_at__isnull=True) | Q(retry_at__lte=now), id__in=list(pending_ids), is_active=True,
+        )
+        # Turli endpoint'lar parallel, bitta obuna ichida - qat'iy tartib
+        results = await asyncio.gather(*(self.deliver_subscription(subscription) for subscription in subscriptions))
+        return sum(results)
+
+    async def deliver_subscription(self, subscription: WebhookSubscription) -> int:
+        """Bitta obunaning navbatini yetkazish (birinchi xatolikda to'xtaydi)."""
+        if not await self._claim(subscription):
+            return 0
+
+        delivered = 0
+        for _ in range(MAX_BATCHES_PER_ROUND):
+            rows = await (
+                WebhookOutbox.filter(subscription_id=subscription.id)
+                .order_by("id")
+                .limit(self.batch_size)
+            )
+            if not rows:
+                break
+
+            result = await self.sender.send(subscription.url, subscription.secret, encode_batch(rows))
+            self.batches += 1
+            if not result.ok:
+                self.failed += 1
+                await self._handle_failure(subscription, rows, result)
+                return delivered
+
+            await WebhookOutbox.filter(id__in=[row.id for row in rows]).delete()
+            delivered += len(rows)
+            self.delivered += len(rows)
+
+        await WebhookSubscription.filter(id=subscription.id).update(failures=0, retry_at=None, last_error=None)
+        return delivered
+
+    async def _claim(self, subscription: WebhookSubscription) -> bool:
+        """Obunani lease bilan band qilish (bir nechta worker jarayoni bir-birini takrorlamasin)."""
+        now = utc_now()
+        lease = timedelta(seconds=self.sender.timeout * (MAX_BATCHES_PER_ROUND + 1))
+        claimed = await (
+            WebhookSubscription.filter(Q(retry_at__isnull=True) | Q(retry_at__lte=now), id=subscription.id)
+            .update(retry_at=now + lease)
+        )
+        return bool(claimed)
+
+    async def _handle_failure(
+        self, subscription: WebhookSubscription, rows: List[WebhookOutbox], result: DeliveryResult
+    ) -> None:
+        """Urinishlarni oshirish, tugaganlarini dead-letter'ga o'tkazish, obunani backoff'ga qo'yish."""
+        failures = subscription.failures + 1
+        delay = max(result.retry_after or 0.0, backoff_delay(failures))
+        exhausted = [row for row in rows if row.attempts + 1 >= self.max_attempts]
+
+        async with in_transaction() as connection:
+            await (
+                WebhookOutbox.filter(id__in=[row.id for row in rows])
+                .using_db(connection)
+                .update(attempts=F("attempts") + 1)
+            )
+            if exhausted:
+                await WebhookDeadLetter.bulk_create(
+                    [
+                        WebhookDeadLetter(
+                            subscription_id=subscription.id,
+                            event_id=row.id,
+                            event=row.event,
+                            user_id=row.user_id,
+                            payload=row.payload,
+                            attempts=row.attempts + 1,
+                            last_error=result.error,
+                            created_at=row.created_at,
+                        )
+                        for row in exhausted
+                    ],
+                    using_db=connection,
+                )
+                await WebhookOutbox.filter(id__in=[row.id for row in exhausted]).using_db(connection).delete()
+                self.dead_lettered += len(exhausted)
+            await (
+                WebhookSubscription.filter(id=subscription.id)
+                .using_db(connection)
+                .update(
+                    failures=failures,
+                    retry_at=utc_now() + timedelta(seconds=delay),
+                    last_error=result.error,
+                )
+            )
+
+    async def replay_dead_letters(self, subscription_id: int) -> int:
+        """Dead-letter'dagi hodisalarni qayta navbatga qo'yish (urinishlar noldan)."""
+        async with in_transaction() as connection:
+            letters = await (
+                WebhookDeadLetter.filter(subscription_id=subscription_id)
+                .using_db(connection)
+                .order_by("event_id")
+            )
+            if not letters:
+                return 0
+            await WebhookOutbox.bulk_create(
+                [
+                    # Asl id saqlanadi - qabul qiluvchi takrorni aniqlay oladi
+                    WebhookOutbox(
+                        id=letter.event_id,
+                        subscription_id=subscription_id,
+                        event=letter.event,
+                        user_id=letter.user_id,
+                        payload=letter.payload,
+                        created_at=letter.created_at,
+                    )
+                    for letter in letters
+                ],
+                using_db=connection,
+            )
+            await WebhookDeadLetter.filter(id__in=[letter.id for letter in letters]).using_db(connection).delete()
+            await (
+                WebhookSubscription.filter(id=subscription_id)
+                .using_db(connection)
+                .update(failures=0, retry_at=None)
+            )
+        return len(letters)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dead_lettered": self.dead_lettered,
+            "endpoints": len(self.sender._clients),
+        }
+
+    async def aclose(self) -> None:
+        await self.sender.aclose()
+
+
+# Global instance
+webhook_dispatcher = WebhookDispatcher()
+
+
+async def webhook_worker(interval: float = WEBHOOK_POLL_INTERVAL) -> None:
+    """Fon vazifasi: outbox bo'sh bo'lsa `interval` soniya kutadi, aks holda darhol davom etadi."""
+    while True:
+        try:
+            delivered = await webhook_dispatcher.deliver_due()
+        except Exception as e:
+            print(f"❌ Webhook xatoligi: {e}")
+            delivered = 0
+        if not delivered:
+            await asyncio.sleep(interval)
+
+
+@post_save(User)
+async def _user_saved(sender, instance, created, using_db, update_fields):
+    """User hodisasini outbox'ga yozish (save() tranzaksiyasi ichida)."""
+    event = user_event(instance, created, update_fields)
+    if event is not None:
+        await record_event(event, instance, using_db)
+
+
+@post_delete(User)
+async def _user_deleted(sender, instance, using_db):
+    """Butunlay o'chirilgan faol user - `user.deactivated`."""
+    if getattr(instance, "_loaded_values", {}).get("is_active", True):
+        await record_event(USER_DEACTIVATED, instance, using_db)
+
+
+@post_save(WebhookSubscription)
+async def _subscription_saved(sender, instance, created, using_db, update_fields):
+    subscription_index.invalidate()
+
+
+@post_delete(WebhookSubscription)
+async def _subscription_deleted(sender, instance, using_db):
+    subscription_index.invalidate()
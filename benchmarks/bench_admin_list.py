@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Admin `model_list` benchmark - to'liq obyektlar va `list_display` proyeksiyasi.
+
+Har bir sahifa uchun so'rov+qayta ishlash vaqti va xotira cho'qqisi (tracemalloc) o'lchanadi.
+`users.bio` va `login_attempts.user_agent` katta matn bilan to'ldiriladi.
+Foydalanish: python -m benchmarks.bench_admin_list [--rows 5000] [--per-page 20] [--pages 200] [--text 4096]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from tortoise import Tortoise
+
+from app.admin.autodiscovery import create_smart_config
+from app.admin.listing import fetch_list_rows
+from app.models.admin_security import LoginAttempt
+from app.models.user import User
+
+
+async def setup(rows: int, text: int, db_url: str) -> None:
+    await Tortoise.init(
+        db_url=db_url,
+        modules={"models": ["app.models.user", "app.models.admin_security"]},
+    )
+    await Tortoise.generate_schemas()
+    await User.bulk_create([
+        User(username=f"bench_{i}", email=f"bench_{i}@example.com", password_hash="-", bio="b" * text)
+        for i in range(rows)
+    ], batch_size=1000)
+    user_id = await User.all().order_by("id").first().values_list("id", flat=True)
+    await LoginAttempt.bulk_create([
+        LoginAttempt(user_id=user_id, ip_address="127.0.0.1", user_agent="u" * text)
+        for _ in range(rows)
+    ], batch_size=1000)
+
+
+async def full_objects(query, config) -> list:
+    """Eski usul: to'liq obyektlar, har biri dict'ga ko'chiriladi va `_original` saqlanadi."""
+    rows = []
+    for obj in await query:
+        row = {field: getattr(obj, field, None) for field in config.list_display}
+        row["_original"] = obj
+        rows.append(row)
+    return rows
+
+
+async def measure(name: str, func, config, per_page: int, pages: int, rows: int) -> None:
+    model = config.model
+    last_page = max(1, rows // per_page)
+
+    # Vaqt - tracemalloc'siz
+    start = time.perf_counter()
+    for page in range(pages):
+        offset = (page % last_page) * per_page
+        await func(model.all().order_by("id").offset(offset).limit(per_page), config)
+    elapsed = (time.perf_counter() - start) / pages * 1000
+
+    # Xotira - bitta sahifa natijasi ushlab turilganda
+    tracemalloc.start()
+    result = await func(model.all().order_by("id").limit(per_page), config)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{model.__name__:<14} {name:<10} {elapsed:>10.2f} {peak / 1024:>12.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Admin ro'yxat sahifasi benchmark")
+    parser.add_argument("--rows", type=int, default=5000, help="Har bir jadvaldagi qatorlar")
+    parser.add_argument("--per-page", type=int, default=20, help="Sahifa hajmi")
+    parser.add_argument("--pages", type=int, default=200, help="O'lchanadigan sahifalar soni")
+    parser.add_argument("--text", type=int, default=4096, help="bio/user_agent uzunligi")
+    parser.add_argument("--db", default="sqlite://:memory:", help="Baza URL (bo'sh baza bo'lishi kerak)")
+    args = parser.parse_args()
+
+    print(f"=== Admin list: {args.rows} qator, sahifa {args.per_page}, matn {args.text} bayt ===")
+    print(f"{'model':<14} {'mode':<10} {'ms/page':>10} {'peak KiB':>12}")
+    try:
+        await setup(args.rows, args.text, args.db)
+        for model in (User, LoginAttempt):
+            config = create_smart_config(model)
+            for name, func in (("full", full_objects), ("projected", fetch_list_rows)):
+                await measure(name, func, config, args.per_page, args.pages, args.rows)
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+JSON encoding benchmark - eski (jsonable_encoder + stdlib json) va yangi (orjson) yo'lni solishtirish.
+Foydalanish: python -m benchmarks.bench_json [--users 100] [--rounds 200]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.serialization import dumps
+from app.core.utils import Utils
+
+
+class BenchUser(BaseModel):
+    """User_Pydantic ga mos maydonlar (password_hash siz)."""
+    id: int
+    username: str
+    email: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    age: Optional[int]
+    balance: Decimal
+    bio: Optional[str]
+    rating: Optional[float]
+    birth_date: Optional[date]
+    last_login: Optional[datetime]
+    profile_picture: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+def build_payload(users_count: int) -> dict:
+    """Paginated /api/v1/users javobiga o'xshash envelope yaratish."""
+    now = datetime.utcnow()
+    users = [
+        BenchUser(
+            id=i,
+            username=f"user_{i}",
+            email=f"user_{i}@example.com",
+            first_name="Test",
+            last_name="User",
+            is_active=True,
+            is_superuser=False,
+            age=20 + i % 40,
+            balance=Decimal("1234.56"),
+            bio="Lorem ipsum dolor sit amet " * 4,
+            rating=4.5,
+            birth_date=date(1990, 1, 1) + timedelta(days=i),
+            last_login=now,
+            profile_picture=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(users_count)
+    ]
+    pagination = Utils.calculate_pagination(1, users_count, users_count * 10)
+    return {
+        "success": True,
+        "message": "Foydalanuvchilar ro'yxati",
+        "data": users,
+        "pagination": pagination,
+    }
+
+
+def legacy_encode(payload: dict) -> bytes:
+    """Oldingi yo'l: jsonable_encoder deep copy + Starlette JSONResponse.render."""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def run(name: str, func, payload: dict, rounds: int) -> float:
+    """Funksiyani bir necha marta ishlatib o'rtacha vaqtni hisoblash."""
+    func(payload)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        body = func(payload)
+    elapsed = time.perf_counter() - start
+    per_call_ms = elapsed / rounds * 1000
+    print(f"{name:<28} {per_call_ms:8.3f} ms/javob   {len(body):>8} bytes")
+    return per_call_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON encoding benchmark")
+    parser.add_argument("--users", type=int, default=100, help="Sahifadagi userlar soni")
+    parser.add_argument("--rounds", type=int, default=200, help="Takrorlashlar soni")
+    args = parser.parse_args()
+
+    payload = build_payload(args.users)
+    print(f"=== JSON encoding: {args.users} user, {args.rounds} round ===")
+    legacy = run("jsonable_encoder + json", legacy_encode, payload, args.rounds)
+    fast = run("orjson (FastJSONResponse)", dumps, payload, args.rounds)
+    print(f"Tezlashish: {legacy / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
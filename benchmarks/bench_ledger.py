@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Ledger benchmark - minglab parallel o'tkazmalar va balans invariantlari.
+
+`--naive` bilan eski yo'l (get -> balance += -> save) ham o'lchanadi: u yangilanishlarni
+yo'qotadi va umumiy balans saqlanib qolmaydi.
+Foydalanish: python -m benchmarks.bench_ledger [--users 50] [--transfers 5000] [--concurrency 200] [--naive]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+from tortoise import Tortoise
+from tortoise.functions import Sum
+
+from app.models.ledger import LedgerEntry
+from app.models.user import User
+from app.services import ledger
+
+INITIAL_BALANCE = Decimal("100.00")
+
+
+async def setup(users: int, db_url: str) -> list:
+    """Bo'sh baza, userlar va boshlang'ich balanslar (bitta batch posting bilan)."""
+    await Tortoise.init(
+        db_url=db_url,
+        modules={"models": ["app.models.user", "app.models.admin_security", "app.models.ledger"]},
+    )
+    await Tortoise.generate_schemas()
+    await User.bulk_create([
+        User(username=f"bench_{i}", email=f"bench_{i}@example.com", password_hash="-")
+        for i in range(users)
+    ])
+    user_ids = await User.all().order_by("id").values_list("id", flat=True)
+    await ledger.post_batch(ledger.Posting(user_id, INITIAL_BALANCE) for user_id in user_ids)
+    return list(user_ids)
+
+
+async def ledger_transfer(from_id: int, to_id: int, amount: Decimal) -> None:
+    await ledger.transfer(from_id, to_id, amount)
+
+
+async def naive_transfer(from_id: int, to_id: int, amount: Decimal) -> None:
+    """Eski usul: read-modify-write (yangilanishlar yo'qoladi)."""
+    sender = await User.get(id=from_id)
+    receiver = await User.get(id=to_id)
+    if sender.balance < amount:
+        raise ledger.InsufficientFunds([from_id])
+    sender.balance -= amount
+    receiver.balance += amount
+    await sender.save()
+    await receiver.save()
+
+
+async def run(name: str, func, user_ids: list, transfers: int, concurrency: int) -> None:
+    rng = random.Random(7)
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def one():
+        nonlocal rejected
+        from_id, to_id = rng.sample(user_ids, 2)
+        amount = Decimal(rng.randint(1, 2000)) / 100
+        async with semaphore:
+            try:
+                await func(from_id, to_id, amount)
+            except ledger.InsufficientFunds:
+                rejected += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(transfers)))
+    elapsed = time.perf_counter() - start
+
+    balances = [Decimal(b) for b in await User.all().values_list("balance", flat=True)]
+    expected = INITIAL_BALANCE * len(user_ids)
+    ledger_total = (await LedgerEntry.annotate(total=Sum("amount")).values_list("total", flat=True))[0]
+    print(
+        f"{name:<8} {transfers / elapsed:>10.0f} {rejected:>9} {sum(balances):>12} {expected:>12} "
+        f"{str(min(balances) >= 0):>9} {ledger_total or 0:>12}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Ledger parallel o'tkazmalar benchmark")
+    parser.add_argument("--users", type=int, default=50, help="Userlar soni")
+    parser.add_argument("--transfers", type=int, default=5000, help="O'tkazmalar soni")
+    parser.add_argument("--concurrency", type=int, default=200, help="Bir vaqtdagi o'tkazmalar")
+    parser.add_argument("--db", default="sqlite://:memory:", help="Baza URL (bo'sh baza bo'lishi kerak)")
+    parser.add_argument("--naive", action="store_true", help="Read-modify-write usulini ham o'lchash")
+    args = parser.parse_args()
+
+    print(f"=== Ledger: {args.users} user, {args.transfers} o'tkazma, concurrency {args.concurrency} ===")
+    print(f"{'mode':<8} {'tx/s':>10} {'rejected':>9} {'sum':>12} {'expected':>12} {'non-neg':>9} {'ledger sum':>12}")
+
+    modes = [("ledger", ledger_transfer)] + ([("naive", naive_transfer)] if args.naive else [])
+    for name, func in modes:
+        try:
+            user_ids = await setup(args.users, args.db)
+            await run(name, func, user_ids, args.transfers, args.concurrency)
+        finally:
+            # :memory: baza ulanish yopilganda tozalanadi
+            await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+JSON va MessagePack javoblarini solishtirish - hajm, encode va decode vaqti.
+Foydalanish: python -m benchmarks.bench_msgpack [--users 100] [--rounds 200]
+"""
+
+import argparse
+import gzip
+import time
+
+from benchmarks.bench_json import build_payload
+from app.core.serialization import dumps, loads, msgpack_dumps, msgpack_loads
+
+
+def timed(func, arg, rounds: int) -> float:
+    """Funksiyani bir necha marta ishlatib o'rtacha vaqtni (ms) hisoblash."""
+    func(arg)  # warm-up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(arg)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs MessagePack benchmark")
+    parser.add_argument("--users", type=int, default=100, help="Sahifadagi userlar soni")
+    parser.add_argument("--rounds", type=int, default=200, help="Takrorlashlar soni")
+    args = parser.parse_args()
+
+    payload = build_payload(args.users)
+    print(f"=== JSON vs MessagePack: {args.users} user, {args.rounds} round ===")
+    print(f"{'format':<12} {'bytes':>9} {'gzip':>9} {'encode ms':>10} {'decode ms':>10}")
+
+    for name, encode, decode in (
+        ("json", dumps, loads),
+        ("msgpack", msgpack_dumps, msgpack_loads),
+    ):
+        body = encode(payload)
+        encode_ms = timed(encode, payload, args.rounds)
+        decode_ms = timed(decode, body, args.rounds)
+        print(f"{name:<12} {len(body):>9} {len(gzip.compress(body)):>9} {encode_ms:>10.3f} {decode_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,7 +42,7 @@ TORTOISE_ORM = {
     "connections": {"default": "sqlite://db.sqlite3"},
     "apps": {
         "models": {
-            "models": ["app.models.user", "app.models.admin_security", "aerich.models"],
+            "models": ["app.models.user", "app.models.admin_security", "app.models.ledger", "app.models.webhook", "app.models.stats", "app.models.search", "aerich.models"],
             "default_connection": "default",
         },
     },
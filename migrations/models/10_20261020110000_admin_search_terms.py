@@ -0,0 +1,20 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Mavjud yozuvlar indeksi: python -m app.management.commands.rebuild_admin_search
+    return """
+        CREATE TABLE IF NOT EXISTS "admin_search_terms" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "term" VARCHAR(64) NOT NULL,
+    "model" VARCHAR(64) NOT NULL /* Admin registry'dagi model nomi */,
+    "object_id" VARCHAR(64) NOT NULL,
+    "weight" SMALLINT NOT NULL
+) /* Bitta so'z -> bitta obyekt. `AdminConfig.search_fields` qiymatlaridan olinadi; */;
+CREATE INDEX IF NOT EXISTS "idx_admin_searc_term_94787b" ON "admin_search_terms" ("term", "model", "object_id");
+CREATE INDEX IF NOT EXISTS "idx_admin_searc_model_1e31ce" ON "admin_search_terms" ("model", "object_id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "admin_search_terms";"""
@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_users_created_43d91f" ON "users" ("created_at");
+CREATE INDEX IF NOT EXISTS "idx_users_rating_271b5c" ON "users" ("rating");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_created_43d91f";
+DROP INDEX IF EXISTS "idx_users_rating_271b5c";"""
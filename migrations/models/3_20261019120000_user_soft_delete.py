@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" ADD "deleted_at" TIMESTAMP;
+DROP INDEX IF EXISTS "idx_users_created_43d91f";
+DROP INDEX IF EXISTS "idx_users_rating_271b5c";
+CREATE INDEX IF NOT EXISTS "idx_users_created_live" ON "users" ("created_at") WHERE "deleted_at" IS NULL;
+CREATE INDEX IF NOT EXISTS "idx_users_rating_live" ON "users" ("rating") WHERE "deleted_at" IS NULL;
+CREATE INDEX IF NOT EXISTS "idx_users_deleted_purge" ON "users" ("deleted_at") WHERE "deleted_at" IS NOT NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_deleted_purge";
+DROP INDEX IF EXISTS "idx_users_rating_live";
+DROP INDEX IF EXISTS "idx_users_created_live";
+CREATE INDEX IF NOT EXISTS "idx_users_created_43d91f" ON "users" ("created_at");
+CREATE INDEX IF NOT EXISTS "idx_users_rating_271b5c" ON "users" ("rating");
+ALTER TABLE "users" DROP COLUMN "deleted_at";"""
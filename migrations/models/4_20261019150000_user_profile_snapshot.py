@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" ADD "profile_snapshot" BLOB;
+ALTER TABLE "users" ADD "profile_snapshot_version" INT NOT NULL DEFAULT 0;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" DROP COLUMN "profile_snapshot_version";
+ALTER TABLE "users" DROP COLUMN "profile_snapshot";"""
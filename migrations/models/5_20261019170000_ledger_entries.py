@@ -0,0 +1,21 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "ledger_entries" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "transfer_id" CHAR(36) NOT NULL /* Bir tranzaksiyadagi yozuvlar guruhi */,
+    "amount" VARCHAR(40) NOT NULL /* Musbat - kirim, manfiy - chiqim */,
+    "kind" VARCHAR(20) NOT NULL /* transfer_in, transfer_out, adjustment */,
+    "description" VARCHAR(255),
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT REFERENCES "users" ("id") ON DELETE SET NULL
+) /* Bitta balans harakati. Musbat amount - kirim, manfiy - chiqim. */;
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_transfe_dcc45d" ON "ledger_entries" ("transfer_id");
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_user_id_bc8069" ON "ledger_entries" ("user_id", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "ledger_entries";"""
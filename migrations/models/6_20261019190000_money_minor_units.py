@@ -0,0 +1,49 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # users.balance_minor bo'sh qo'shiladi va onlayn to'ldiriladi:
+    #   python -m app.management.commands.convert_balances
+    # ledger_entries yangi va kichik - bir martada qayta quriladi
+    return """
+        ALTER TABLE "users" ADD "balance_minor" BIGINT;
+CREATE INDEX IF NOT EXISTS "idx_users_balance_live" ON "users" ("balance_minor") WHERE "deleted_at" IS NULL;
+CREATE TABLE "ledger_entries_new" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "transfer_id" CHAR(36) NOT NULL /* Bir tranzaksiyadagi yozuvlar guruhi */,
+    "amount_minor" BIGINT NOT NULL /* Musbat - kirim, manfiy - chiqim */,
+    "kind" VARCHAR(20) NOT NULL /* transfer_in, transfer_out, adjustment */,
+    "description" VARCHAR(255),
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT REFERENCES "users" ("id") ON DELETE SET NULL
+) /* Bitta balans harakati. Musbat amount - kirim, manfiy - chiqim. */;
+INSERT INTO "ledger_entries_new" ("id", "transfer_id", "amount_minor", "kind", "description", "created_at", "user_id")
+    SELECT "id", "transfer_id", CAST(ROUND(CAST("amount" AS NUMERIC) * 100) AS BIGINT), "kind", "description", "created_at", "user_id"
+    FROM "ledger_entries";
+DROP TABLE "ledger_entries";
+ALTER TABLE "ledger_entries_new" RENAME TO "ledger_entries";
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_transfe_dcc45d" ON "ledger_entries" ("transfer_id");
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_user_id_bc8069" ON "ledger_entries" ("user_id", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        UPDATE "users" SET "balance" = printf('%.2f', "balance_minor" / 100.0) WHERE "balance_minor" IS NOT NULL;
+DROP INDEX IF EXISTS "idx_users_balance_live";
+ALTER TABLE "users" DROP COLUMN "balance_minor";
+CREATE TABLE "ledger_entries_old" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "transfer_id" CHAR(36) NOT NULL /* Bir tranzaksiyadagi yozuvlar guruhi */,
+    "amount" VARCHAR(40) NOT NULL /* Musbat - kirim, manfiy - chiqim */,
+    "kind" VARCHAR(20) NOT NULL /* transfer_in, transfer_out, adjustment */,
+    "description" VARCHAR(255),
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "user_id" INT REFERENCES "users" ("id") ON DELETE SET NULL
+) /* Bitta balans harakati. Musbat amount - kirim, manfiy - chiqim. */;
+INSERT INTO "ledger_entries_old" ("id", "transfer_id", "amount", "kind", "description", "created_at", "user_id")
+    SELECT "id", "transfer_id", printf('%.2f', "amount_minor" / 100.0), "kind", "description", "created_at", "user_id"
+    FROM "ledger_entries";
+DROP TABLE "ledger_entries";
+ALTER TABLE "ledger_entries_old" RENAME TO "ledger_entries";
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_transfe_dcc45d" ON "ledger_entries" ("transfer_id");
+CREATE INDEX IF NOT EXISTS "idx_ledger_entr_user_id_bc8069" ON "ledger_entries" ("user_id", "id");"""
@@ -0,0 +1,47 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "webhook_subscriptions" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "url" VARCHAR(500) NOT NULL,
+    "events" VARCHAR(255) NOT NULL /* Vergul bilan: user.created,user.updated,... */,
+    "secret" VARCHAR(64) NOT NULL /* X-Webhook-Signature (HMAC-SHA256) kaliti */,
+    "is_active" INT NOT NULL DEFAULT 1,
+    "failures" INT NOT NULL DEFAULT 0 /* Ketma-ket muvaffaqiyatsiz yetkazishlar */,
+    "retry_at" TIMESTAMP,
+    "last_error" TEXT,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) /* Tashqi tizim obunasi. Bitta URL'ga bir nechta hodisa bitta POST'da (batch) yuboriladi. */;
+CREATE TABLE IF NOT EXISTS "webhook_dead_letters" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "event_id" BIGINT NOT NULL /* Outbox'dagi id (qabul qiluvchi uchun dedup kaliti) */,
+    "event" VARCHAR(32) NOT NULL,
+    "user_id" INT NOT NULL,
+    "payload" BLOB NOT NULL,
+    "attempts" INT NOT NULL,
+    "last_error" TEXT,
+    "created_at" TIMESTAMP NOT NULL /* Hodisa vaqti */,
+    "failed_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "subscription_id" INT NOT NULL REFERENCES "webhook_subscriptions" ("id") ON DELETE CASCADE
+) /* Urinishlar tugagan hodisa - qo'lda ko'rib chiqish yoki qayta yuborish uchun. */;
+CREATE INDEX IF NOT EXISTS "idx_webhook_dea_subscri_99b5f0" ON "webhook_dead_letters" ("subscription_id", "event_id");
+CREATE TABLE IF NOT EXISTS "webhook_outbox" (
+    "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    "event" VARCHAR(32) NOT NULL,
+    "user_id" INT NOT NULL,
+    "payload" BLOB NOT NULL /* Oldindan kodlangan JSON */,
+    "attempts" INT NOT NULL DEFAULT 0,
+    "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "subscription_id" INT NOT NULL REFERENCES "webhook_subscriptions" ("id") ON DELETE CASCADE
+) /* Yuborilishi kutilayotgan hodisa (har bir obuna uchun alohida qator). */;
+CREATE INDEX IF NOT EXISTS "idx_webhook_out_subscri_bbf3e9" ON "webhook_outbox" ("subscription_id", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "webhook_outbox";
+DROP TABLE IF EXISTS "webhook_dead_letters";
+DROP TABLE IF EXISTS "webhook_subscriptions";"""
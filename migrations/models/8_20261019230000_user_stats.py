@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Hisoblagichlar birinchi dashboard ochilganda (yoki reconcile_user_stats bilan) to'ldiriladi
+    return """
+        CREATE TABLE IF NOT EXISTS "user_stats" (
+    "key" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "value" BIGINT NOT NULL DEFAULT 0
+) /* Bitta hisoblagich: `total`, `active`, `superusers` yoki soatlik ro'yxatdan o'tishlar */;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "user_stats";"""
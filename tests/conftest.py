@@ -0,0 +1,40 @@
+"""
+Umumiy test fixture'lari - in-memory SQLite baza.
+"""
+
+import asyncio
+import copy
+
+import pytest
+from tortoise import Tortoise
+
+from config.tortoise_config import TORTOISE_ORM
+
+
+@pytest.fixture
+def db():
+    """Korutinani yangi in-memory bazada ishga tushiruvchi funksiya.
+
+    Foydalanish: `db(main)` - `main()` sxema yaratilgandan keyin chaqiriladi,
+    oxirida ulanishlar yopiladi.
+    """
+    # Bazaga bog'liq global keshlar testlar orasida bo'lishilmasin
+    from app.core.cache import response_cache
+    from app.services.webhooks import subscription_index
+
+    def run(main):
+        async def wrapper():
+            config = copy.deepcopy(TORTOISE_ORM)
+            config["connections"]["default"] = "sqlite://:memory:"
+            await Tortoise.init(config=config)
+            await Tortoise.generate_schemas()
+            try:
+                return await main()
+            finally:
+                await Tortoise.close_connections()
+
+        response_cache.clear()
+        subscription_index.invalidate()
+        return asyncio.run(wrapper())
+
+    return run
@@ -0,0 +1,58 @@
+"""
+Dashboard grafiklari testlari - bucket kalitlari va yopilgan bucket'lar keshi.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.services import activity_charts
+
+
+NOW = datetime(2026, 10, 19, 13, 45, tzinfo=timezone.utc)
+
+
+def test_bucket_keys_end_with_current_bucket():
+    hours = activity_charts.bucket_keys(NOW, "hour")
+    days = activity_charts.bucket_keys(NOW, "day")
+    assert len(hours) == 48 and hours[-1] == "2026-10-19T13" and hours[0] == "2026-10-17T14"
+    assert len(days) == 30 and days[-1] == "2026-10-19" and days[-2] == "2026-10-18"
+    assert activity_charts.bucket_key(NOW.astimezone(timezone(timedelta(hours=5))), "hour") == "2026-10-19T13"
+
+
+def test_only_current_bucket_is_recomputed(monkeypatch):
+    queries = []
+
+    async def fake_count(model, granularity, since):
+        queries.append(since)
+        return {"2026-10-18T10": 3, "2026-10-19T13": len(queries)}
+
+    monkeypatch.setattr(activity_charts, "count_by_bucket", fake_count)
+    charts = activity_charts.ActivityCharts()
+
+    first = asyncio.run(charts.series("signups", "hour", NOW))
+    second = asyncio.run(charts.series("signups", "hour", NOW + timedelta(minutes=10)))
+    assert queries == [datetime(2026, 10, 17, 14, tzinfo=timezone.utc), datetime(2026, 10, 19, 13, tzinfo=timezone.utc)]
+    assert first[-1] == 1 and second[-1] == 2
+    # Yopilgan bucket keshdan olinadi
+    assert second[-28] == first[-28] == 3
+
+    # Yangi soat: avvalgi joriy bucket yopiladi va keshga tushadi
+    third = asyncio.run(charts.series("signups", "hour", NOW + timedelta(hours=1)))
+    assert queries[-1] == datetime(2026, 10, 19, 13, tzinfo=timezone.utc)
+    assert third[-2] == 3 and third[-1] == 0
+
+
+def test_signups_include_soft_deleted_users(db):
+    """Yopilgan bucket'lar o'zgarmas: keyin soft-delete qilingan user ham sanaladi."""
+    from app.core.datetime_utils import utc_now
+    from app.models.user import User
+
+    async def main():
+        users = [
+            await User.create(username=f"signup_{i}", email=f"signup_{i}@example.com", password_hash="-")
+            for i in range(2)
+        ]
+        await users[0].soft_delete()
+        return await activity_charts.ActivityCharts().series("signups", "hour", utc_now())
+
+    assert db(main)[-1] == 2
@@ -0,0 +1,116 @@
+"""
+Admin ommaviy amallari testlari.
+"""
+
+import asyncio
+
+import orjson
+import pytest
+from starlette.responses import Response
+
+from app.admin.actions import available_actions, run_action
+from app.admin.registry import AdminConfig
+from app.core.cache import response_cache
+from app.models.search import AdminSearchTerm
+from app.models.stats import UserStat
+from app.models.user import User
+from app.models.webhook import USER_DEACTIVATED, USER_UPDATED, WebhookOutbox, WebhookSubscription
+from app.services import user_bulk
+from app.services.leaderboard import Leaderboard
+from app.services.user_bulk import set_users_active, soft_delete_users
+from app.services.user_cache import user_tag
+from app.services.user_stats import ACTIVE, TOTAL
+
+
+def _config(model, **kwargs):
+    return AdminConfig(model=model, name=model.__name__, name_plural=model.__name__, **kwargs)
+
+
+def test_builtin_actions_follow_fields_and_permissions():
+    assert list(available_actions(_config(User))) == ["activate", "deactivate", "delete"]
+    assert list(available_actions(_config(User, can_edit=False))) == ["delete"]
+    # is_active maydoni yo'q
+    assert list(available_actions(_config(UserStat, can_delete=False))) == []
+
+
+def test_custom_actions_use_short_description():
+    def reset_rating(queryset):
+        return 0
+
+    def recount(queryset):
+        return 0
+
+    reset_rating.short_description = "Reytingni nolga tushirish"
+    actions = available_actions(_config(UserStat, custom_actions={"reset_rating": reset_rating, "recount": recount}))
+    assert actions == {"delete": "O'chirish", "reset_rating": "Reytingni nolga tushirish", "recount": "Recount"}
+
+
+def test_internal_and_guarded_models_are_not_bulk_deleted():
+    """LedgerEntry `delete()` ni taqiqlaydi - `DELETE ... WHERE` bilan ham o'chirilmaydi."""
+    from app.admin.autodiscovery import create_smart_config
+    from app.models.ledger import LedgerEntry
+    from app.models.webhook import WebhookDeadLetter
+
+    assert "delete" not in available_actions(_config(LedgerEntry))
+    with pytest.raises(ValueError):
+        asyncio.run(run_action("ledgerentry", _config(LedgerEntry), "delete", None))
+
+    for model in (LedgerEntry, WebhookOutbox, WebhookDeadLetter, UserStat, AdminSearchTerm):
+        config = create_smart_config(model)
+        assert not (config.can_add or config.can_edit or config.can_delete), model.__name__
+    assert create_smart_config(User).can_delete
+
+
+def test_unknown_action_is_rejected():
+    with pytest.raises(ValueError):
+        asyncio.run(run_action("userstat", _config(UserStat), "archive", None))
+
+
+def test_bulk_user_actions_keep_derived_state_in_sync(db, monkeypatch):
+    """Signalsiz bulk UPDATE'dan keyin hisoblagichlar, outbox, qidiruv indeksi, kesh,
+    snapshot va leaderboard ham yangilanadi."""
+    leaderboard = Leaderboard()
+    monkeypatch.setattr(user_bulk, "leaderboard", leaderboard)
+
+    async def main():
+        await WebhookSubscription.create(
+            url="http://hook.test", events=f"{USER_UPDATED},{USER_DEACTIVATED}", secret="s" * 16
+        )
+        a, b, c = [
+            await User.create(username=name, email=f"{name}@example.com", password_hash="-", rating=rating)
+            for name, rating in (("a", 3.0), ("b", 2.0), ("c", 1.0))
+        ]
+        for user in (a, b, c):
+            await AdminSearchTerm.create(term=user.username, model="user", object_id=str(user.id))
+            response_cache.set(f"profile:{user.id}", Response(b"{}"), tags=[user_tag(user.id)])
+        await leaderboard.seed()
+
+        deactivated = await set_users_active(User.filter(id__in=[a.id, b.id]), False)
+        repeated = await set_users_active(User.filter(id__in=[a.id, b.id]), False)
+        deleted = await soft_delete_users(User.filter(id__in=[b.id, c.id]))
+
+        snapshot = await User.with_deleted().get(id=a.id).values_list("profile_snapshot", flat=True)
+        return {
+            "ids": (a.id, b.id, c.id),
+            "counts": (deactivated, repeated, deleted),
+            "stats": dict(await UserStat.filter(key__in=[TOTAL, ACTIVE]).values_list("key", "value")),
+            "outbox": await WebhookOutbox.all().order_by("id").values_list("event", "user_id"),
+            "terms": await AdminSearchTerm.all().values_list("object_id", flat=True),
+            "cached": [response_cache.get(f"profile:{user.id}") is not None for user in (a, b, c)],
+            "snapshot": orjson.loads(snapshot),
+            "ranks": [leaderboard.rank_of(user.id) for user in (a, b, c)],
+        }
+
+    result = db(main)
+    a, b, c = result["ids"]
+
+    assert result["counts"] == (2, 0, 2)
+    assert result["stats"] == {TOTAL: 1, ACTIVE: 0}
+    # b soft-delete paytida allaqachon faolsiz - user.updated
+    assert sorted(result["outbox"]) == sorted([
+        (USER_DEACTIVATED, a), (USER_DEACTIVATED, b), (USER_UPDATED, b), (USER_DEACTIVATED, c),
+    ])
+    assert set(result["terms"]) == {str(a)}
+    assert result["cached"] == [False, False, False]
+    assert result["snapshot"]["is_active"] is False
+    assert result["ranks"] == [(1, 3.0), None, None]
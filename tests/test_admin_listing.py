@@ -0,0 +1,84 @@
+"""
+Admin ro'yxat proyeksiyasi testlari.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.admin.listing import decode_keys, list_columns, ordering_keys, paginate
+from app.core.cursor import CursorError, encode_cursor
+from app.admin.registry import AdminConfig
+from app.models.stats import UserStat
+from app.models.user import User
+
+
+def _config(model, list_display):
+    return AdminConfig(model=model, name=model.__name__, name_plural=model.__name__, list_display=list_display)
+
+
+def test_only_list_display_columns_and_pk_are_selected():
+    columns = list_columns(_config(User, ["id", "username", "is_active"]))
+    assert columns == {"pk": "id", "id": "id", "username": "username", "is_active": "is_active"}
+    assert "bio" not in columns.values()
+
+
+def test_unknown_fields_are_skipped_and_custom_pk_is_used():
+    assert list_columns(_config(UserStat, ["id", "value"])) == {"pk": "key", "value": "value"}
+
+
+def test_computed_fields_need_full_objects():
+    assert list_columns(_config(User, ["id", "is_deleted"])) is None
+
+
+def test_ordering_keys_end_with_primary_key():
+    assert ordering_keys(User, ["-pk"]) == [("id", True)]
+    assert ordering_keys(User, []) == [("id", True)]
+    assert ordering_keys(User, ["created_at"]) == [("created_at", False), ("id", False)]
+    # NULL bo'lishi mumkin bo'lgan maydonlar ham qoladi (NULL'lar oxirida tartiblanadi)
+    assert ordering_keys(User, ["-last_login", "-id", "username"]) == [("last_login", True), ("id", True)]
+
+
+def test_cursor_values_are_converted_to_field_types():
+    keys = [("created_at", True), ("id", True)]
+    created_at = datetime(2026, 10, 19, 13, 45, tzinfo=timezone.utc)
+    assert decode_keys(User, keys, encode_cursor(created_at, 7)) == [created_at, 7]
+    with pytest.raises(CursorError):
+        decode_keys(User, keys, encode_cursor(7))
+    with pytest.raises(CursorError):
+        decode_keys(User, keys, encode_cursor("kecha", 7))
+
+
+def test_nullable_ordering_field_pages_with_nulls_last(db):
+    """`-last_login` bo'yicha: avval qiymatlilar (kamayish), keyin NULL'lar (id kamayish)."""
+    keys = ordering_keys(User, ["-last_login"])
+    base = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+    async def fetch(query):
+        return await query.values("id", "username", "last_login")
+
+    async def main():
+        logins = [None, base, None, base + timedelta(hours=1), base, None]
+        for i, last_login in enumerate(logins):
+            await User.create(username=f"u{i}", email=f"u{i}@example.com", password_hash="-", last_login=last_login)
+
+        forward, after = [], None
+        while True:
+            page = await paginate(User.all(), keys, 1, fetch, after=after)
+            forward += [row["username"] for row in page.rows]
+            if not page.has_next:
+                break
+            after = page.next_cursor
+
+        backward, before = [], page.prev_cursor
+        while before:
+            page = await paginate(User.all(), keys, 2, fetch, before=before)
+            backward = [row["username"] for row in page.rows] + backward
+            before = page.prev_cursor
+        return forward, backward
+
+    forward, backward = db(main)
+
+    expected = ["u3", "u4", "u1", "u5", "u2", "u0"]
+    assert forward == expected
+    assert backward == expected[:-1]
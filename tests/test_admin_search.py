@@ -0,0 +1,76 @@
+"""
+Admin global qidiruvi testlari - so'zlarga ajratish va ball hisoblash.
+"""
+
+from app.admin.registry import AdminConfig
+from app.models.user import User
+from app.services import admin_search
+
+
+CONFIG = AdminConfig(model=User, name="User", name_plural="Users", search_fields=["username", "email", "first_name"])
+
+
+def test_tokenize_splits_on_punctuation_and_casefolds():
+    assert admin_search.tokenize("John_Doe@Mail.UZ") == {"john", "doe", "mail", "uz"}
+    assert admin_search.tokenize(None) == set()
+    assert admin_search.query_terms("a Jo  doe") == ["doe"]
+
+
+def test_first_search_field_weighs_most():
+    terms = admin_search.document_terms(CONFIG, {"username": "ali", "email": "ali@mail.uz", "first_name": "Vali"})
+    assert terms == {"ali": 3, "mail": 2, "uz": 2, "vali": 1}
+
+
+def test_search_requires_every_term_and_prefers_exact_matches(db):
+    """Ballar va guruhlash bazada: barcha so'zlar mos kelishi kerak, to'liq moslik og'irroq."""
+    from app.admin.registry import AdminRegistry
+    from app.models.search import AdminSearchTerm
+
+    registry = AdminRegistry()
+    registry.register(User, CONFIG)
+    index = admin_search.AdminSearchIndex(registry)
+    model_name = next(iter(index.searchable()))
+
+    async def main():
+        users = [
+            await User.create(username=name, email=f"{name}@example.com", password_hash="-")
+            for name in ("u1", "u2", "u3")
+        ]
+        ids = [str(user.id) for user in users]
+        await AdminSearchTerm.bulk_create([
+            AdminSearchTerm(term=term, model=model_name, object_id=ids[doc], weight=weight)
+            for term, doc, weight in (
+                ("john", 0, 3), ("doe", 0, 3),
+                ("johnny", 1, 3),
+                ("johanna", 2, 1), ("doe", 2, 1),
+            )
+        ])
+        return ids, [
+            [(hit["id"], hit["score"]) for group in await index.search(query, per_model=per_model)
+             for hit in group["results"]]
+            for query, per_model in (("doe john", 10), ("joh", 10), ("joh", 2), ("jo", 10))
+        ], (await index.search("joh", per_model=2))[0]["total"]
+
+    ids, (both, prefix, capped, short), total = db(main)
+
+    assert both == [(ids[0], 18)]
+    assert prefix == [(ids[0], 3), (ids[1], 3), (ids[2], 1)]
+    assert capped == prefix[:2] and total == 3
+    # Juda qisqa prefiks - qidirilmaydi
+    assert short == []
+
+
+def test_fast_growing_tables_are_not_indexed():
+    """LoginAttempt kabi jadvallar indekslanmaydi - login yo'lida indeks yozuvlari yo'q."""
+    from app.admin.autodiscovery import create_smart_config
+    from app.admin.registry import AdminRegistry
+    from app.models.admin_security import LoginAttempt
+
+    config = create_smart_config(LoginAttempt)
+    config.search_fields = ["user_agent"]
+    registry = AdminRegistry()
+    registry.register(LoginAttempt, config)
+    registry.register(User, AdminConfig(model=User, name="User", name_plural="Users", search_fields=["username"]))
+
+    assert config.global_search is False
+    assert list(admin_search.AdminSearchIndex(registry).searchable()) == ["user"]
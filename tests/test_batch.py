@@ -0,0 +1,29 @@
+"""
+Batch API testlari - operatsiyalarni guruhlash va yo'l tekshiruvi.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.batch import BatchOperationIn, _group_operations, _validate_operation
+
+
+def test_consecutive_reads_are_grouped():
+    """Ketma-ket GET'lar bitta guruhda, yozishlar alohida."""
+    operations = [
+        BatchOperationIn(path="/api/v1/auth/me"),
+        BatchOperationIn(path="/api/v1/users/1"),
+        BatchOperationIn(method="PUT", path="/api/v1/users/1", body={}),
+        BatchOperationIn(path="/api/v1/users/1"),
+        BatchOperationIn(method="head", path="/api/v1/users/2"),
+    ]
+
+    assert _group_operations(operations) == [[0, 1], [2], [3, 4]]
+
+
+@pytest.mark.parametrize("path", ["http://evil/api/v1/users", "/admin/users", "/api/v1/batch"])
+def test_rejects_foreign_and_nested_paths(path):
+    """Tashqi host, API'dan tashqari va ichma-ich batch yo'llari rad etiladi."""
+    with pytest.raises(HTTPException) as exc_info:
+        _validate_operation(BatchOperationIn(path=path))
+    assert exc_info.value.status_code == 400
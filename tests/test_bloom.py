@@ -0,0 +1,27 @@
+"""
+Bloom filter testlari.
+"""
+
+from app.core.bloom import BloomFilter
+
+
+def test_no_false_negatives_and_low_false_positive_rate():
+    """Qo'shilgan qiymat doim topiladi, begonalar kamdan-kam."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user_{i}")
+
+    assert all(f"user_{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other_{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_duplicate_add_does_not_grow_count():
+    """Bir qiymatni qayta qo'shish sig'imni band qilmaydi."""
+    bloom = BloomFilter(capacity=2)
+    bloom.add("alice")
+    bloom.add("alice")
+    bloom.add("bob")
+
+    assert bloom.count == 2
+    assert not bloom.is_saturated
@@ -0,0 +1,201 @@
+"""
+Response kesh testlari - TTL, LRU, tag bo'yicha invalidatsiya va single-flight.
+"""
+
+import asyncio
+
+from fastapi import Response
+from starlette.requests import Request
+
+from app.core.cache import ResponseCache, coalescing_enabled
+from app.core.singleflight import SingleFlight
+
+
+def _response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def test_lru_eviction():
+    """Chegaradan oshganda eng eski ishlatilgan yozuv chiqariladi."""
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set("a", _response(b"1"))
+    cache.set("b", _response(b"2"))
+    assert cache.get("a") is not None  # "a" endi eng yangi
+    cache.set("c", _response(b"3"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    """Muddati o'tgan yozuv qaytarilmaydi."""
+    cache = ResponseCache(max_entries=10, ttl=0)
+    cache.set("a", _response(b"1"))
+
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_tag_invalidation_and_hit_ratio():
+    """Faqat tegishli tag'dagi yozuvlar bekor qilinadi."""
+    cache = ResponseCache(max_entries=10, ttl=60)
+    cache.set("user-1", _response(b"1"), tags=["user:1"])
+    cache.set("user-2", _response(b"2"), tags=["user:2"])
+    cache.set("list", _response(b"[]"), tags=["users:list"])
+
+    assert cache.invalidate_tags("user:1", "users:list") == 2
+    assert cache.get("user-1") is None
+    assert cache.get("user-2") is not None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_single_flight_shares_one_execution():
+    """Bir xil kalitli parallel chaqiruvlar bitta hisoblashni bo'lishadi."""
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("user:1", compute) for _ in range(4)))
+
+    results = asyncio.run(main())
+
+    assert calls == [1]
+    assert [shared for _, shared in results] == [False, True, True, True]
+    assert flight.stats()["coalesced"] == 3
+
+
+def test_invalidation_during_producer_skips_store():
+    """Producer ishlayotganda tag bekor qilinsa, eskirgan javob keshga yozilmaydi."""
+    cache = ResponseCache(max_entries=10, ttl=60)
+    request = Request({"type": "http", "method": "GET", "path": "/users/1", "query_string": b"", "headers": []})
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def producer():
+        started.set()
+        await release.wait()
+        return _response(b"old")
+
+    async def main():
+        task = asyncio.create_task(cache.respond(request, "anonymous", producer, tags=["user:1"]))
+        await started.wait()
+        cache.invalidate_tags("user:1")
+        release.set()
+        return await task
+
+    response = asyncio.run(main())
+
+    assert response.body == b"old"
+    assert response.headers["X-Cache"] == "BYPASS"
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["stale_skips"] == 1
+
+    # Boshqa tag'dagi yozuvlar va keyingi so'rovlar odatdagidek keshlanadi
+    assert cache.set("other", _response(b"1"), tags=["user:2"], since=0)
+    response = asyncio.run(cache.respond(request, "anonymous", producer, tags=["user:1"]))
+    assert response.headers["X-Cache"] == "MISS"
+    assert cache.get(cache.build_key(request, "anonymous")).body == b"old"
+
+
+def test_coalescing_can_be_disabled_per_context():
+    """`coalescing_enabled=False` kontekstidagi so'rov tashqi leader'ni kutmaydi."""
+    cache = ResponseCache(max_entries=10, ttl=60)
+    request = Request({"type": "http", "method": "GET", "path": "/users/1", "query_string": b"", "headers": []})
+    release = asyncio.Event()
+    calls = []
+
+    async def slow():
+        calls.append("leader")
+        await release.wait()
+        return _response(b"1")
+
+    async def fast():
+        calls.append("own")
+        return _response(b"1")
+
+    async def isolated():
+        coalescing_enabled.set(False)
+        return await cache.respond(request, "anonymous", fast, coalesce=True)
+
+    async def main():
+        leader = asyncio.create_task(cache.respond(request, "anonymous", slow, coalesce=True))
+        await asyncio.sleep(0)
+        own = await asyncio.create_task(isolated())
+        release.set()
+        await leader
+        return own
+
+    response = asyncio.run(main())
+
+    assert calls == ["leader", "own"]
+    assert response.headers["X-Cache"] == "MISS"
+
+
+def test_user_cache_is_invalidated_after_commit(db, monkeypatch):
+    """`User.save()`/`delete()` keshni o'z tranzaksiyasi commit bo'lgandan keyin tozalaydi."""
+    from tortoise import Tortoise
+    from tortoise.backends.base.client import TransactionalDBClient
+
+    from app.models.user import User
+    from app.services import user_cache
+
+    cache = ResponseCache(max_entries=10, ttl=60)
+    in_transaction_calls = []
+    invalidate_tags = cache.invalidate_tags
+
+    def spy(*tags):
+        in_transaction_calls.append(isinstance(Tortoise.get_connection("default"), TransactionalDBClient))
+        return invalidate_tags(*tags)
+
+    cache.invalidate_tags = spy
+    monkeypatch.setattr(user_cache, "response_cache", cache)
+
+    async def main():
+        user = await User.create(username="cached", email="cached@example.com", password_hash="-")
+        cache.set("profile", _response(b"old"), tags=[user_cache.user_tag(user.id)])
+        user.first_name = "Ali"
+        await user.save()
+        await user.delete()
+
+    db(main)
+
+    assert in_transaction_calls == [False, False, False]
+    assert cache.get("profile") is None
+
+
+def test_metrics_endpoint_requires_superuser(db):
+    """`/metrics` ichki holatni ochadi - token'siz va oddiy user uchun yopiq."""
+    import httpx
+
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.models.user import User
+
+    async def main():
+        regular = await User.create(username="regular", email="regular@example.com", password_hash="-")
+        admin = await User.create(
+            username="root", email="root@example.com", password_hash="-", is_superuser=True
+        )
+        statuses = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            statuses.append((await client.get("/metrics")).status_code)
+            for user in (regular, admin):
+                app.dependency_overrides[get_current_user] = lambda user=user: {"user_id": user.id}
+                statuses.append((await client.get("/metrics")).status_code)
+        return statuses
+
+    try:
+        anonymous, regular, admin = db(main)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    assert anonymous in (401, 403)
+    assert regular == 403
+    assert admin == 200
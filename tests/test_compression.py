@@ -0,0 +1,134 @@
+"""
+Siqish testlari - encoding tanlash, kichik/siqilmaydigan body'lar, streaming, Vary va
+oldindan siqilgan static fayllar.
+"""
+
+import asyncio
+import gzip
+import zlib
+
+from starlette.responses import Response, StreamingResponse
+
+from app.core.compression import (
+    PRECOMPRESS_LEVELS,
+    CompressionMiddleware,
+    PrecompressedStaticFiles,
+    select_encoding,
+)
+
+
+TEXT = b"salom dunyo " * 200
+
+
+def _scope(accept_encoding: str = "gzip", path: str = "/") -> dict:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+    }
+
+
+def _call(app, scope: dict) -> list:
+    """ASGI ilovani chaqirib, yuborilgan xabarlarni qaytarish."""
+    messages = []
+
+    async def receive():
+        # Klient uzilmaydi - StreamingResponse'ning disconnect kuzatuvchisi shu yerda kutadi
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def _headers(messages: list) -> dict:
+    return {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+
+
+def _body(messages: list) -> bytes:
+    return b"".join(message.get("body", b"") for message in messages[1:])
+
+
+def test_select_encoding():
+    """Server afzalligi, q=0 va wildcard hisobga olinadi."""
+    encodings = ["zstd", "br", "gzip"]
+    assert select_encoding("gzip, br", encodings) == "br"
+    assert select_encoding("br;q=0, gzip", encodings) == "gzip"
+    assert select_encoding("*", ["gzip"]) == "gzip"
+    assert select_encoding("identity", encodings) is None
+    assert select_encoding("", encodings) is None
+
+
+def test_dynamic_levels_stay_fast():
+    """Middleware har bir so'rovda siqadi - maksimal darajalar faqat compress_static'da."""
+    app = CompressionMiddleware(Response(TEXT), encodings=["gzip"])
+    for content_type in ("text/css; charset=utf-8", "application/javascript", "application/json"):
+        for encoding, limit in (("gzip", 6), ("br", 5), ("zstd", 6)):
+            assert app.get_level(encoding, content_type) <= limit < PRECOMPRESS_LEVELS[encoding]
+
+
+def test_compresses_text_response_and_sets_vary():
+    app = CompressionMiddleware(Response(TEXT, media_type="text/plain"), encodings=["gzip"])
+    messages = _call(app, _scope("gzip"))
+    headers = _headers(messages)
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(_body(messages))
+    assert gzip.decompress(_body(messages)) == TEXT
+
+
+def test_small_and_incompressible_bodies_are_untouched():
+    small = CompressionMiddleware(Response(b"ok", media_type="text/plain"), encodings=["gzip"])
+    image = CompressionMiddleware(Response(TEXT, media_type="image/png"), encodings=["gzip"])
+    no_accept = CompressionMiddleware(Response(TEXT, media_type="text/plain"), encodings=["gzip"])
+
+    for app, accept, body in ((small, "gzip", b"ok"), (image, "gzip", TEXT), (no_accept, "", TEXT)):
+        messages = _call(app, _scope(accept))
+        assert "content-encoding" not in _headers(messages)
+        assert _body(messages) == body
+
+
+def test_streaming_body_is_compressed_chunk_by_chunk():
+    async def chunks():
+        for _ in range(3):
+            yield TEXT
+
+    app = CompressionMiddleware(StreamingResponse(chunks(), media_type="text/plain"), encodings=["gzip"])
+    messages = _call(app, _scope("gzip"))
+    headers = _headers(messages)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    # Har bir chunk alohida yuboriladi (butun javob buferlanmaydi)
+    assert len([message for message in messages[1:] if message.get("body")]) >= 3
+    assert zlib.decompress(_body(messages), 31) == TEXT * 3
+
+
+def test_precompressed_static_variant_selection(tmp_path):
+    (tmp_path / "app.css").write_bytes(TEXT)
+    (tmp_path / "app.css.gz").write_bytes(gzip.compress(TEXT))
+    (tmp_path / "plain.css").write_bytes(TEXT)
+    app = PrecompressedStaticFiles(directory=str(tmp_path))
+
+    messages = _call(app, _scope("gzip", "/app.css"))
+    headers = _headers(messages)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-type"].startswith("text/css")
+    assert "Accept-Encoding" in headers["vary"]
+    assert gzip.decompress(_body(messages)) == TEXT
+
+    # Klient gzip qabul qilmaydi yoki variant yo'q - asl fayl, lekin Vary bilan
+    for accept, path in (("identity", "/app.css"), ("gzip", "/plain.css")):
+        messages = _call(app, _scope(accept, path))
+        headers = _headers(messages)
+        assert "content-encoding" not in headers
+        assert "Accept-Encoding" in headers["vary"]
+        assert _body(messages) == TEXT
@@ -0,0 +1,22 @@
+"""
+Cursor kodlash testlari.
+"""
+
+import pytest
+
+from app.core.cursor import CursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_roundtrip():
+    """Kodlangan cursor o'sha qiymatlarni qaytaradi."""
+    cursor = encode_cursor("2026-01-01T10:00:00+00:00", 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-01-01T10:00:00+00:00", 42]
+
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_cursor(1, 2, 3), "!!!"])
+def test_invalid_cursor(cursor):
+    """Buzilgan yoki boshqa o'lchamdagi cursor rad etiladi."""
+    with pytest.raises(CursorError):
+        decode_cursor(cursor, 2)
@@ -0,0 +1,107 @@
+"""
+DataLoader testlari - bir tick'dagi yuklashlarni batch qilish.
+"""
+
+import asyncio
+
+from app.core.dataloader import DataLoader
+
+
+def _loader(calls, max_batch_size=500):
+    async def batch_fn(keys):
+        calls.append(list(keys))
+        return {key: f"user-{key}" for key in keys if key != 404}
+    return DataLoader(batch_fn, max_batch_size=max_batch_size)
+
+
+def test_concurrent_loads_share_one_batch():
+    """Parallel load() chaqiruvlari bitta batch_fn chaqiruviga yig'iladi."""
+    calls = []
+    loader = _loader(calls)
+
+    async def main():
+        return await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert asyncio.run(main()) == ["user-1", "user-2", "user-1"]
+    assert calls == [[1, 2]]
+    assert loader.stats()["batches"] == 1
+
+
+def test_load_many_keeps_order_and_reports_missing():
+    """Natijalar so'ralgan tartibda, topilmaganlari None."""
+    calls = []
+    loader = _loader(calls, max_batch_size=2)
+
+    async def main():
+        return await loader.load_many([3, 404, 1])
+
+    assert asyncio.run(main()) == ["user-3", None, "user-1"]
+    assert calls == [[3, 404], [1]]
+
+
+def test_batch_tasks_are_held_until_done():
+    """Batch task'iga kuchli havola saqlanadi va tugagach o'chiriladi."""
+    import gc
+
+    release = None
+
+    async def batch_fn(keys):
+        await release.wait()
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_fn)
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        future = loader._enqueue(1)
+        await asyncio.sleep(0)
+        in_flight = len(loader._tasks)
+        gc.collect()
+        release.set()
+        value = await future
+        # done callback'lar keyingi tick'da
+        for _ in range(2):
+            await asyncio.sleep(0)
+        return in_flight, value, len(loader._tasks)
+
+    assert asyncio.run(main()) == (1, 1, 0)
+
+
+def test_clone_gives_each_caller_its_own_value():
+    """`clone` berilsa, bir xil kalitni so'ragan chaqiruvchilar alohida nusxa oladi."""
+    async def batch_fn(keys):
+        return {key: {"id": key} for key in keys if key != 404}
+
+    loader = DataLoader(batch_fn, clone=dict)
+
+    async def main():
+        return await asyncio.gather(loader.load(1), loader.load(1), loader.load(404))
+
+    first, second, missing = asyncio.run(main())
+    first["id"] = 2
+
+    assert second == {"id": 1}
+    assert missing is None
+
+
+def test_user_loader_batches_per_connection(db):
+    """Tranzaksiya ichidagi chaqiruvlar tashqi so'rovlar bilan bitta batch'ga tushmaydi."""
+    from tortoise.transactions import in_transaction
+
+    from app.models.user import User
+    from app.services.user_loader import user_loader
+
+    async def main():
+        user = await User.create(username="loader", email="loader@example.com", password_hash="-")
+        outside = asyncio.ensure_future(user_loader.load(user.id))
+        async with in_transaction():
+            first, second = await asyncio.gather(user_loader.load(user.id), user_loader.load(user.id))
+        return user, await outside, first, second, user_loader.stats()
+
+    user, outside, first, second, stats = db(main)
+
+    assert outside.id == first.id == second.id == user.id
+    assert len({id(outside), id(first), id(second)}) == 3
+    assert first._loaded_values is not second._loaded_values
+    assert stats["batches"] == 2
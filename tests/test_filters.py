@@ -0,0 +1,108 @@
+"""
+Filter/ordering DSL testlari - parsing, operatorlar, whitelist va /users dagi himoyalar.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.api import user as user_api
+from app.api.user import USER_FILTERS
+from app.core.filters import FilterError, parse_bool, parse_datetime, parse_decimal
+from app.core.security import get_current_user
+from app.main import app
+from app.models.user import User
+
+
+def _lookups(params: dict) -> dict:
+    compiled = USER_FILTERS.compile(params)
+    return {lookup: parser(params[param]) for param, lookup, parser in compiled.lookups}
+
+
+def test_parsers():
+    assert parse_bool("ha") is True
+    assert parse_bool("False") is False
+    assert parse_datetime("2025-01-01T10:00:00Z") == datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    assert parse_decimal("12.50") == Decimal("12.50")
+    for parser, value in ((parse_bool, "maybe"), (parse_decimal, "NaN"), (parse_decimal, "abc")):
+        with pytest.raises(ValueError):
+            parser(value)
+
+
+def test_range_and_isnull_operators():
+    lookups = _lookups({
+        "created_at__gte": "2025-01-01T00:00:00",
+        "balance__lt": "10.5",
+        "age__isnull": "true",
+        "is_active": "false",
+        "page": "2",
+    })
+
+    assert lookups == {
+        "created_at__gte": datetime(2025, 1, 1),
+        "balance__lt": Decimal("10.5"),
+        "age__isnull": True,
+        "is_active": False,
+    }
+
+
+def test_rejected_fields_and_operators():
+    for params in (
+        {"password_hash": "x"},  # whitelist'da yo'q
+        {"is_active__gt": "true"},  # operatorga ruxsat yo'q
+        {"balance__isnull": "true"},  # nullable emas
+        {"order": "email"},  # tartiblashga ruxsat yo'q
+    ):
+        with pytest.raises(FilterError):
+            USER_FILTERS.compile(params)
+
+
+def test_ordering_tiebreaker_and_unindexed_flag():
+    assert USER_FILTERS.compile({"order": "-rating"}).ordering == ["-rating", "id"]
+    assert USER_FILTERS.compile({"order": "-rating"}).unindexed_sort is False
+    assert USER_FILTERS.compile({"order": "age"}).unindexed_sort is True
+    # ("updated_at", "id") indeksi - /users/changes bilan bir xil
+    assert USER_FILTERS.compile({"order": "-updated_at"}).unindexed_sort is False
+    # Bir xil shakl bir marta kompilyatsiya qilinadi
+    assert USER_FILTERS.compile({"order": "age"}) is USER_FILTERS.compile({"order": "age"})
+
+
+def test_users_endpoint_rejects_bad_filters(db, monkeypatch):
+    """Noma'lum filter/ordering va katta jadvalda indekssiz tartiblash - 400."""
+    monkeypatch.setattr(user_api, "UNINDEXED_SORT_MAX_ROWS", 2)
+    app.dependency_overrides[get_current_user] = lambda: {"payload": {}}
+
+    async def main():
+        await User.bulk_create([
+            User(username=f"filter_{i}", email=f"filter_{i}@example.com", password_hash="-", age=20 + i)
+            for i in range(3)
+        ])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            return {
+                name: await client.get("/api/v1/users/", params=params)
+                for name, params in {
+                    "unknown_field": {"nope": "1"},
+                    "unknown_order": {"order": "password_hash"},
+                    "bad_value": {"age__gte": "x"},
+                    "unindexed_large": {"order": "age"},
+                    "unindexed_small": {"order": "-age", "age__gte": "21"},
+                    "indexed": {"order": "-created_at"},
+                }.items()
+            }
+
+    try:
+        responses = db(main)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    for name in ("unknown_field", "unknown_order", "bad_value", "unindexed_large"):
+        assert responses[name].status_code == 400, name
+    assert "Indekssiz" in responses["unindexed_large"].json()["detail"]
+
+    assert responses["unindexed_small"].status_code == 200
+    usernames = [user["username"] for user in responses["unindexed_small"].json()["data"]]
+    assert usernames == ["filter_2", "filter_1"]
+    assert responses["indexed"].status_code == 200
@@ -0,0 +1,49 @@
+"""
+Idempotency-Key testlari - replay va bir vaqtdagi dublikatlar.
+"""
+
+import asyncio
+
+from fastapi import Request, Response
+
+from app.core.idempotency import IDEMPOTENCY_REPLAYED_HEADER, IdempotencyStore
+
+
+def _request(key: str, body: bytes) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/auth/register",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"content-type", b"application/json")],
+    }
+    return Request(scope, receive)
+
+
+def test_concurrent_duplicates_run_once():
+    """Dublikatlar bajarilayotgan so'rovni kutadi, keyingisi saqlangan javobni oladi."""
+    store = IdempotencyStore(max_entries=10, ttl=60)
+    calls = []
+
+    async def producer():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return Response(content=b'{"id":1}', status_code=201, media_type="application/json")
+
+    async def main():
+        first = await asyncio.gather(*(
+            store.run(_request("k1", b'{"a":1}'), "anonymous", producer) for _ in range(3)
+        ))
+        replay = await store.run(_request("k1", b'{"a":1}'), "anonymous", producer)
+        return first, replay
+
+    first, replay = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert [r.status_code for r in first] == [201, 201, 201]
+    assert replay.body == b'{"id":1}'
+    assert replay.headers[IDEMPOTENCY_REPLAYED_HEADER] == "true"
+    assert store.stats()["waits"] == 2
@@ -0,0 +1,61 @@
+"""
+Ledger testlari - summa va o'tkazma validatsiyasi, balans o'zgarishlari sinxronizatsiyasi.
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from app.services import ledger
+
+
+def test_to_money_rejects_sub_cent_precision():
+    """2 xonadan ortiq kasr yo'qotilmaydi, xato qaytariladi."""
+    assert ledger.to_money("12.3") == Decimal("12.30")
+    assert ledger.to_money(5) == Decimal("5.00")
+    with pytest.raises(ledger.LedgerError):
+        ledger.to_money("0.001")
+
+
+@pytest.mark.parametrize("from_id, to_id, amount", [(1, 2, "0"), (1, 2, "-5"), (3, 3, "1")])
+def test_invalid_transfer_is_rejected_before_posting(from_id, to_id, amount):
+    """Nol/manfiy summa va o'ziga o'tkazma tranzaksiya ochilmasdan rad etiladi."""
+    with pytest.raises(ledger.LedgerError):
+        asyncio.run(ledger.transfer(from_id, to_id, amount))
+
+
+def test_transfer_shows_up_in_changes_feed_and_outbox(db):
+    """Balans UPDATE'i `updated_at` ni yangilaydi va `user.updated` hodisasini yozadi."""
+    import httpx
+
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.models.user import User
+    from app.models.webhook import USER_UPDATED, WebhookOutbox, WebhookSubscription
+
+    app.dependency_overrides[get_current_user] = lambda: {"payload": {}}
+
+    async def main():
+        sender = await User.create(username="sender", email="sender@example.com", password_hash="-")
+        receiver = await User.create(username="receiver", email="receiver@example.com", password_hash="-")
+        await ledger.post_entries([ledger.Posting(sender.id, Decimal("10.00"))])
+        await WebhookSubscription.create(url="http://hook.test", events=USER_UPDATED, secret="s" * 16)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            cursor = (await client.get("/api/v1/users/changes")).json()["data"]["next_cursor"]
+            await ledger.transfer(sender.id, receiver.id, "2.50")
+            changes = (await client.get("/api/v1/users/changes", params={"cursor": cursor})).json()["data"]
+
+        outbox = await WebhookOutbox.all().order_by("user_id").values_list("event", "user_id")
+        return sender.id, receiver.id, changes, outbox
+
+    try:
+        sender_id, receiver_id, changes, outbox = db(main)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+    balances = {change["id"]: change["balance"] for change in changes["changes"]}
+    assert balances == {sender_id: "7.50", receiver_id: "2.50"}
+    assert outbox == [(USER_UPDATED, sender_id), (USER_UPDATED, receiver_id)]
@@ -0,0 +1,97 @@
+"""
+Profil rasmi saqlash testlari - format aniqlash, hajm chegarasi va hash bo'yicha dedup.
+"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from app.core.media_files import ContentAddressedFiles, etag_matches
+from app.services import media
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 1000
+
+
+async def _chunks(data: bytes, size: int = 256):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _store(data: bytes, root: str, max_bytes: int = 10_000) -> media.StoredImage:
+    return asyncio.run(media.store_image(_chunks(data), max_bytes=max_bytes, root=root))
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"\xff\xd8\xff\xe0", "jpg"),
+    (PNG[:16], "png"),
+    (b"GIF89a", "gif"),
+    (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "webp"),
+    (b"<svg>", None),
+])
+def test_sniff_image_type(head, expected):
+    assert media.sniff_image_type(head) == expected
+
+
+def test_same_content_is_stored_once(tmp_path):
+    """Bir xil rasm - bitta kontent manzilli fayl."""
+    first = _store(PNG, str(tmp_path))
+    second = _store(PNG, str(tmp_path))
+
+    digest = hashlib.sha256(PNG).hexdigest()
+    assert first.path == second.path == os.path.join("avatars", digest[:2], f"{digest}.png")
+    assert (first.deduplicated, second.deduplicated) == (False, True)
+    assert (tmp_path / first.path).read_bytes() == PNG
+    assert os.listdir(tmp_path / "avatars" / ".uploads") == []
+
+
+@pytest.mark.parametrize("data, error", [
+    (PNG * 20, media.MediaTooLarge),
+    (b"not an image" * 10, media.MediaError),
+])
+def test_rejected_upload_leaves_no_files(tmp_path, data, error):
+    with pytest.raises(error):
+        _store(data, str(tmp_path))
+    assert os.listdir(tmp_path / "avatars" / ".uploads") == []
+    assert sorted(os.listdir(tmp_path / "avatars")) == [".uploads"]
+
+
+def _serve(files: ContentAddressedFiles, path: str, headers=()) -> list:
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request"}
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "root_path": "",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+        "extensions": {}, "asgi": {"version": "3.0", "spec_version": "2.4"},
+    }
+    asyncio.run(files(scope, receive, send))
+    return messages
+
+
+def test_not_modified_without_touching_disk(tmp_path):
+    """Kontent manzilli faylda mos ETag - 304, fayl mavjudligi ham tekshirilmaydi."""
+    digest = hashlib.sha256(PNG).hexdigest()
+    files = ContentAddressedFiles(directory=str(tmp_path / "missing"))
+    start = _serve(files, f"/avatars/{digest[:2]}/{digest}_64.webp", [("if-none-match", f'W/"{digest}_64"')])[0]
+
+    assert start["status"] == 304
+    assert (b"etag", f'"{digest}_64"'.encode()) in start["headers"]
+    assert etag_matches(f'"x", "{digest}"', f'"{digest}"')
+
+
+def test_range_request_and_path_validation(tmp_path):
+    stored = _store(PNG, str(tmp_path))
+    files = ContentAddressedFiles(directory=str(tmp_path))
+
+    start, *body = _serve(files, f"/{stored.path}", [("range", "bytes=2-5")])
+    assert start["status"] == 206
+    assert b"".join(message.get("body", b"") for message in body) == PNG[2:6]
+    assert _serve(files, "/avatars/../../etc/passwd")[0]["status"] == 404
@@ -0,0 +1,74 @@
+"""
+MoneyField testlari - Decimal <-> minor unit (butun son) o'girish.
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.core.filters import parse_decimal
+from app.models.fields import MoneyField
+
+
+def test_decimal_round_trips_through_minor_units():
+    """Decimal/str bazaga butun son bo'lib yoziladi va aynan qaytib o'qiladi."""
+    field = MoneyField()
+
+    assert field.to_db_value(Decimal("12.34"), None) == 1234
+    assert field.to_db_value("-0.05", None) == -5
+    assert field.to_db_value(Decimal("99999999.99"), None) == 9999999999
+    assert field.to_python_value(1234) == Decimal("12.34")
+    assert field.to_python_value(-5) == Decimal("-0.05")
+    assert field.to_python_value(None) is None
+
+
+def test_python_int_is_major_units():
+    """Python'da berilgan int - asosiy birlik; faqat bazadan kelgan int - tiyin/sent."""
+    field = MoneyField()
+
+    assert field.to_minor(500) == 50000
+    assert field.to_db_value(500, None) == 50000
+    assert field.to_decimal(500) == Decimal("500.00")
+    assert field.to_python_value(500) == Decimal("5.00")
+    assert field.to_minor(Decimal("5")) == 500
+
+
+def test_model_constructor_keeps_major_units():
+    """`User(balance=500)` - 500.00 (konstruktor qiymatlari ham to_python_value'dan o'tadi)."""
+    from app.models.user import User
+
+    user = User(username="money", email="money@example.com", password_hash="-", balance=500)
+
+    assert user.balance == Decimal("500.00")
+    assert User._meta.fields_map["balance"].to_db_value(user.balance, user) == 50000
+
+
+def test_update_from_dict_keeps_major_units(db):
+    """`update_from_dict({"balance": 7})` - 7.00, atribut va `QuerySet.update()` bilan bir xil."""
+    from app.models.user import User
+
+    async def main():
+        user = await User.create(username="money", email="money@example.com", password_hash="-")
+        user.update_from_dict({"balance": 7})
+        await user.save()
+        saved = await User.get(id=user.id).values_list("balance", flat=True)
+
+        user.balance = 7
+        await user.save()
+        assigned = await User.get(id=user.id).values_list("balance", flat=True)
+
+        await User.filter(id=user.id).update(balance=7)
+        updated = (await User.get(id=user.id)).balance
+        return user.balance, saved, assigned, updated
+
+    in_memory, saved, assigned, updated = db(main)
+
+    assert in_memory == saved == assigned == updated == Decimal("7.00")
+
+
+def test_parse_decimal_rejects_non_finite():
+    """Filter qiymati: NaN/Infinity va noto'g'ri son - ValueError."""
+    assert parse_decimal(" 10.5 ") == Decimal("10.5")
+    for value in ("abc", "NaN", "Infinity"):
+        with pytest.raises(ValueError):
+            parse_decimal(value)
@@ -0,0 +1,48 @@
+"""
+Order-statistic indeks testlari.
+"""
+
+import random
+from bisect import bisect_left
+
+import pytest
+
+from app.core.ranking import OrderStatisticIndex
+
+
+def test_matches_sorted_list_under_random_updates():
+    """Qo'shish/o'chirishdan keyin rank, select va slice tartiblangan ro'yxat bilan bir xil."""
+    rng = random.Random(42)
+    index = OrderStatisticIndex(load=4)
+    expected = set()
+
+    for _ in range(2000):
+        key = rng.randint(0, 200)
+        if rng.random() < 0.6:
+            assert index.add(key) == (key not in expected)
+            expected.add(key)
+        else:
+            assert index.remove(key) == (key in expected)
+            expected.discard(key)
+
+        keys = sorted(expected)
+        assert len(index) == len(keys)
+        probe = rng.randint(-5, 205)
+        assert index.rank(probe) == bisect_left(keys, probe)
+        if keys:
+            position = rng.randrange(len(keys))
+            assert index.select(position) == keys[position]
+        start = rng.randint(0, len(keys))
+        assert index.slice(start, start + 5) == keys[start:start + 5]
+
+    assert list(index) == sorted(expected)
+
+
+def test_extend_sorted_requires_increasing_keys():
+    """Bazadan yuklash faqat o'suvchi tartibda."""
+    index = OrderStatisticIndex([(-5.0, 1), (-4.0, 2)])
+    index.extend_sorted([(-3.0, 3)])
+
+    assert index.rank((-3.0, 3)) == 2
+    with pytest.raises(ValueError):
+        index.extend_sorted([(-4.5, 4)])
@@ -0,0 +1,84 @@
+"""
+Serializatsiya testlari - orjson asosidagi ResponseFormatter yo'li.
+"""
+
+import json
+from datetime import datetime, date, timezone
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.core.serialization import (
+    dumps, FastJSONResponse, MSGPACK_MEDIA_TYPE, JSON_MEDIA_TYPE,
+    msgpack_dumps, msgpack_loads, negotiate_media_type,
+)
+from app.core.utils import ResponseFormatter, Utils
+
+
+class _Profile(BaseModel):
+    id: int
+    balance: Decimal
+    birth_date: Optional[date]
+    created_at: datetime
+
+
+def test_dumps_native_types():
+    """datetime, date, Decimal va Pydantic modellar to'g'ri kodlanishi."""
+    profile = _Profile(
+        id=1,
+        balance=Decimal("10.50"),
+        birth_date=date(2000, 1, 2),
+        created_at=datetime(2025, 7, 31, 11, 48, 7),
+    )
+    body = dumps({"data": profile, 5: "int key"})
+    decoded = json.loads(body)
+
+    assert decoded["data"]["balance"] == "10.50"
+    assert decoded["data"]["birth_date"] == "2000-01-02"
+    assert decoded["data"]["created_at"] == "2025-07-31T11:48:07"
+    assert decoded["5"] == "int key"
+
+
+def test_response_formatter_returns_encoded_bytes():
+    """ResponseFormatter.success tayyor bytes body qaytarishi."""
+    response = ResponseFormatter.success(data={"x": 1}, message="ok", status_code=201)
+
+    assert isinstance(response, FastJSONResponse)
+    assert response.status_code == 201
+    assert json.loads(response.body) == {"success": True, "message": "ok", "data": {"x": 1}}
+
+
+def test_paginated_envelope():
+    """Paginated javob envelope'i o'zgarmaganligini tekshirish."""
+    pagination = Utils.calculate_pagination(1, 10, 25)
+    response = ResponseFormatter.paginated(data=[], pagination=pagination)
+    decoded = json.loads(response.body)
+
+    assert decoded["success"] is True
+    assert decoded["pagination"]["total_pages"] == 3
+    assert decoded["data"] == []
+
+
+def test_msgpack_extension_types_roundtrip():
+    """MessagePack'da datetime, date va Decimal o'z turida qaytadi."""
+    profile = _Profile(
+        id=1,
+        balance=Decimal("10.50"),
+        birth_date=date(2000, 1, 2),
+        created_at=datetime(2025, 7, 31, 11, 48, 7),
+    )
+    decoded = msgpack_loads(msgpack_dumps({"data": profile}))
+
+    assert decoded["data"]["balance"] == Decimal("10.50")
+    assert decoded["data"]["birth_date"] == date(2000, 1, 2)
+    assert decoded["data"]["created_at"] == datetime(2025, 7, 31, 11, 48, 7, tzinfo=timezone.utc)
+
+
+def test_accept_negotiation():
+    """MessagePack faqat aniq so'ralganda va JSON'dan past bo'lmaganda tanlanadi."""
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/x-msgpack, */*;q=0.1") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/msgpack;q=0.5, application/json") == JSON_MEDIA_TYPE
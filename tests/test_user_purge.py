@@ -0,0 +1,129 @@
+"""
+Soft-delete va purge testlari - standart scope, `with_deleted()`, saqlash muddati va batch'lar.
+"""
+
+from datetime import timedelta
+
+from app.core.datetime_utils import utc_now
+from app.models.admin_security import AdminSecurity, DeviceBlock, LoginAttempt, PendingVerification
+from app.models.user import User
+from app.services.user_purge import purge_deleted_users
+
+
+async def _user(name: str, deleted_days_ago=None) -> User:
+    user = await User.create(username=name, email=f"{name}@example.com", password_hash="-")
+    if deleted_days_ago is not None:
+        deleted_at = utc_now() - timedelta(days=deleted_days_ago)
+        await User.with_deleted().filter(id=user.id).update(deleted_at=deleted_at, is_active=False)
+    return user
+
+
+async def _dependents(user: User) -> None:
+    attempt = await LoginAttempt.create(user=user, ip_address="127.0.0.1", user_agent="test")
+    await DeviceBlock.create(user=user, ip_address="127.0.0.1", user_agent="test", reason="test")
+    await PendingVerification.create(
+        user=user,
+        verification_code=f"code-{user.id}",
+        attempt_id=attempt.id,
+        expires_at=utc_now() + timedelta(minutes=5),
+    )
+    await AdminSecurity.create(user=user)
+
+
+def test_live_manager_hides_soft_deleted_users(db):
+    async def main():
+        alive = await _user("alive")
+        gone = await _user("gone")
+        await gone.soft_delete()
+        return (
+            alive.id,
+            gone.id,
+            await User.all().values_list("id", flat=True),
+            await User.get_or_none(id=gone.id),
+            await User.with_deleted().filter(id=gone.id).first(),
+            await User.with_deleted().count(),
+        )
+
+    alive_id, gone_id, live_ids, hidden, found, total = db(main)
+
+    assert live_ids == [alive_id]
+    assert hidden is None
+    assert found.id == gone_id and found.deleted_at is not None and found.is_active is False
+    assert total == 2
+
+
+def test_purge_respects_retention_and_batches(db):
+    async def main():
+        first = await _user("old_1", deleted_days_ago=40)
+        second = await _user("old_2", deleted_days_ago=40)
+        recent = await _user("recent", deleted_days_ago=5)
+        alive = await _user("alive")
+        for user in (first, second, recent, alive):
+            await _dependents(user)
+
+        # batch_size=1, max_batches=1 - faqat eng kichik id'li muddati o'tgan user
+        one_batch = await purge_deleted_users(retention_days=30, batch_size=1, max_batches=1)
+        after_one = await User.with_deleted().order_by("id").values_list("username", flat=True)
+        rest = await purge_deleted_users(retention_days=30, batch_size=1)
+
+        remaining = {
+            model.__name__: sorted(await model.all().values_list("user_id", flat=True))
+            for model in (LoginAttempt, DeviceBlock, PendingVerification, AdminSecurity)
+        }
+        return (
+            one_batch,
+            after_one,
+            rest,
+            await User.with_deleted().order_by("id").values_list("username", flat=True),
+            remaining,
+            sorted([recent.id, alive.id]),
+        )
+
+    one_batch, after_one, rest, usernames, remaining, kept_ids = db(main)
+
+    assert one_batch == {
+        "LoginAttempt": 1, "DeviceBlock": 1, "PendingVerification": 1, "AdminSecurity": 1, "User": 1,
+    }
+    assert after_one == ["old_2", "recent", "alive"]
+    assert rest["User"] == 1 and rest["LoginAttempt"] == 1
+    assert usernames == ["recent", "alive"]
+    assert all(user_ids == kept_ids for user_ids in remaining.values())
+
+
+def test_admin_delete_endpoints_soft_delete_users(db):
+    """Admin paneldagi bitta user o'chirish endpointlari ham soft-delete qiladi."""
+    from types import SimpleNamespace
+
+    import httpx
+
+    from app.admin import get_current_admin_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_admin_user] = lambda: SimpleNamespace(id=0)
+
+    async def main():
+        first = await _user("first")
+        second = await _user("second")
+        await _dependents(first)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+            statuses = [
+                (await client.delete(f"/admin/api/users/{first.id}")).status_code,
+                (await client.delete(f"/admin/user/{second.id}")).status_code,
+            ]
+        return (
+            statuses,
+            await User.all().count(),
+            await User.with_deleted().filter(deleted_at__isnull=False, is_active=False).count(),
+            await LoginAttempt.filter(user_id=first.id).count(),
+        )
+
+    try:
+        statuses, live, soft_deleted, attempts = db(main)
+    finally:
+        app.dependency_overrides.pop(get_current_admin_user, None)
+
+    assert statuses == [200, 200]
+    assert live == 0
+    assert soft_deleted == 2
+    assert attempts == 1
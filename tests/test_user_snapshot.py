@@ -0,0 +1,88 @@
+"""
+Profil snapshot testlari - qurish/saqlash, eskirish va signalsiz o'zgarishlardan keyin yangilash.
+"""
+
+from decimal import Decimal
+
+import orjson
+
+from app.core.serialization import dumps
+from app.models.user import User
+from app.services.user_snapshot import (
+    PROFILE_SNAPSHOT_VERSION,
+    ProfileSnapshot_Pydantic,
+    build_snapshot,
+    rebuild_snapshots,
+    refresh_snapshots,
+    snapshot_is_fresh,
+)
+
+
+async def _user(name: str) -> User:
+    return await User.create(username=name, email=f"{name}@example.com", password_hash="-")
+
+
+def test_build_snapshot_has_no_side_effects(db):
+    async def main():
+        user = await _user("fresh")
+        user.balance = 5.5
+        before = dict(vars(user))
+        snapshot = await build_snapshot(user)
+        return user, before, snapshot
+
+    user, before, snapshot = db(main)
+
+    assert vars(user) == before
+    assert user.balance == 5.5
+    assert orjson.loads(snapshot)["balance"] == "5.50"
+
+
+def test_save_stores_fresh_snapshot(db):
+    async def main():
+        user = await _user("saved")
+        stored = await User.get(id=user.id)
+        expected = dumps(await ProfileSnapshot_Pydantic.from_tortoise_orm(stored))
+        return user, stored, expected
+
+    user, stored, expected = db(main)
+
+    assert snapshot_is_fresh(user) and snapshot_is_fresh(stored)
+    assert stored.profile_snapshot_version == PROFILE_SNAPSHOT_VERSION
+    assert stored.profile_snapshot == expected
+    assert "password_hash" not in orjson.loads(stored.profile_snapshot)
+
+
+def test_refresh_after_queryset_update(db):
+    """`QuerySet.update()` signal chaqirmaydi - `refresh_snapshots()` snapshot'ni yangilaydi."""
+    async def main():
+        user = await _user("bulk")
+        await User.filter(id=user.id).update(first_name="Ali", balance=Decimal("7.25"))
+        stale = (await User.get(id=user.id)).profile_snapshot
+        refreshed = await refresh_snapshots([user.id])
+        return stale, refreshed, (await User.get(id=user.id)).profile_snapshot
+
+    stale, refreshed, snapshot = db(main)
+
+    assert orjson.loads(stale)["first_name"] is None
+    assert refreshed == 1
+    assert orjson.loads(snapshot)["first_name"] == "Ali"
+    assert orjson.loads(snapshot)["balance"] == "7.25"
+
+
+def test_rebuild_only_stale_or_all(db):
+    async def main():
+        first = await _user("first")
+        await _user("second")
+        await User.filter(id=first.id).update(profile_snapshot_version=0)
+        assert not snapshot_is_fresh(await User.get(id=first.id))
+
+        stale = await rebuild_snapshots(batch_size=1)
+        fresh = all(snapshot_is_fresh(user) for user in await User.all())
+        everything = await rebuild_snapshots(batch_size=1, only_stale=False)
+        return stale, fresh, everything
+
+    stale, fresh, everything = db(main)
+
+    assert stale == {"scanned": 2, "rebuilt": 1}
+    assert fresh
+    assert everything == {"scanned": 2, "rebuilt": 2}
@@ -0,0 +1,39 @@
+"""
+Dashboard hisoblagichlari testlari - user holati o'zgarishidan deltalar.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.services import user_stats
+
+
+CREATED_AT = datetime(2026, 10, 19, 13, 45, tzinfo=timezone.utc)
+HOUR = "signups:2026-10-19T13"
+
+
+def _state(is_active=True, is_superuser=False, deleted_at=None):
+    return {"is_active": is_active, "is_superuser": is_superuser, "deleted_at": deleted_at}
+
+
+def test_signup_key_is_utc_hour():
+    assert user_stats.signup_key(CREATED_AT) == HOUR
+    assert user_stats.signup_key(CREATED_AT.astimezone(timezone(timedelta(hours=5)))) == HOUR
+    assert user_stats.signup_key(CREATED_AT.replace(tzinfo=None)) == HOUR
+
+
+def test_created_user_adds_to_every_matching_counter():
+    after = user_stats.contribution(_state(is_superuser=True), CREATED_AT)
+    assert user_stats.diff({}, after) == {"total": 1, "active": 1, "superusers": 1, HOUR: 1}
+
+
+def test_deactivation_only_touches_active_counter():
+    before = user_stats.contribution(_state(), CREATED_AT)
+    after = user_stats.contribution(_state(is_active=False), CREATED_AT)
+    assert user_stats.diff(before, after) == {"active": -1}
+    assert user_stats.diff(after, after) == {}
+
+
+def test_soft_deleted_user_leaves_all_counters():
+    before = user_stats.contribution(_state(is_superuser=True), CREATED_AT)
+    after = user_stats.contribution(_state(is_active=False, deleted_at=CREATED_AT), CREATED_AT)
+    assert user_stats.diff(before, after) == {"total": -1, "active": -1, "superusers": -1, HOUR: -1}
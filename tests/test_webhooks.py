@@ -0,0 +1,80 @@
+"""
+Webhook testlari - batch body, imzo, yetkazish natijalari (lokal MockTransport qabul qiluvchi bilan).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+import pytest
+
+from app.models.user import User
+from app.models.webhook import USER_CREATED, USER_DEACTIVATED, USER_UPDATED, WebhookOutbox
+from app.services import webhooks
+
+
+def _rows():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        WebhookOutbox(id=1, subscription_id=1, event=USER_CREATED, user_id=7, payload=b'{"id":7}', created_at=created_at),
+        WebhookOutbox(id=2, subscription_id=1, event=USER_UPDATED, user_id=7, payload=b'{"id":7,"bio":"x"}', created_at=created_at),
+    ]
+
+
+def _send(handler, body: bytes) -> webhooks.DeliveryResult:
+    async def main():
+        sender = webhooks.WebhookSender(transport=httpx.MockTransport(handler))
+        try:
+            return await sender.send("http://receiver.local/hook", "s" * 32, body)
+        finally:
+            await sender.aclose()
+    return asyncio.run(main())
+
+
+def test_batch_is_signed_and_payloads_are_embedded():
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(204)
+
+    body = webhooks.encode_batch(_rows())
+    assert _send(handler, body).ok
+
+    request = received[0]
+    events = orjson.loads(request.content)["events"]
+    assert [(event["id"], event["type"], event["data"]) for event in events] == [
+        (1, USER_CREATED, {"id": 7}),
+        (2, USER_UPDATED, {"id": 7, "bio": "x"}),
+    ]
+    timestamp = request.headers["x-webhook-timestamp"]
+    assert request.headers["x-webhook-signature"] == webhooks.sign("s" * 32, timestamp, request.content)
+
+
+def test_failed_delivery_reports_error_and_retry_after():
+    result = _send(lambda request: httpx.Response(429, headers={"Retry-After": "120"}), b"{}")
+    assert (result.ok, result.status_code, result.retry_after) == (False, 429, 120.0)
+
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    result = _send(refuse, b"{}")
+    assert not result.ok and result.status_code is None and "ConnectError" in result.error
+
+
+@pytest.mark.parametrize("failures", [1, 2, 5, 30])
+def test_backoff_grows_with_jitter_and_is_capped(failures):
+    delay = webhooks.backoff_delay(failures, base=5.0, cap=600.0)
+    expected = min(600.0, 5.0 * 2 ** (failures - 1))
+    assert expected / 2 <= delay <= expected
+
+
+def test_user_event_classification():
+    user = User(id=1, username="u", email="u@example.com", is_active=False)
+    assert webhooks.user_event(user, created=True) == USER_CREATED
+    assert webhooks.user_event(user, created=False) == USER_UPDATED
+    assert webhooks.user_event(user, created=False, update_fields=["last_login", "updated_at"]) is None
+
+    user._loaded_values = {"is_active": True}
+    assert webhooks.user_event(user, created=False, update_fields=["is_active", "deleted_at"]) == USER_DEACTIVATED